@@ -0,0 +1,62 @@
+"""Общий планировщик анимаций интерфейса"""
+import os
+
+from kivy.animation import Animation
+
+
+class AnimationManager:
+    """Одна анимация на свойство виджета и режим экономии энергии.
+
+    Новая анимация отменяет ту, что уже меняет те же свойства того же
+    виджета, поэтому быстрые нажатия не накладывают эффекты друг на
+    друга и размеры не «уплывают». В режиме экономии эффекты не
+    запускаются: виджет сразу получает конечное состояние ``rest``.
+    Включается переменной ``FOCUS_TIMER_LOW_POWER=1`` или системным
+    режимом энергосбережения.
+    """
+    def __init__(self, low_power=None):
+        if low_power is None:
+            low_power = bool(os.environ.get('FOCUS_TIMER_LOW_POWER'))
+        self.low_power = low_power
+        self.started = 0
+        self.skipped = 0
+
+    def start(self, widget, animation, rest=None):
+        """Запускает анимацию вместо текущей на тех же свойствах.
+
+        ``rest`` - значения свойств в покое; они выставляются, если
+        анимация не запускается или отменяется через stop().
+        """
+        properties = list(animation.animated_properties)
+        Animation.cancel_all(widget, *properties)
+        if self.low_power:
+            self.skipped += 1
+            self._rest(widget, rest)
+            return None
+        self.started += 1
+        animation.start(widget)
+        return animation
+
+    def stop(self, widget, *properties, rest=None):
+        """Отменяет анимации свойств виджета и возвращает его в покой"""
+        Animation.cancel_all(widget, *properties)
+        self._rest(widget, rest)
+
+    def set_low_power(self, enabled):
+        self.low_power = enabled
+
+    @staticmethod
+    def _rest(widget, rest):
+        for name, value in (rest or {}).items():
+            setattr(widget, name, value)
+
+
+_manager = None
+
+
+def get_animation_manager():
+    """Общий экземпляр планировщика анимаций"""
+    global _manager
+    if _manager is None:
+        _manager = AnimationManager()
+    return _manager
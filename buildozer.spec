@@ -5,12 +5,13 @@ package.domain = org.example
 
 source.dir = .
 source.include_exts = py,png,jpg,kv,atlas,txt
+source.exclude_dirs = tests
 
 version = 1.0
-requirements = python3,kivy,plyer,pyjnius,android
+requirements = python3,kivy,pyjnius,android
 
 # Разрешения для современного приложения
-android.permissions = WRITE_EXTERNAL_STORAGE,READ_EXTERNAL_STORAGE,VIBRATE,WAKE_LOCK,FOREGROUND_SERVICE,POST_NOTIFICATIONS,MODIFY_AUDIO_SETTINGS,ACCESS_NOTIFICATION_POLICY,SYSTEM_ALERT_WINDOW
+android.permissions = WRITE_EXTERNAL_STORAGE,READ_EXTERNAL_STORAGE,VIBRATE,WAKE_LOCK,FOREGROUND_SERVICE,FOREGROUND_SERVICE_SPECIAL_USE,POST_NOTIFICATIONS,MODIFY_AUDIO_SETTINGS,ACCESS_NOTIFICATION_POLICY,SYSTEM_ALERT_WINDOW,SCHEDULE_EXACT_ALARM
 
 android.api = 34
 android.minapi = 21
@@ -24,6 +25,9 @@ android.orientation = portrait
 
 # Настройки для фоновой работы
 android.service = 1
+# С API 34 сервис переднего плана объявляет тип и берёт разрешение этого типа;
+# без типа python-for-android ставит dataSync, которому нужно другое разрешение
+services = Timer:service.py:foreground:foregroundServiceType=specialUse
 android.wakelock = 1
 
 # Современный адаптивный дизайн
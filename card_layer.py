@@ -0,0 +1,65 @@
+"""Фоны карточек в общей группе инструкций и колонка, в которой они лежат"""
+from kivy.clock import Clock
+from kivy.graphics import Color, InstructionGroup, RoundedRectangle
+from kivy.metrics import dp
+from kivy.uix.boxlayout import BoxLayout
+
+
+class CardLayer:
+    """Фоны всех карточек колонки: один Color и по прямоугольнику на карточку.
+
+    Группа рисуется в ``canvas.before`` колонки, поэтому у карточек нет
+    собственных инструкций, а тема перекрашивает все фоны одной
+    привязкой. Изменения pos и size только помечают карточку, а
+    прямоугольники пересчитываются одним проходом перед кадром: сколько
+    бы раз карточка ни сдвинулась за кадр, её фон обновится один раз.
+    """
+    def __init__(self, canvas, counter=None, radius=dp(12), offset=dp(2)):
+        self.counter = counter
+        self.radius = radius
+        self.offset = offset
+        self.rects = {}
+        self.dirty = set()
+        self.group = InstructionGroup()
+        self.color = Color()
+        self.group.add(self.color)
+        canvas.add(self.group)
+        self.flush_trigger = Clock.create_trigger(self.flush, -1)
+
+    def attach(self, card):
+        rect = RoundedRectangle(radius=[self.radius] * 4)
+        self.group.add(rect)
+        self.rects[card] = rect
+        card.bind(pos=self.invalidate, size=self.invalidate)
+        self.invalidate(card)
+
+    def invalidate(self, card, *args):
+        self.dirty.add(card)
+        self.flush_trigger()
+
+    def flush(self, *args):
+        for card in self.dirty:
+            rect = self.rects[card]
+            # Фон чуть смещён вниз - лёгкая тень под карточкой
+            rect.pos = (card.x + self.offset, card.y - self.offset)
+            rect.size = card.size
+        if self.counter:
+            self.counter.count('canvas', len(self.dirty))
+        self.dirty.clear()
+
+
+class CardColumn(BoxLayout):
+    """Вертикальная колонка карточек высотой по содержимому.
+
+    Своя перекладка уже отложена Kivy до кадра; колонка только считает
+    проходы, чтобы было видно, сколько их вызвало одно действие.
+    """
+    def __init__(self, counter=None, **kwargs):
+        self.counter = counter
+        super().__init__(**kwargs)
+        self.bind(minimum_height=self.setter('height'))
+
+    def do_layout(self, *args):
+        if self.counter:
+            self.counter.count('relayout')
+        super().do_layout(*args)
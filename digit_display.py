@@ -0,0 +1,83 @@
+"""Дисплей цифр из заранее растеризованных глифов"""
+from kivy.core.text import Label as CoreLabel
+from kivy.graphics import Color, Rectangle
+from kivy.properties import BooleanProperty, ColorProperty, NumericProperty, StringProperty
+from kivy.uix.widget import Widget
+
+
+# (символ, размер, жирность) -> белая текстура глифа
+_glyphs = {}
+
+
+def glyph_texture(char, font_size, bold=False):
+    """Текстура символа; растеризуется один раз на размер шрифта.
+
+    Глифы рисуются белыми, а цвет задаёт инструкция Color при выводе,
+    поэтому смена цвета дисплея не требует новых текстур.
+    """
+    key = (char, font_size, bold)
+    texture = _glyphs.get(key)
+    if texture is None:
+        label = CoreLabel(text=char, font_size=font_size, bold=bold, color=(1, 1, 1, 1))
+        label.refresh()
+        texture = _glyphs[key] = label.texture
+    return texture
+
+
+class DigitDisplay(Widget):
+    """Текст вида «25:00», собранный из закэшированных текстур глифов.
+
+    Снаружи ведёт себя как Label с text, color, font_size и bold, но при
+    смене текста только переставляет текстуры у прямоугольников: ни
+    растеризации шрифта, ни загрузки текстуры в видеопамять за тик.
+    """
+    text = StringProperty('')
+    color = ColorProperty((1, 1, 1, 1))
+    font_size = NumericProperty('15sp')
+    bold = BooleanProperty(False)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.rects = []
+        self.shown = []
+        with self.canvas:
+            self.tint = Color(*self.color)
+        self.bind(color=self.update_color)
+        self.bind(text=self.update_glyphs, font_size=self.update_glyphs, bold=self.update_glyphs)
+        self.bind(pos=self.update_layout, size=self.update_layout)
+        self.update_glyphs()
+
+    def update_color(self, instance, value):
+        self.tint.rgba = value
+
+    def update_glyphs(self, *args):
+        """Меняет текстуры только у символов, которые сменились"""
+        while len(self.rects) < len(self.text):
+            rect = Rectangle(size=(0, 0))
+            self.canvas.add(rect)
+            self.rects.append(rect)
+            self.shown.append(None)
+
+        resized = False
+        for i, rect in enumerate(self.rects):
+            glyph = (self.text[i], self.font_size, self.bold) if i < len(self.text) else None
+            if glyph == self.shown[i]:
+                continue
+            self.shown[i] = glyph
+            size = (0, 0)
+            if glyph is not None:
+                rect.texture = glyph_texture(*glyph)
+                size = rect.texture.size
+            if tuple(rect.size) != tuple(size):
+                rect.size = size
+                resized = True
+        if resized:
+            self.update_layout()
+
+    def update_layout(self, *args):
+        """Центрирует строку глифов в виджете"""
+        rects = self.rects[:len(self.text)]
+        x = self.center_x - sum(rect.size[0] for rect in rects) / 2
+        for rect in rects:
+            rect.pos = (x, self.center_y - rect.size[1] / 2)
+            x += rect.size[0]
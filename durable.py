@@ -0,0 +1,91 @@
+"""Надёжная запись файлов: атомарная замена и записи с контрольной суммой"""
+import json
+import os
+import zlib
+
+
+def _fsync_dir(path):
+    """Сбрасывает на диск саму запись каталога о переименовании"""
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path, data, sync=True):
+    """Заменяет файл целиком: либо старое содержимое, либо новое.
+
+    Данные пишутся во временный файл рядом, сбрасываются на диск и
+    переименовываются поверх старого, поэтому убитый посреди записи
+    процесс не оставляет обрезанный или пустой файл. Без ``sync``
+    замена остаётся атомарной при гибели процесса, но не при
+    отключении питания - зато обходится без ожидания диска.
+    """
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        if sync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    if sync:
+        _fsync_dir(path)
+
+
+def atomic_write_json(path, data, sync=True):
+    atomic_write(path, json.dumps(data, ensure_ascii=False).encode('utf-8'), sync)
+
+
+def write_all(f, data):
+    """Пишет данные в небуферизованный файл целиком, дописывая после коротких записей"""
+    view = memoryview(data)
+    while view:
+        view = view[f.write(view):]
+
+
+def frame(payload):
+    """Строка ``<crc32> <payload>\\n`` для дозаписи в журнал"""
+    return b'%08x %s\n' % (zlib.crc32(payload), payload)
+
+
+def unframe(line):
+    """Полезные данные строки или None, если строка оборвана или повреждена"""
+    if not line.endswith(b'\n'):
+        return None
+    checksum, _, payload = line[:-1].partition(b' ')
+    try:
+        if int(checksum, 16) == zlib.crc32(payload):
+            return payload
+    except ValueError:
+        pass
+    return None
+
+
+def drop_partial_tail(path, chunk_size=4096):
+    """Отрезает недописанную последнюю строку текстового файла.
+
+    Читает файл с конца, поэтому стоимость не зависит от его размера.
+    Возвращает число отброшенных байт.
+    """
+    if not os.path.exists(path):
+        return 0
+    with open(path, 'rb+') as f:
+        size = f.seek(0, os.SEEK_END)
+        end = size
+        while end > 0:
+            start = max(0, end - chunk_size)
+            f.seek(start)
+            newline = f.read(end - start).rfind(b'\n')
+            if newline >= 0:
+                end = start + newline + 1
+                break
+            end = start
+        if end < size:
+            f.truncate(end)
+        return size - end
@@ -0,0 +1,84 @@
+"""Потоковый экспорт журнала в CSV и JSON Lines"""
+import csv
+import json
+import os
+import threading
+
+from session_store import TIME_FORMAT
+
+
+FORMAT_CSV = 'csv'
+FORMAT_JSONL = 'jsonl'
+CSV_HEADER = ['start', 'end', 'duration_minutes', 'activity']
+CHUNK_SIZE = 500
+
+
+def _rows(records):
+    for record in records:
+        yield [
+            f"{record.start:{TIME_FORMAT}}",
+            f"{record.end:{TIME_FORMAT}}",
+            record.duration,
+            record.activity,
+        ]
+
+
+def export_records(records, out, fmt, total=None, progress=None, chunk_size=CHUNK_SIZE):
+    """Пишет записи порциями по chunk_size, не держа журнал в памяти.
+
+    ``records`` - любой итератор, обычно ``SessionStore.iter_records()``;
+    ``progress(done, total)`` вызывается после каждой порции.
+    """
+    if fmt == FORMAT_CSV:
+        writer = csv.writer(out)
+        writer.writerow(CSV_HEADER)
+        write_chunk = writer.writerows
+    elif fmt == FORMAT_JSONL:
+        def write_chunk(rows):
+            out.writelines(
+                json.dumps(dict(zip(CSV_HEADER, row)), ensure_ascii=False) + '\n'
+                for row in rows
+            )
+    else:
+        raise ValueError(f"Неизвестный формат экспорта: {fmt}")
+
+    done = 0
+    chunk = []
+    for row in _rows(records):
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            write_chunk(chunk)
+            done += len(chunk)
+            chunk = []
+            if progress:
+                progress(done, total)
+    if chunk:
+        write_chunk(chunk)
+        done += len(chunk)
+    if progress:
+        progress(done, total)
+    return done
+
+
+def export_journal(store, path, fmt, progress=None, on_done=None):
+    """Экспортирует журнал в фоновом потоке.
+
+    Файл пишется во временный и переименовывается в конце, поэтому
+    прерванный экспорт не оставляет полузаписанный результат.
+    on_done(path, error) вызывается из потока экспорта.
+    """
+    def run():
+        tmp_path = path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8', newline='') as out:
+                export_records(store.iter_records(), out, fmt, store.count(), progress)
+            os.replace(tmp_path, path)
+            error = None
+        except Exception as e:
+            error = e
+        if on_done:
+            on_done(path, error)
+
+    thread = threading.Thread(target=run, name='journal-export', daemon=True)
+    thread.start()
+    return thread
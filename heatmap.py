@@ -0,0 +1,137 @@
+"""Годовая тепловая карта фокус-времени, нарисованная несколькими мешами"""
+from array import array
+from datetime import date, timedelta
+
+from kivy.graphics import Color, Mesh
+from kivy.properties import ColorProperty, NumericProperty
+from kivy.uix.widget import Widget
+
+
+# Нижние границы уровней в минутах за день; ниже первой - пустая клетка
+LEVEL_MINUTES = (1, 30, 60, 120)
+# Насыщенность цвета на уровнях 1..4
+LEVEL_ALPHA = (0.3, 0.55, 0.8, 1.0)
+CELL_GAP = 0.18
+
+
+def minutes_level(minutes):
+    level = 0
+    for threshold in LEVEL_MINUTES:
+        if minutes >= threshold:
+            level += 1
+    return level
+
+
+class FocusHeatmap(Widget):
+    """Сетка «неделя × день недели» в духе календаря GitHub.
+
+    Клетки не виджеты: все клетки одного уровня - один Mesh, так что
+    карта за год рисуется пятью вызовами отрисовки при любом числе
+    дней. У стандартного шейдера Kivy нет цвета вершины, поэтому цвет
+    задаёт Color перед мешем уровня, а смена темы меняет только эти
+    пять инструкций. Когда у дня меняется уровень, переписываются
+    вершины только этой клетки.
+    """
+    color = ColorProperty((0.2, 0.8, 0.4, 1))
+    empty_color = ColorProperty((0.2, 0.2, 0.2, 1))
+    weeks = NumericProperty(53)
+
+    def __init__(self, daily=None, end=None, **kwargs):
+        super().__init__(**kwargs)
+        self.levels = []
+        self.vertices = []
+        self.start = self.end = None
+        self.level_colors = []
+        self.meshes = []
+        with self.canvas:
+            for _ in range(len(LEVEL_MINUTES) + 1):
+                self.level_colors.append(Color())
+                self.meshes.append(Mesh(mode='triangles'))
+        self.update_colors()
+        self.bind(color=self.update_colors, empty_color=self.update_colors)
+        self.bind(pos=self.redraw, size=self.redraw)
+        self.set_totals(daily or {}, end)
+
+    def update_colors(self, *args):
+        self.level_colors[0].rgba = self.empty_color
+        r, g, b, a = self.color
+        for color, alpha in zip(self.level_colors[1:], LEVEL_ALPHA):
+            color.rgba = (r, g, b, a * alpha)
+
+    def set_totals(self, daily, end=None):
+        """Заполняет карту по минутам за день (``{'YYYY-MM-DD': минуты}``).
+
+        Просматриваются только дни окна карты, поэтому стоимость не
+        зависит от того, за сколько лет накоплена статистика.
+        """
+        self.end = end or date.today()
+        # Окно начинается с понедельника, последняя колонка - неделя end
+        self.start = self.end - timedelta(days=self.end.weekday() + 7 * (int(self.weeks) - 1))
+        cells = (self.end - self.start).days + 1
+        self.levels = [
+            minutes_level(daily.get((self.start + timedelta(days=i)).isoformat(), 0))
+            for i in range(cells)
+        ]
+        self.redraw()
+
+    def set_day(self, day, minutes, daily=None):
+        """Обновляет одну клетку; день за пределами окна сдвигает карту"""
+        if day > self.end:
+            if daily is not None:
+                self.set_totals(daily, day)
+            return
+        i = (day - self.start).days
+        if i < 0:
+            return
+        level = minutes_level(minutes)
+        if level == self.levels[i]:
+            return
+        old, self.levels[i] = self.levels[i], level
+        quad = self.cell_quad(i, *self.cell_geometry())
+        self.vertices[old][i * 16:i * 16 + 16] = array('f', self.collapsed(quad))
+        self.vertices[level][i * 16:i * 16 + 16] = array('f', quad)
+        self.meshes[old].vertices = self.vertices[old]
+        self.meshes[level].vertices = self.vertices[level]
+
+    def cell_geometry(self):
+        step = min(self.width / max(1, int(self.weeks)), self.height / 7)
+        # Карта выравнивается по центру виджета
+        x0 = self.x + (self.width - step * int(self.weeks)) / 2
+        y0 = self.y + (self.height + step * 7) / 2
+        return step, x0, y0
+
+    def cell_quad(self, i, step, x0, y0):
+        """Вершины клетки: понедельник сверху, недели слева направо"""
+        size = step * (1 - CELL_GAP)
+        x = x0 + (i // 7) * step
+        y = y0 - (i % 7 + 1) * step
+        return [x, y, 0, 0, x + size, y, 0, 0, x + size, y + size, 0, 0, x, y + size, 0, 0]
+
+    @staticmethod
+    def collapsed(quad):
+        # Четыре вершины в одной точке: треугольники нулевой площади не рисуются
+        return quad[:4] * 4
+
+    def redraw(self, *args):
+        """Пересчитывает вершины всех уровней одним проходом по клеткам.
+
+        У каждого меша есть место под каждую клетку, у чужих клеток оно
+        схлопнуто в точку. Поэтому индексы общие и не меняются, а смена
+        уровня клетки переписывает по 16 чисел в двух мешах. Вершины
+        лежат в array('f'): меш копирует такой буфер целиком, не
+        перебирая элементы, как у списка.
+        """
+        geometry = self.cell_geometry()
+        levels = [[] for _ in self.meshes]
+        for i, cell_level in enumerate(self.levels):
+            quad = self.cell_quad(i, *geometry)
+            empty = self.collapsed(quad)
+            for level, vertices in enumerate(levels):
+                vertices += quad if level == cell_level else empty
+        self.vertices = [array('f', vertices) for vertices in levels]
+        indices = []
+        for n in range(0, 4 * len(self.levels), 4):
+            indices += (n, n + 1, n + 2, n + 2, n + 3, n)
+        for mesh, vertices in zip(self.meshes, self.vertices):
+            mesh.vertices = vertices
+            mesh.indices = indices
@@ -0,0 +1,107 @@
+"""Виртуализированный просмотр журнала сессий"""
+from kivy.metrics import dp
+from kivy.uix.label import Label
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.uix.recycleview import RecycleView
+
+from session_store import TIME_FORMAT
+
+
+ITEM_HEIGHT = dp(110)
+ITEM_SPACING = dp(8)
+
+
+def record_text(record):
+    """Текст одной карточки журнала"""
+    return (
+        f"📅 {record.start:{TIME_FORMAT}} → {record.end:{TIME_FORMAT}}\n"
+        f"⏱️ Фокус-время: {record.duration} минут\n"
+        f"🎯 {record.activity}"
+    )
+
+
+class SessionItem(Label):
+    """Переиспользуемая строка журнала"""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.font_size = '14sp'
+        self.halign = 'left'
+        self.valign = 'top'
+        self.max_lines = 5
+        self.bind(width=self.update_text_size)
+
+    def update_text_size(self, instance, width):
+        self.text_size = (width - dp(16), None)
+
+
+class JournalView(RecycleView):
+    """Список сессий от новых к старым с подгрузкой страницами.
+
+    Создаётся только несколько видимых строк, а записи читаются из
+    журнала с конца по мере прокрутки, поэтому открытие не зависит
+    от размера журнала.
+    """
+    page_size = 50
+
+    def __init__(self, store, text_color=(1, 1, 1, 1), load=True, **kwargs):
+        super().__init__(**kwargs)
+        self.store = store
+        self.text_color = text_color
+        self.loaded_from = 0
+        self.viewclass = SessionItem
+
+        layout = RecycleBoxLayout(
+            orientation='vertical',
+            spacing=ITEM_SPACING,
+            default_size=(None, ITEM_HEIGHT),
+            default_size_hint=(1, None),
+            size_hint_y=None
+        )
+        layout.bind(minimum_height=layout.setter('height'))
+        self.add_widget(layout)
+
+        self.bind(scroll_y=self.on_scroll)
+        if load:
+            self.reload()
+
+    def reload(self):
+        """Перечитывает первую страницу с конца журнала"""
+        self.loaded_from = self.store.count()
+        self.data = []
+        self.load_more()
+        self.scroll_y = 1
+
+    def show_records(self, records):
+        """Показывает готовый список записей (результаты поиска) без подгрузки"""
+        self.loaded_from = 0
+        self.data = [
+            {'text': record_text(record), 'color': self.text_color}
+            for record in records
+        ]
+        self.scroll_y = 1
+
+    def load_more(self):
+        """Подгружает следующую страницу более старых записей"""
+        if self.loaded_from <= 0:
+            return
+
+        start = max(0, self.loaded_from - self.page_size)
+        records = self.store.read_range(start, self.loaded_from)
+        self.loaded_from = start
+
+        # Сохраняем расстояние от верха, чтобы список не прыгал
+        offset = (1 - self.scroll_y) * max(0, self.content_height() - self.height)
+        self.data.extend(
+            {'text': record_text(record), 'color': self.text_color}
+            for record in reversed(records)
+        )
+        scrollable = self.content_height() - self.height
+        if scrollable > 0:
+            self.scroll_y = 1 - min(1, offset / scrollable)
+
+    def content_height(self):
+        return len(self.data) * (ITEM_HEIGHT + ITEM_SPACING)
+
+    def on_scroll(self, instance, value):
+        if value < 0.1 and self.loaded_from > 0:
+            self.load_more()
@@ -0,0 +1,105 @@
+"""Фоновая пакетная запись журнала вне UI-потока"""
+import queue
+import threading
+import time
+
+
+FSYNC_BATCH = 'batch'        # fsync после каждого записанного пакета
+FSYNC_INTERVAL = 'interval'  # fsync не чаще, чем раз в fsync_interval секунд
+FSYNC_NEVER = 'never'        # fsync только по явному flush()
+
+
+class _FlushRequest:
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class _Stop(_FlushRequest):
+    pass
+
+
+def _call_now(fn):
+    fn()
+
+
+class AsyncLogWriter:
+    """Поток записи с ограниченной очередью.
+
+    Записи, пришедшие почти одновременно, объединяются в один пакет
+    ``write_batch(items, sync)``. Колбэки завершения вызываются через
+    ``dispatch`` - в приложении это ``Clock.schedule_once``, чтобы они
+    выполнялись в UI-потоке.
+    """
+    def __init__(self, write_batch, dispatch=_call_now, max_queue=256,
+                 coalesce_delay=0.05, fsync=FSYNC_BATCH, fsync_interval=5.0):
+        self.write_batch = write_batch
+        self.dispatch = dispatch
+        self.coalesce_delay = coalesce_delay
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._last_fsync = 0.0
+        self._thread = threading.Thread(target=self._run, name='log-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, item, callback=None):
+        """Ставит запись в очередь; callback(error) получит результат"""
+        self._queue.put((item, callback))
+
+    def flush(self, timeout=5.0):
+        """Дожидается записи всей очереди с обязательным fsync"""
+        return self._request(_FlushRequest(), timeout)
+
+    def close(self, timeout=5.0):
+        """Дописывает очередь и останавливает поток"""
+        if not self._thread.is_alive():
+            return True
+        return self._request(_Stop(), timeout)
+
+    def _request(self, request, timeout):
+        self._queue.put((request, None))
+        return request.done.wait(timeout)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            # Собираем всё, что успело прийти за короткое окно
+            deadline = time.monotonic() + self.coalesce_delay
+            while not isinstance(batch[-1][0], _FlushRequest):
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            request = None
+            if isinstance(batch[-1][0], _FlushRequest):
+                request = batch.pop()[0]
+
+            if batch or request is not None:
+                self._write(batch, force_sync=request is not None)
+
+            if request is not None:
+                request.done.set()
+                if isinstance(request, _Stop):
+                    return
+
+    def _write(self, batch, force_sync):
+        sync = force_sync or self.fsync == FSYNC_BATCH
+        now = time.monotonic()
+        if self.fsync == FSYNC_INTERVAL and now - self._last_fsync >= self.fsync_interval:
+            sync = True
+
+        error = None
+        try:
+            self.write_batch([item for item, _ in batch], sync)
+            if sync:
+                self._last_fsync = now
+        except Exception as e:
+            error = e
+
+        for _, callback in batch:
+            if callback is not None:
+                self.dispatch(lambda callback=callback: callback(error))
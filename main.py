@@ -1,55 +1,59 @@
+# Первым импортом, чтобы профиль запуска учитывал загрузку Kivy
+from perf import DialogProfiler, LayoutCounter, PerfTracer, StartupProfiler, WakeupCounter
+
 from kivy.app import App
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.gridlayout import GridLayout
 from kivy.uix.label import Label
 from kivy.uix.button import Button
 from kivy.uix.textinput import TextInput
-from kivy.uix.popup import Popup
 from kivy.uix.scrollview import ScrollView
 from kivy.uix.widget import Widget
 from kivy.uix.floatlayout import FloatLayout
+from kivy.animation import Animation
 from kivy.clock import Clock
 from kivy.core.window import Window
-from kivy.animation import Animation
-from kivy.graphics import Color, RoundedRectangle, Line
+from kivy.graphics import Line, PopMatrix, PushMatrix, Scale
 from kivy.metrics import dp
-from datetime import datetime
+from kivy.properties import NumericProperty
+from kivy.utils import platform
+import json
 import os
 import random
+import threading
+import time
+from datetime import datetime, timedelta
 
-# Импорты для уведомлений и звука
-try:
-    from plyer import notification
-    from android.permissions import request_permissions, Permission
-    from jnius import autoclass
-    android_available = True
-except ImportError:
-    android_available = False
+from animations import get_animation_manager
+from card_layer import CardColumn, CardLayer
+from digit_display import DigitDisplay
+from heatmap import FocusHeatmap
+from log_writer import AsyncLogWriter
+from platform_services import get_platform_services
+from search_index import SearchIndex
+from session import COLOR_NORMAL, COLOR_SUCCESS, FINISHED, FocusSession
+from session_store import SessionStore, import_text_log
+from snapshot import SessionSnapshot
+from stats import SessionStats
+from theme import ThemeRegistry
+from timer_core import TimerManager
+from timer_service import LoopbackClient, TimerServiceClient
+
+# Мосты JNI разрешаются в platform_services при первом использовании
+android_available = platform == 'android'
 
 class Card(FloatLayout):
-    """Карточка с современным дизайном"""
-    def __init__(self, bg_color=(0.98, 0.98, 0.98, 1), dark_bg_color=(0.15, 0.15, 0.15, 1), 
-                 elevation=2, **kwargs):
+    """Карточка с современным дизайном; фон рисует общий CardLayer колонки"""
+    def __init__(self, elevation=2, **kwargs):
         super().__init__(**kwargs)
-        self.bg_color = bg_color
-        self.dark_bg_color = dark_bg_color
         self.elevation = elevation
-        self.is_dark_theme = False
-        
-        with self.canvas.before:
-            self.color = Color(*bg_color)
-            self.rect = RoundedRectangle(radius=[dp(12)] * 4)
-        
-        self.bind(pos=self.update_graphics, size=self.update_graphics)
     
-    def update_graphics(self, *args):
-        self.rect.pos = (self.pos[0] + dp(2), self.pos[1] - dp(2))
-        self.rect.size = self.size
-    
-    def set_theme(self, is_dark):
-        self.is_dark_theme = is_dark
-        color = self.dark_bg_color if is_dark else self.bg_color
-        self.color.rgba = color
+    def add_widget(self, widget, *args, **kwargs):
+        # FloatLayout двигает только детей с pos_hint: без него содержимое
+        # оставалось в начале координат колонки, а не внутри карточки
+        if not widget.pos_hint:
+            widget.pos_hint = {'x': 0, 'y': 0}
+        super().add_widget(widget, *args, **kwargs)
 
 class ModernButton(Button):
     """Современная кнопка с анимацией"""
@@ -83,48 +87,126 @@ class ModernButton(Button):
         if not self.original_size:
             self.original_size = self.size[:]
         
-        anim = Animation(size=(self.size[0] * 0.95, self.size[1] * 0.95), 
+        # Сжатие считается от исходного размера, а не от текущего
+        anim = Animation(size=(self.original_size[0] * 0.95, self.original_size[1] * 0.95), 
                         duration=0.1, t='out_quad')
-        anim.start(self)
+        get_animation_manager().start(self, anim, rest={'size': self.original_size})
     
     def on_button_release(self, instance):
         """Анимация отпускания"""
         if self.original_size:
             anim = Animation(size=self.original_size, duration=0.1, t='out_quad')
-            anim.start(self)
+            get_animation_manager().start(self, anim, rest={'size': self.original_size})
+    
+    def bounce(self):
+        """Короткое увеличение кнопки после успешного действия"""
+        if not self.original_size:
+            self.original_size = self.size[:]
+        anim = Animation(size=(self.original_size[0] * 1.1, self.original_size[1] * 1.1), 
+                       duration=0.2) + \
+               Animation(size=self.original_size, duration=0.2)
+        get_animation_manager().start(self, anim, rest={'size': self.original_size})
 
-class TimerDisplay(Label):
-    """Современный дисплей таймера с анимацией"""
+class TimerDisplay(DigitDisplay):
+    """Современный дисплей таймера с анимацией; цифры берутся из кэша глифов"""
+    # Пульс масштабирует готовую текстуру текста, шрифт не перерисовывается
+    pulse_scale = NumericProperty(1.0)
+    pulse_peak = 72 / 64
+    
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.pulse_animation = None
+        with self.canvas.before:
+            PushMatrix()
+            self.scale = Scale(1, 1, 1)
+        with self.canvas.after:
+            PopMatrix()
+        self.bind(center=self.update_scale, pulse_scale=self.update_scale)
+    
+    def update_scale(self, *args):
+        self.scale.origin = self.center
+        self.scale.x = self.scale.y = self.pulse_scale
     
     def start_pulse(self):
         """Запускает пульсирующую анимацию"""
-        if self.pulse_animation:
-            self.pulse_animation.cancel(self)
-        
-        self.pulse_animation = Animation(font_size='72sp', duration=0.5) + \
-                              Animation(font_size='64sp', duration=0.5)
-        self.pulse_animation.repeat = True
-        self.pulse_animation.start(self)
+        pulse = Animation(pulse_scale=self.pulse_peak, duration=0.5) + \
+                Animation(pulse_scale=1.0, duration=0.5)
+        pulse.repeat = True
+        get_animation_manager().start(self, pulse, rest={'pulse_scale': 1.0})
     
     def stop_pulse(self):
         """Останавливает анимацию"""
-        if self.pulse_animation:
-            self.pulse_animation.cancel(self)
-            self.font_size = '64sp'
+        get_animation_manager().stop(self, 'pulse_scale', rest={'pulse_scale': 1.0})
+
+# Панель настроек приложения (кнопка ⚙️ в шапке)
+SETTINGS_PANEL = json.dumps([
+    {'type': 'title', 'title': 'Резервная копия журнала'},
+    {
+        'type': 'string',
+        'title': 'Адрес сервера',
+        'desc': 'Новые сессии отправляются на этот адрес; пустое поле выключает копию',
+        'section': 'sync',
+        'key': 'url',
+    },
+], ensure_ascii=False)
+
 
 class TimerApp(App):
+    # Карточки ниже таймера строятся на следующих кадрах после первого
+    lazy_startup = True
+    # В настройках только панель приложения, без служебных настроек Kivy
+    use_kivy_settings = False
+    
     def build(self):
         self.title = "Focus Timer 2025"
+        self.profiler = StartupProfiler()
+        self.profiler.mark('импорты')
+        self.tracer = PerfTracer()
+        self.hud = None
         
         # Переменные
-        self.time_left = 0
-        self.timer_running = False
-        self.start_time = None
-        self.log_file = "activity_log.txt"
-        self.is_dark_theme = True  # По умолчанию тёмная тема
+        self.session = FocusSession()
+        # Все дедлайны (сессия и напоминания) ведёт одна куча и одно событие Clock
+        self.timers = TimerManager(arm=self.arm_timers)
+        self.timer_event = None
+        self.focus_timer = None
+        self.reminders = {}
+        self.reminders_label = None
+        # Напоминания переданы сервису на время фона
+        self.reminders_handed_off = False
+        self.is_visible = True
+        self.wakeups = WakeupCounter()
+        self.layout_counter = LayoutCounter(on_count=self.on_layout_count)
+        self.layout_report = Clock.create_trigger(lambda dt: self.layout_counter.end(), 0.5)
+        # На Android дедлайном владеет фоновый сервис, вне его - заглушка в процессе
+        if android_available:
+            self.timer_service = TimerServiceClient(launcher=get_platform_services)
+        else:
+            self.timer_service = LoopbackClient()
+        # Снимок сессии на случай, если система убьёт процесс
+        self.snapshot = SessionSnapshot("session_state.json")
+        self.snapshot_trigger = Clock.create_trigger(lambda dt: self.save_snapshot(), 1.0)
+        self.activity_input = None
+        self.restored_activity = ''
+        # Окна журнала и очистки строятся при первом открытии и переиспользуются
+        self.log_popup = None
+        self.clear_popup = None
+        self.dialog_profiler = DialogProfiler()
+        with self.profiler.phase('журнал и статистика'), self.tracer.span('журнал и статистика', 'build'):
+            self.store = SessionStore("sessions.jsonl")
+            self.migrate_text_log("activity_log.txt")
+            self.stats = SessionStats("stats.json")
+            self.sync_stats()
+            self.search_index = SearchIndex("sessions.jsonl.search")
+            self.search_thread = None
+            self.log_writer = AsyncLogWriter(
+                self.write_sessions,
+                dispatch=lambda fn: Clock.schedule_once(lambda dt: fn())
+            )
+            # Адрес сервера задаётся в настройках; FOCUS_TIMER_SYNC_URL - для отладки
+            self.sync = None
+            self.start_sync(os.environ.get('FOCUS_TIMER_SYNC_URL') or self.config.get('sync', 'url'))
+        self.theme = ThemeRegistry()  # По умолчанию тёмная тема
+        self.theme.bind(Window, 'clearcolor', 'window')
         self.user_name = "Пользователь"  # Персонализация
         
         # Мотивационные сообщения
@@ -145,10 +227,95 @@ class TimerApp(App):
         main_container = ScrollView()
         
         # Главный layout
-        main_layout = BoxLayout(orientation='vertical', padding=dp(20), 
-                               spacing=dp(16), size_hint_y=None)
-        main_layout.bind(minimum_height=main_layout.setter('height'))
+        main_layout = CardColumn(counter=self.layout_counter, orientation='vertical',
+                                 padding=dp(20), spacing=dp(16), size_hint_y=None)
+        self.main_layout = main_layout
+        
+        # Фоны всех карточек - одна группа инструкций под общим цветом темы
+        self.card_layer = CardLayer(main_layout.canvas.before, self.layout_counter)
+        self.theme.bind(self.card_layer.color, 'rgba', 'card')
+        self.cards = []
+        for builder in (self.build_header_card, self.build_timer_card):
+            with self.profiler.phase(builder.__name__), self.tracer.span(builder.__name__, 'build'):
+                card = builder()
+            self.card_layer.attach(card)
+            main_layout.add_widget(card)
+            self.cards.append(card)
+        
+        with self.profiler.phase('восстановление сессии'), self.tracer.span('восстановление сессии', 'build'):
+            self.restore_session()
+        
+        # Статус с эмоциональными сообщениями
+        self.status_label = Label(
+            text='✨ Готовы начать продуктивную сессию?',
+            font_size='14sp',
+            color=(0.3, 0.7, 1, 1),
+            size_hint_y=None,
+            height=dp(40),
+            text_size=(None, None),
+            halign='center'
+        )
+        
+        main_container.add_widget(main_layout)
+        
+        self.deferred_builders = [
+            self.build_activity_card, self.build_reminders_card,
+            self.build_stats_card, self.build_log_card
+        ]
+        if self.lazy_startup:
+            Window.bind(on_flip=self.on_first_frame)
+        else:
+            while self.deferred_builders:
+                self.build_next_card()
+        
+        return main_container
+    
+    def on_first_frame(self, *args):
+        """Первый кадр показан: достраиваем остальные карточки"""
+        Window.unbind(on_flip=self.on_first_frame)
+        self.profiler.mark_first_frame()
+        Clock.schedule_once(lambda dt: self.build_next_card())
+    
+    def build_next_card(self):
+        """Строит одну отложенную карточку за кадр"""
+        builder = self.deferred_builders.pop(0)
+        self.layout_counter.begin(builder.__name__)
+        with self.profiler.phase(builder.__name__), self.tracer.span(builder.__name__, 'build'):
+            card = builder()
+        self.card_layer.attach(card)
+        self.main_layout.add_widget(card)
+        self.cards.append(card)
+        
+        if self.deferred_builders:
+            if self.lazy_startup:
+                Clock.schedule_once(lambda dt: self.build_next_card())
+            return
+        
+        self.main_layout.add_widget(self.status_label)
+        
+        # Пространство для клавиатуры
+        spacer = Widget(size_hint_y=None, height=dp(100))
+        self.main_layout.add_widget(spacer)
+        self.profiler.print_report()
+        if self.tracer.enabled:
+            self.toggle_hud()
         
+        if self.session.running:
+            self.resume_restored_session()
+        
+        # Разрешаем мосты платформы заранее, а не в момент окончания сессии
+        Clock.schedule_once(lambda dt: self.warm_platform_services())
+    
+    def warm_platform_services(self):
+        """Создаёт мосты платформы и сверяется с режимом энергосбережения"""
+        try:
+            if get_platform_services().power_save_mode():
+                get_animation_manager().set_low_power(True)
+        except Exception as e:
+            print(f"Ошибка проверки энергосбережения: {e}")
+    
+    def build_header_card(self):
+        """Шапка с приветствием и переключателем темы"""
         # Шапка с приветствием и переключателем темы
         header_card = Card(size_hint=(1, None), height=dp(80))
         header_layout = BoxLayout(orientation='horizontal', padding=dp(16))
@@ -157,16 +324,18 @@ class TimerApp(App):
         self.greeting_label = Label(
             text=f"Привет, {self.user_name}! Готовы к фокусировке?",
             font_size='16sp',
-            color=(1, 1, 1, 1) if self.is_dark_theme else (0.2, 0.2, 0.2, 1),
             text_size=(None, None),
             halign='left',
             size_hint_x=0.8
         )
+        self.theme.bind(self.greeting_label, 'color', 'text')
+        # Скрытый жест: тройное касание приветствия включает панель замеров
+        self.greeting_label.bind(on_touch_down=self.on_greeting_touch)
         header_layout.add_widget(self.greeting_label)
         
         # Переключатель темы
         self.theme_button = ModernButton(
-            text='☀️' if self.is_dark_theme else '🌙',
+            text='☀️' if self.theme.is_dark else '🌙',
             size_hint=(None, None),
             size=(dp(60), dp(48)),
             font_size='20sp'
@@ -174,11 +343,23 @@ class TimerApp(App):
         self.theme_button.bind(on_press=self.toggle_theme)
         header_layout.add_widget(self.theme_button)
         
-        header_card.add_widget(header_layout)
-        main_layout.add_widget(header_card)
+        # Настройки, в том числе адрес резервной копии
+        settings_button = ModernButton(
+            text='⚙️',
+            size_hint=(None, None),
+            size=(dp(60), dp(48)),
+            font_size='20sp'
+        )
+        settings_button.bind(on_press=lambda instance: self.open_settings())
+        header_layout.add_widget(settings_button)
         
+        header_card.add_widget(header_layout)
+        return header_card
+    
+    def build_timer_card(self):
+        """Карточка таймера"""
         # Карточка таймера
-        timer_card = Card(size_hint=(1, None), height=dp(280))
+        timer_card = Card(size_hint=(1, None), height=dp(330))
         timer_layout = BoxLayout(orientation='vertical', padding=dp(20), spacing=dp(16))
         
         # Заголовок таймера
@@ -186,10 +367,10 @@ class TimerApp(App):
             text='ФОКУС-ТАЙМЕР',
             font_size='20sp',
             bold=True,
-            color=(1, 1, 1, 1) if self.is_dark_theme else (0.2, 0.2, 0.2, 1),
             size_hint_y=None,
             height=dp(30)
         )
+        self.theme.bind(timer_title, 'color', 'text')
         timer_layout.add_widget(timer_title)
         
         # Ввод времени с лейблом
@@ -197,9 +378,9 @@ class TimerApp(App):
         time_label = Label(
             text='Минуты:',
             font_size='16sp',
-            size_hint_x=0.4,
-            color=(1, 1, 1, 1) if self.is_dark_theme else (0.2, 0.2, 0.2, 1)
+            size_hint_x=0.4
         )
+        self.theme.bind(time_label, 'color', 'text')
         time_input_layout.add_widget(time_label)
         
         self.time_input = TextInput(
@@ -209,9 +390,9 @@ class TimerApp(App):
             size_hint_x=0.6,
             size_hint_y=None,
             height=dp(50),
-            input_filter='int',
-            background_color=(0.2, 0.2, 0.2, 1) if self.is_dark_theme else (0.95, 0.95, 0.95, 1)
+            input_filter='int'
         )
+        self.theme.bind(self.time_input, 'background_color', 'input')
         time_input_layout.add_widget(self.time_input)
         timer_layout.add_widget(time_input_layout)
         
@@ -259,31 +440,35 @@ class TimerApp(App):
         
         timer_layout.add_widget(timer_buttons)
         timer_card.add_widget(timer_layout)
-        main_layout.add_widget(timer_card)
-        
+        return timer_card
+    
+    def build_activity_card(self):
+        """Карточка активности"""
         # Карточка активности
-        activity_card = Card(size_hint=(1, None), height=dp(200))
+        activity_card = Card(size_hint=(1, None), height=dp(230))
         activity_layout = BoxLayout(orientation='vertical', padding=dp(20), spacing=dp(12))
         
         activity_title = Label(
             text='ВАША АКТИВНОСТЬ',
             font_size='16sp',
             bold=True,
-            color=(1, 1, 1, 1) if self.is_dark_theme else (0.2, 0.2, 0.2, 1),
             size_hint_y=None,
             height=dp(30)
         )
+        self.theme.bind(activity_title, 'color', 'text')
         activity_layout.add_widget(activity_title)
         
         self.activity_input = TextInput(
+            text=self.restored_activity,
             multiline=True,
             font_size='14sp',
             size_hint_y=None,
             height=dp(80),
-            hint_text='Опишите, чем занимались во время фокус-сессии...',
-            background_color=(0.2, 0.2, 0.2, 1) if self.is_dark_theme else (0.95, 0.95, 0.95, 1)
+            hint_text='Опишите, чем занимались во время фокус-сессии...'
         )
+        self.theme.bind(self.activity_input, 'background_color', 'input')
         self.activity_input.bind(focus=self.on_activity_focus)
+        self.activity_input.bind(text=lambda *args: self.snapshot_trigger())
         activity_layout.add_widget(self.activity_input)
         
         self.save_button = ModernButton(
@@ -292,30 +477,127 @@ class TimerApp(App):
             button_type='primary',
             size_hint_y=None,
             height=dp(50),
-            disabled=True,
+            disabled=self.session.state != FINISHED,
             bold=True
         )
         self.save_button.bind(on_press=self.save_activity)
         activity_layout.add_widget(self.save_button)
         
         activity_card.add_widget(activity_layout)
-        main_layout.add_widget(activity_card)
+        return activity_card
+    
+    def build_reminders_card(self):
+        """Карточка напоминаний, идущих параллельно с фокус-сессией"""
+        reminders_card = Card(size_hint=(1, None), height=dp(210))
+        reminders_layout = BoxLayout(orientation='vertical', padding=dp(20), spacing=dp(10))
+        
+        reminders_title = Label(
+            text='НАПОМИНАНИЯ',
+            font_size='16sp',
+            bold=True,
+            size_hint_y=None,
+            height=dp(30)
+        )
+        self.theme.bind(reminders_title, 'color', 'text')
+        reminders_layout.add_widget(reminders_title)
+        
+        input_row = BoxLayout(orientation='horizontal', spacing=dp(8), size_hint_y=None, height=dp(44))
+        self.reminder_input = TextInput(
+            multiline=False,
+            font_size='14sp',
+            hint_text='Чай, созвон...',
+            size_hint_x=0.55
+        )
+        self.theme.bind(self.reminder_input, 'background_color', 'input')
+        input_row.add_widget(self.reminder_input)
         
+        self.reminder_minutes = TextInput(
+            text='5',
+            multiline=False,
+            font_size='14sp',
+            input_filter='int',
+            size_hint_x=0.2
+        )
+        self.theme.bind(self.reminder_minutes, 'background_color', 'input')
+        input_row.add_widget(self.reminder_minutes)
+        
+        add_button = ModernButton(text='+', font_size='18sp', button_type='success', size_hint_x=0.25)
+        add_button.bind(on_press=self.add_reminder)
+        input_row.add_widget(add_button)
+        reminders_layout.add_widget(input_row)
+        
+        self.reminders_label = Label(font_size='13sp', halign='left', valign='top')
+        self.theme.bind(self.reminders_label, 'color', 'text')
+        self.reminders_label.bind(size=self.reminders_label.setter('text_size'))
+        reminders_layout.add_widget(self.reminders_label)
+        
+        cancel_button = ModernButton(
+            text='ОТМЕНИТЬ ВСЕ',
+            font_size='14sp',
+            button_type='secondary',
+            size_hint_y=None,
+            height=dp(40)
+        )
+        cancel_button.bind(on_press=self.cancel_reminders)
+        reminders_layout.add_widget(cancel_button)
+        self.update_reminders_label()
+        
+        reminders_card.add_widget(reminders_layout)
+        return reminders_card
+    
+    def build_stats_card(self):
+        """Карточка статистики"""
+        # Карточка статистики
+        stats_card = Card(size_hint=(1, None), height=dp(260))
+        stats_layout = BoxLayout(orientation='vertical', padding=dp(20), spacing=dp(8))
+        
+        stats_title = Label(
+            text='СТАТИСТИКА',
+            font_size='16sp',
+            bold=True,
+            size_hint_y=None,
+            height=dp(30)
+        )
+        self.theme.bind(stats_title, 'color', 'text')
+        stats_layout.add_widget(stats_title)
+        
+        self.stats_label = Label(
+            font_size='14sp',
+            halign='left',
+            valign='top'
+        )
+        self.theme.bind(self.stats_label, 'color', 'text')
+        self.stats_label.bind(size=self.stats_label.setter('text_size'))
+        stats_layout.add_widget(self.stats_label)
+        self.update_stats_card()
+        
+        # Год фокус-времени: клетки рисуются мешами, а не виджетами
+        self.heatmap = FocusHeatmap(
+            daily=self.stats.daily, color=COLOR_SUCCESS, size_hint_y=None, height=dp(100)
+        )
+        self.theme.bind(self.heatmap, 'empty_color', 'input')
+        stats_layout.add_widget(self.heatmap)
+        
+        stats_card.add_widget(stats_layout)
+        return stats_card
+    
+    def build_log_card(self):
+        """Карточка управления логом"""
         # Карточка управления логом
-        log_card = Card(size_hint=(1, None), height=dp(120))
+        log_card = Card(size_hint=(1, None), height=dp(260))
         log_layout = BoxLayout(orientation='vertical', padding=dp(20), spacing=dp(12))
         
         log_title = Label(
             text='ИСТОРИЯ ДОСТИЖЕНИЙ',
             font_size='16sp',
             bold=True,
-            color=(1, 1, 1, 1) if self.is_dark_theme else (0.2, 0.2, 0.2, 1),
             size_hint_y=None,
             height=dp(30)
         )
+        self.theme.bind(log_title, 'color', 'text')
         log_layout.add_widget(log_title)
         
-        log_buttons = GridLayout(cols=2, size_hint_y=None, height=dp(50), spacing=dp(12))
+        log_buttons = GridLayout(cols=3, size_hint_y=None, height=dp(50), spacing=dp(12))
         
         view_log_button = ModernButton(
             text='ПОСМОТРЕТЬ',
@@ -333,64 +615,119 @@ class TimerApp(App):
         clear_log_button.bind(on_press=self.clear_log)
         log_buttons.add_widget(clear_log_button)
         
-        log_layout.add_widget(log_buttons)
-        log_card.add_widget(log_layout)
-        main_layout.add_widget(log_card)
-        
-        # Статус с эмоциональными сообщениями
-        self.status_label = Label(
-            text='✨ Готовы начать продуктивную сессию?',
+        export_button = ModernButton(
+            text='ЭКСПОРТ',
             font_size='14sp',
-            color=(0.3, 0.7, 1, 1),
-            size_hint_y=None,
-            height=dp(40),
-            text_size=(None, None),
-            halign='center'
+            button_type='secondary'
         )
-        main_layout.add_widget(self.status_label)
+        export_button.bind(on_press=self.export_log)
+        log_buttons.add_widget(export_button)
         
-        # Пространство для клавиатуры
-        spacer = Widget(size_hint_y=None, height=dp(100))
-        main_layout.add_widget(spacer)
-        
-        main_container.add_widget(main_layout)
-        
-        # Настраиваем тему
-        self.apply_theme()
+        log_layout.add_widget(log_buttons)
         
-        # Сохраняем ссылки на карточки для смены темы
-        self.cards = [header_card, timer_card, activity_card, log_card]
+        # Последние сессии читаются с конца журнала, а дальше только дописываются
+        recent_layout = BoxLayout(orientation='vertical', size_hint_y=None, height=dp(110))
+        self.recent_labels = []
+        for _ in range(5):
+            label = Label(font_size='12sp', halign='left', valign='middle', shorten=True)
+            label.bind(size=label.setter('text_size'))
+            self.theme.bind(label, 'color', 'text')
+            recent_layout.add_widget(label)
+            self.recent_labels.append(label)
+        try:
+            self.recent_sessions = self.store.tail(len(self.recent_labels))
+        except Exception as e:
+            print(f"Ошибка чтения последних сессий: {e}")
+            self.recent_sessions = []
+        self.update_recent_sessions()
+        log_layout.add_widget(recent_layout)
         
-        return main_container
+        log_card.add_widget(log_layout)
+        return log_card
+    
+    def update_recent_sessions(self):
+        """Обновляет полосу последних сессий, новые сверху"""
+        rows = [
+            f"{record.start:%d.%m %H:%M} · {record.duration} мин · {record.activity}"
+            for record in reversed(self.recent_sessions)
+        ]
+        if not rows:
+            rows.append("Пока нет сохранённых сессий")
+        for i, label in enumerate(self.recent_labels):
+            text = rows[i] if i < len(rows) else ''
+            if label.text != text:
+                label.text = text
+    
+    def migrate_text_log(self, text_path):
+        """Переносит старый текстовый журнал в журнал сессий"""
+        if not os.path.exists(text_path) or self.store.count():
+            return
+        try:
+            import_text_log(text_path, self.store)
+        except Exception as e:
+            print(f"Ошибка переноса журнала: {e}")
+    
+    def sync_stats(self):
+        """Пересобирает сводку, если она не совпадает с журналом"""
+        if self.stats.session_count == self.store.count():
+            return
+        try:
+            self.stats.rebuild(self.store.iter_records())
+            self.stats.save()
+        except Exception as e:
+            print(f"Ошибка пересчёта статистики: {e}")
+    
+    def update_stats_card(self):
+        """Обновляет карточку статистики из готовой сводки"""
+        summary = self.stats.summary()
+        self.stats_label.text = (
+            f"⏱️ Сегодня: {summary['today']} мин · За неделю: {summary['week']} мин\n"
+            f"🔥 Серия: {summary['streak']} дн. · Рекорд: {summary['longest_streak']} дн.\n"
+            f"🎯 Всего сессий: {summary['session_count']}"
+        )
+    
+    def build_config(self, config):
+        config.setdefaults('sync', {'url': ''})
+    
+    def build_settings(self, settings):
+        settings.add_json_panel('Фокус-таймер', self.config, data=SETTINGS_PANEL)
+    
+    def on_config_change(self, config, section, key, value):
+        if (section, key) == ('sync', 'url'):
+            self.start_sync(value)
+    
+    def start_sync(self, url):
+        """Включает, перенастраивает или выключает резервную копию журнала"""
+        url = (url or '').strip()
+        if self.sync:
+            if self.sync.url == url:
+                return
+            self.sync.close()
+            self.sync = None
+        if url:
+            # Модуль синхронизации нужен только с заданным адресом
+            from sync import JournalSync
+            self.sync = JournalSync(self.store, url, "sessions.sync.json")
     
     def toggle_theme(self, instance):
-        """Переключение темы"""
-        self.is_dark_theme = not self.is_dark_theme
-        self.theme_button.text = '☀️' if self.is_dark_theme else '🌙'
-        self.apply_theme()
-        
-        # Анимация смены темы
-        for card in self.cards:
-            card.set_theme(self.is_dark_theme)
-    
-    def apply_theme(self):
-        """Применяет текущую тему"""
-        if self.is_dark_theme:
-            Window.clearcolor = (0.1, 0.1, 0.1, 1)  # Тёмный фон
-            text_color = (1, 1, 1, 1)
-        else:
-            Window.clearcolor = (0.95, 0.95, 0.95, 1)  # Светлый фон
-            text_color = (0.2, 0.2, 0.2, 1)
-        
-        # Обновляем цвета текста
-        if hasattr(self, 'greeting_label'):
-            self.greeting_label.color = text_color
+        """Переключение темы одним проходом по привязанным свойствам"""
+        self.layout_counter.begin('смена темы')
+        elapsed = self.theme.toggle()
+        self.theme_button.text = '☀️' if self.theme.is_dark else '🌙'
+        if self.profiler.enabled:
+            print(f"🎨 Смена темы: {elapsed * 1000:.2f} мс, привязок: {self.theme.count()}")
     
     def on_activity_focus(self, instance, value):
         """Прокрутка при фокусе на поле активности"""
+        self.layout_counter.begin('клавиатура')
         if value:
             Clock.schedule_once(lambda dt: self.scroll_to_input(), 0.3)
     
+    def on_layout_count(self):
+        # Отчёт печатается, когда перекладки стихли на полсекунды
+        self.layout_report.cancel()
+        self.layout_report()
+    
     def scroll_to_input(self):
         """Прокрутка к полю ввода"""
         try:
@@ -402,6 +739,7 @@ class TimerApp(App):
     def request_android_permissions(self):
         """Запрос разрешений Android"""
         if android_available:
+            from android.permissions import request_permissions, Permission
             request_permissions([
                 Permission.WRITE_EXTERNAL_STORAGE,
                 Permission.READ_EXTERNAL_STORAGE,
@@ -411,14 +749,142 @@ class TimerApp(App):
             ])
     
     def on_pause(self):
-        """Работа в фоне"""
-        if self.timer_running:
-            self.show_notification(
-                "🔥 Фокус-сессия активна",
-                f"Продолжаем концентрацию! Осталось: {self.time_left // 60:02d}:{self.time_left % 60:02d}"
-            )
+        """Работа в фоне: отсчёт и уведомление ведёт сервис таймера"""
+        # Невидимый дисплей не перерисовываем, событие дедлайна остаётся
+        self.is_visible = False
+        Clock.unschedule(self.update_timer)
+        
+        # Событие Clock в фоне не приходит: напоминания звенят из сервиса
+        if self.reminders:
+            self.timer_service.hand_reminders(self.pending_reminders())
+            self.reminders_handed_off = True
+        
+        # Всё, что стоит в очереди записи, должно попасть на диск до сворачивания
+        self.log_writer.flush()
+        self.save_snapshot()
         return True
     
+    def on_stop(self):
+        """Дописываем журнал перед закрытием"""
+        self.log_writer.close()
+        if self.sync:
+            self.sync.close()
+        
+        # FOCUS_TIMER_TRACE=путь сохраняет трассу при выходе
+        trace_path = os.environ.get('FOCUS_TIMER_TRACE')
+        if trace_path and self.tracer.enabled:
+            self.tracer.dump(trace_path)
+    
+    def on_greeting_touch(self, instance, touch):
+        if instance.collide_point(*touch.pos) and touch.is_triple_tap:
+            self.toggle_hud()
+            return True
+        return False
+    
+    def toggle_hud(self):
+        """Показывает или прячет панель замеров производительности"""
+        from perf_hud import PerfHUD
+        
+        if self.hud is None:
+            self.hud = PerfHUD(self.tracer, on_dump=self.dump_trace)
+        if self.hud.parent is None:
+            self.tracer.set_enabled(True)
+            self.hud.show()
+        else:
+            self.hud.hide()
+            self.tracer.set_enabled(False)
+    
+    def dump_trace(self):
+        """Сохраняет трассу для chrome://tracing или Perfetto"""
+        try:
+            path = os.path.join(
+                get_platform_services().export_dir(),
+                f"focus_timer_trace_{datetime.now():%Y%m%d_%H%M%S}.json"
+            )
+            self.tracer.dump(path)
+            self.show_status_message(f"📈 Трасса сохранена: {os.path.basename(path)}")
+        except Exception as e:
+            self.show_status_message(f"❌ Ошибка сохранения трассы: {e}", error=True)
+    
+    def on_resume(self):
+        """Возврат из фона: подключаемся к сервису и пересчитываем остаток"""
+        self.is_visible = True
+        if self.sync:
+            # Сеть могла появиться, пока приложение было в фоне
+            self.sync.notify()
+        if self.reminders_handed_off:
+            self.take_back_reminders()
+        if not self.session.running:
+            return
+        
+        status = self.timer_service.status()
+        if status and status['finished']:
+            # Сервис уже уведомил о завершении, повторный сигнал не нужен
+            self.timer_finished(alert=False)
+            return
+        if status and status['running']:
+            self.session.timer.set_remaining(status['remaining'])
+        
+        if self.session.finished:
+            self.on_deadline(0)
+            return
+        self.schedule_deadline()
+        self.update_timer(0)
+    
+    def save_snapshot(self):
+        """Сохраняет состояние сессии и введённый текст"""
+        self.snapshot_trigger.cancel()
+        activity = self.activity_input.text if self.activity_input else self.restored_activity
+        try:
+            self.snapshot.save(
+                self.session,
+                time_input=self.time_input.text,
+                display=self.time_display.text,
+                activity=activity,
+                reminders=[
+                    {'id': timer_id, 'label': label, 'at': at.timestamp()}
+                    for timer_id, (label, at) in self.reminders.items()
+                ]
+            )
+        except OSError as e:
+            print(f"Ошибка сохранения снимка сессии: {e}")
+    
+    def restore_session(self):
+        """Восстанавливает сессию, прерванную гибелью процесса"""
+        data = self.snapshot.load()
+        if not data:
+            return
+        try:
+            self.session.restore(data)
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"Ошибка восстановления сессии: {e}")
+            self.session.reset()
+            return
+        
+        self.restore_reminders(data.get('reminders', []))
+        self.time_input.text = data.get('time_input', self.time_input.text)
+        self.restored_activity = data.get('activity', '')
+        if self.session.running:
+            self.time_display.text, self.time_display.color = self.session.tick()
+            self.start_button.disabled = True
+            self.stop_button.disabled = False
+            self.time_input.readonly = True
+        else:
+            self.time_display.text = data.get('display', self.time_display.text)
+            if self.session.state == FINISHED:
+                self.time_display.color = COLOR_SUCCESS
+    
+    def resume_restored_session(self):
+        """Продолжает восстановленный отсчёт, когда интерфейс достроен"""
+        status = self.timer_service.status()
+        if not status or not (status['running'] or status['finished']):
+            # Сервис погиб вместе с процессом: запускаем его на остаток.
+            # Истёкший отсчёт завершит интерфейс, иначе сервис подал бы второй сигнал
+            if not self.session.finished:
+                self.timer_service.start(self.session.timer.remaining())
+        self.wakeups.start_session()
+        self.on_resume()
+    
     def start_timer(self, instance):
         try:
             minutes = int(self.time_input.text)
@@ -426,9 +892,8 @@ class TimerApp(App):
                 self.show_status_message("⚠️ Время должно быть положительным", error=True)
                 return
                 
-            self.time_left = minutes * 60
-            self.timer_running = True
-            self.start_time = datetime.now()
+            self.session.start(minutes)
+            self.timer_service.start(minutes * 60)
             
             # Анимация запуска
             self.time_display.start_pulse()
@@ -447,51 +912,97 @@ class TimerApp(App):
                 f"Сессия на {minutes} минут началась. Удачной концентрации!"
             )
             
-            # Запускаем таймер
-            Clock.schedule_interval(self.update_timer, 1)
+            # Запускаем таймер: одно событие на окончание и перерисовка раз в секунду
+            self.wakeups.start_session()
+            self.schedule_deadline()
+            self.schedule_tick()
+            self.save_snapshot()
             
         except ValueError:
             self.show_status_message("❌ Введите корректное число", error=True)
     
+    def schedule_deadline(self):
+        """Ставит одно событие ровно на момент окончания сессии"""
+        self.cancel_deadline()
+        self.focus_timer = self.timers.add(
+            self.session.timer.remaining(), lambda timer_id, label: self.on_deadline(0), 'focus'
+        )
+    
+    def cancel_deadline(self):
+        if self.focus_timer is not None:
+            self.timers.cancel(self.focus_timer)
+            self.focus_timer = None
+    
+    def on_deadline(self, dt):
+        self.focus_timer = None
+        self.wakeups.count('дедлайн')
+        with self.tracer.span('on_deadline', 'clock'):
+            if not self.session.running:
+                return
+            if not self.session.finished:
+                # Событие пришло раньше дедлайна (например, после переноса остатка)
+                self.schedule_deadline()
+                return
+            # Сервис мог проснуться к дедлайну раньше интерфейса и уже подать сигнал
+            status = self.timer_service.status()
+            self.timer_finished(alert=not (status and status['finished']))
+    
+    def arm_timers(self, delay):
+        """Переставляет единственное событие Clock на ближайший дедлайн"""
+        if self.timer_event is not None:
+            self.timer_event.cancel()
+            self.timer_event = None
+        if delay is not None:
+            self.timer_event = Clock.schedule_once(self.on_timers_due, delay + 0.01)
+    
+    def on_timers_due(self, dt):
+        self.timer_event = None
+        with self.tracer.span('on_timers_due', 'clock'):
+            self.timers.fire_due()
+    
+    def schedule_tick(self):
+        """Планирует перерисовку на момент смены видимой секунды"""
+        Clock.unschedule(self.update_timer)
+        if self.is_visible:
+            Clock.schedule_once(self.update_timer, self.session.timer.next_tick_delay() + 0.01)
+    
     def update_timer(self, dt):
-        if self.timer_running and self.time_left > 0:
-            self.time_left -= 1
-            minutes = self.time_left // 60
-            seconds = self.time_left % 60
-            self.time_display.text = f"{minutes:02d}:{seconds:02d}"
+        """Только перерисовка дисплея; окончание ловит on_deadline"""
+        self.wakeups.count('перерисовка')
+        with self.tracer.span('update_timer', 'clock'):
+            if not self.session.running or self.session.finished:
+                return
             
-            # Изменяем цвет по времени
-            if self.time_left <= 60:
-                self.time_display.color = (1, 0.3, 0.3, 1)  # Красный
-            elif self.time_left <= 300:
-                self.time_display.color = (1, 0.6, 0.2, 1)  # Оранжевый
-            else:
-                self.time_display.color = (0.3, 0.7, 1, 1)  # Синий
+            # Перерисовываем только при смене видимой секунды, цвет зависит от остатка
+            display = self.session.tick()
+            if display is not None:
+                self.time_display.text, self.time_display.color = display
             
-            if self.time_left <= 0:
-                self.timer_finished()
-                
-        return self.timer_running
+            self.schedule_tick()
     
-    def timer_finished(self):
-        self.timer_running = False
+    def timer_finished(self, alert=True):
+        self.session.finish()
+        self.timer_service.shutdown()
+        self.cancel_deadline()
+        self.wakeups.end_session()
         self.time_display.text = "00:00"
-        self.time_display.color = (0.2, 0.8, 0.4, 1)  # Зеленый - успех
+        self.time_display.color = COLOR_SUCCESS
         self.time_display.stop_pulse()
         
         # Эмоциональное сообщение
         self.show_status_message("🎉 Поздравляем! Сессия завершена успешно!")
         
-        # Уведомление с мотивацией
-        motivational_msg = random.choice(self.motivational_messages)
-        self.show_notification(
-            "✅ Фокус-сессия завершена!",
-            motivational_msg,
-            urgent=True
-        )
-        
-        # Звук и вибрация
-        self.play_notification_sound()
+        if alert:
+            # Уведомление с мотивацией
+            motivational_msg = random.choice(self.motivational_messages)
+            self.show_notification(
+                "✅ Фокус-сессия завершена!",
+                motivational_msg,
+                urgent=True
+            )
+            
+            # Звук и вибрация
+            self.play_notification_sound()
         
         # Интерфейс
         self.save_button.disabled = False
@@ -501,6 +1012,85 @@ class TimerApp(App):
         self.activity_input.focus = True
         
         Clock.unschedule(self.update_timer)
+        self.save_snapshot()
+    
+    def add_reminder(self, instance):
+        """Добавляет напоминание в общую кучу таймеров"""
+        try:
+            minutes = int(self.reminder_minutes.text)
+        except ValueError:
+            minutes = 0
+        if minutes <= 0:
+            self.show_status_message("⚠️ Время напоминания должно быть положительным", error=True)
+            return
+        
+        label = self.reminder_input.text.strip() or 'Напоминание'
+        timer_id = self.timers.add(minutes * 60, self.on_reminder, label)
+        # Показываем время срабатывания, а не остаток: списку не нужен ежесекундный тик
+        self.reminders[timer_id] = (label, datetime.now() + timedelta(minutes=minutes))
+        self.reminder_input.text = ''
+        self.update_reminders_label()
+        self.snapshot_trigger()
+        self.show_status_message(f"⏰ Напомню через {minutes} мин: {label}")
+    
+    def pending_reminders(self):
+        """Напоминания для сервиса: номер, подпись и остаток в секундах"""
+        return [
+            {'id': timer_id, 'label': label, 'seconds': self.timers.remaining(timer_id)}
+            for timer_id, (label, at) in self.reminders.items()
+        ]
+    
+    def take_back_reminders(self):
+        """Снимает напоминания, которые уже прозвенели из сервиса"""
+        self.reminders_handed_off = False
+        fired = self.timer_service.take_reminders() or []
+        for timer_id in fired:
+            self.timers.cancel(timer_id)
+            self.reminders.pop(timer_id, None)
+        if fired:
+            self.update_reminders_label()
+    
+    def restore_reminders(self, saved):
+        """Ставит заново напоминания из снимка; пропущенные звенят сразу"""
+        if not saved:
+            return
+        fired = set(self.timer_service.take_reminders() or [])
+        now = datetime.now()
+        for reminder in saved:
+            if reminder['id'] in fired:
+                continue
+            at = datetime.fromtimestamp(reminder['at'])
+            seconds = max(0.0, (at - now).total_seconds())
+            timer_id = self.timers.add(seconds, self.on_reminder, reminder['label'])
+            self.reminders[timer_id] = (reminder['label'], at)
+    
+    def on_reminder(self, timer_id, label):
+        self.wakeups.count('напоминание')
+        self.reminders.pop(timer_id, None)
+        self.update_reminders_label()
+        self.snapshot_trigger()
+        self.show_status_message(f"⏰ {label}")
+        self.show_notification("⏰ Напоминание", label, urgent=True)
+        self.play_notification_sound()
+    
+    def cancel_reminders(self, instance):
+        for timer_id in self.reminders:
+            self.timers.cancel(timer_id)
+        self.reminders.clear()
+        self.update_reminders_label()
+        self.snapshot_trigger()
+    
+    def update_reminders_label(self):
+        if self.reminders_label is None:
+            # Карточка напоминаний ещё не построена
+            return
+        if not self.reminders:
+            self.reminders_label.text = "Нет активных напоминаний"
+            return
+        self.reminders_label.text = "\n".join(
+            f"⏰ {label} — в {at:%H:%M}"
+            for label, at in sorted(self.reminders.values(), key=lambda item: item[1])
+        )
     
     def show_status_message(self, message, error=False):
         """Показывает статусное сообщение с анимацией"""
@@ -513,58 +1103,42 @@ class TimerApp(App):
         
         # Анимация появления
         anim = Animation(opacity=0, duration=0.1) + Animation(opacity=1, duration=0.3)
-        anim.start(self.status_label)
+        get_animation_manager().start(self.status_label, anim, rest={'opacity': 1})
     
     def show_notification(self, title, message, urgent=False):
         """Уведомления Android"""
-        if android_available:
-            try:
-                notification.notify(
-                    title=title,
-                    message=message,
-                    app_name="Focus Timer",
-                    timeout=10 if not urgent else 0,
-                    toast=urgent
-                )
-            except Exception as e:
-                print(f"Ошибка уведомления: {e}")
+        try:
+            get_platform_services().notify(title, message, urgent=urgent)
+        except Exception as e:
+            print(f"Ошибка уведомления: {e}")
     
     def play_notification_sound(self):
         """Звук и вибрация"""
-        if android_available:
-            try:
-                PythonActivity = autoclass('org.kivy.android.PythonActivity')
-                context = PythonActivity.mActivity
-                
-                RingtoneManager = autoclass('android.media.RingtoneManager')
-                notification_uri = RingtoneManager.getDefaultUri(RingtoneManager.TYPE_NOTIFICATION)
-                ringtone = RingtoneManager.getRingtone(context, notification_uri)
-                
-                if ringtone:
-                    ringtone.play()
-                
-                # Вибрация
-                vibrator = context.getSystemService(context.VIBRATOR_SERVICE)
-                if vibrator and vibrator.hasVibrator():
-                    vibrator.vibrate(1000)
-                    
-            except Exception as e:
-                print(f"Ошибка звука: {e}")
+        try:
+            get_platform_services().play_alert()
+        except Exception as e:
+            print(f"Ошибка звука: {e}")
     
     def stop_timer(self, instance):
-        self.timer_running = False
+        self.session.stop()
+        self.timer_service.shutdown()
+        self.cancel_deadline()
+        self.wakeups.end_session()
         self.time_display.stop_pulse()
         self.start_button.disabled = False
         self.stop_button.disabled = True
         self.time_input.readonly = False
         self.show_status_message("⏸️ Сессия приостановлена. Готовы продолжить?")
         Clock.unschedule(self.update_timer)
+        self.save_snapshot()
     
     def reset_timer(self, instance):
-        self.timer_running = False
-        self.time_left = 0
+        self.session.reset()
+        self.timer_service.shutdown()
+        self.cancel_deadline()
+        self.wakeups.end_session()
         self.time_display.text = "00:00"
-        self.time_display.color = (0.3, 0.7, 1, 1)
+        self.time_display.color = COLOR_NORMAL
         self.time_display.stop_pulse()
         self.start_button.disabled = False
         self.stop_button.disabled = True
@@ -573,6 +1147,7 @@ class TimerApp(App):
         self.activity_input.text = ""
         self.show_status_message("🔄 Готовы к новой продуктивной сессии?")
         Clock.unschedule(self.update_timer)
+        self.save_snapshot()
     
     def save_activity(self, instance):
         activity = self.activity_input.text.strip()
@@ -581,55 +1156,110 @@ class TimerApp(App):
             return
         
         try:
-            duration_minutes = int(self.time_input.text)
-            end_time = datetime.now()
-            
-            if not os.path.exists(self.log_file):
-                with open(self.log_file, "w", encoding="utf-8") as f:
-                    f.write("🏆 ЖУРНАЛ ДОСТИЖЕНИЙ И ПРОДУКТИВНОСТИ 🏆\n\n")
-            
-            with open(self.log_file, "a", encoding="utf-8") as f:
-                f.write(
-                    f"📅 {self.start_time:%Y-%m-%d %H:%M:%S} → "
-                    f"{end_time:%Y-%m-%d %H:%M:%S}\n"
-                    f"⏱️ Фокус-время: {duration_minutes} минут\n"
-                    f"🎯 Достижение: {activity}\n"
-                    f"{'=' * 50}\n\n"
-                )
+            record = self.session.make_record(activity)
             
-            # Мотивационное сообщение
-            success_msg = random.choice(self.motivational_messages)
-            self.show_status_message(f"💾 {success_msg}")
+            # Запись идёт в фоновом потоке, результат придёт в on_activity_saved
+            submitted = time.perf_counter()
+            self.log_writer.submit(
+                record, lambda error: self.on_activity_saved(record, error, submitted)
+            )
             
             self.save_button.disabled = True
             self.activity_input.text = ""
             
-            # Анимация успеха
-            anim = Animation(size=(self.save_button.size[0] * 1.1, self.save_button.size[1] * 1.1), 
-                           duration=0.2) + \
-                   Animation(size=self.save_button.size, duration=0.2)
-            anim.start(self.save_button)
+            # Запись отдана в журнал: после перезапуска её не предложат сохранить снова
+            self.session.reset()
+            self.save_snapshot()
             
-            self.show_notification(
-                "🎉 Прогресс сохранён!",
-                f"Отличная работа! Записано: {activity}"
-            )
+            # Анимация успеха
+            self.save_button.bounce()
             
         except Exception as e:
             self.show_status_message(f"❌ Ошибка сохранения: {e}", error=True)
     
+    def write_sessions(self, records, sync):
+        """Пакетная запись сессий (выполняется в потоке записи)"""
+        with self.tracer.span('write_sessions', 'io'):
+            last_id = self.store.append_many(records, sync=sync)
+            if not records:
+                return
+            
+            # Записи уже в журнале: сбой индекса или сводки не делает сохранение
+            # неудачным, иначе повтор задвоит сессию. Индекс догонит журнал
+            # при следующем поиске, сводка пересоберётся при запуске
+            try:
+                self.search_index.add_records(last_id - len(records) + 1, records)
+            except Exception as e:
+                print(f"Ошибка индекса поиска: {e}")
+            
+            # Статистика обновляется по новым записям, без пересчёта журнала
+            try:
+                for record in records:
+                    self.stats.add(record)
+                self.stats.save()
+            except Exception as e:
+                print(f"Ошибка сохранения статистики: {e}")
+            if self.sync:
+                self.sync.notify()
+    
+    def on_activity_saved(self, record, error, submitted):
+        """Результат фоновой записи, вызывается в UI-потоке"""
+        # Задержка от нажатия «Сохранить» до подтверждения записи на диск
+        if self.tracer.enabled:
+            self.tracer.record('save_activity', 'io', submitted, time.perf_counter() - submitted)
+        if error:
+            self.show_status_message(f"❌ Ошибка сохранения: {error}", error=True)
+            self.activity_input.text = record.activity
+            self.save_button.disabled = False
+            return
+        
+        self.update_stats_card()
+        day = record.start.date()
+        self.heatmap.set_day(day, self.stats.daily.get(day.isoformat(), 0), self.stats.daily)
+        self.recent_sessions = (self.recent_sessions + [record])[-len(self.recent_labels):]
+        self.update_recent_sessions()
+        
+        # Мотивационное сообщение
+        success_msg = random.choice(self.motivational_messages)
+        self.show_status_message(f"💾 {success_msg}")
+        
+        self.show_notification(
+            "🎉 Прогресс сохранён!",
+            f"Отличная работа! Записано: {record.activity}"
+        )
+    
     def view_log(self, instance):
         """Современный просмотр лога"""
-        try:
-            if not os.path.exists(self.log_file):
-                content_text = "📝 Ваш журнал достижений пока пуст.\n\n🚀 Начните фокус-сессию, чтобы записать свой первый успех!"
-            else:
-                with open(self.log_file, "r", encoding="utf-8") as f:
-                    content_text = f.read()
-                    if not content_text.strip():
-                        content_text = "📝 Ваш журнал достижений пока пуст.\n\n🚀 Начните фокус-сессию, чтобы записать свой первый успех!"
-        except Exception as e:
-            content_text = f"❌ Ошибка чтения журнала: {e}"
+        with self.dialog_profiler.measure('view_log'), self.tracer.span('view_log', 'io'):
+            if self.log_popup is None:
+                self.build_log_dialog()
+            
+            # Окно переиспользуется: сбрасываем поиск и перечитываем журнал
+            self.log_search.text = ''
+            self.search_trigger.cancel()
+            self.log_body.clear_widgets()
+            try:
+                if self.store.count():
+                    self.log_view.reload()
+                    self.log_body.add_widget(self.log_search)
+                    self.log_body.add_widget(self.log_view)
+                    
+                    # Индекс загружается в фоне, пока пользователь смотрит журнал
+                    self.refresh_search_index()
+                else:
+                    self.log_message.text = "📝 Ваш журнал достижений пока пуст.\n\n🚀 Начните фокус-сессию, чтобы записать свой первый успех!"
+                    self.log_body.add_widget(self.log_message)
+            except Exception as e:
+                self.log_message.text = f"❌ Ошибка чтения журнала: {e}"
+                self.log_body.clear_widgets()
+                self.log_body.add_widget(self.log_message)
+            
+            self.log_popup.open()
+    
+    def build_log_dialog(self):
+        """Окно журнала строится один раз и переиспользуется при каждом открытии"""
+        from kivy.uix.popup import Popup
+        from journal_view import JournalView
         
         # Современный popup
         content = BoxLayout(orientation='vertical', spacing=dp(16), padding=dp(20))
@@ -644,17 +1274,16 @@ class TimerApp(App):
         )
         content.add_widget(title_label)
         
-        scroll = ScrollView()
-        log_label = Label(
-            text=content_text,
-            font_size='14sp',
-            text_size=(None, None),
-            halign='left',
-            valign='top',
-            color=(1, 1, 1, 1) if self.is_dark_theme else (0.2, 0.2, 0.2, 1)
-        )
-        scroll.add_widget(log_label)
-        content.add_widget(scroll)
+        # Содержимое меняется при открытии: список с поиском или сообщение
+        self.log_body = BoxLayout(orientation='vertical', spacing=dp(16))
+        content.add_widget(self.log_body)
+        
+        # Список строится только из видимых строк и подгружается с конца журнала
+        self.log_view = JournalView(self.store, load=False)
+        self.theme.bind(self.log_view, 'text_color', 'text')
+        self.log_search = self.build_search_input(self.log_view)
+        self.log_message = Label(font_size='14sp', halign='center')
+        self.theme.bind(self.log_message, 'color', 'text')
         
         close_button = ModernButton(
             text='ЗАКРЫТЬ',
@@ -665,33 +1294,116 @@ class TimerApp(App):
         )
         content.add_widget(close_button)
         
-        popup = Popup(
+        self.log_popup = Popup(
             title='',
             content=content,
             size_hint=(0.9, 0.8),
-            auto_dismiss=False,
-            background_color=(0.15, 0.15, 0.15, 0.9) if self.is_dark_theme else (0.95, 0.95, 0.95, 0.9)
+            auto_dismiss=False
         )
+        self.theme.bind(self.log_popup, 'background_color', 'popup')
+        
+        close_button.bind(on_press=self.log_popup.dismiss)
+    
+    def export_log(self, instance, formats=('csv', 'jsonl')):
+        """Экспорт журнала в CSV и JSON Lines в фоновом потоке"""
+        from exporter import export_journal
+        
+        if not formats:
+            return
+        fmt = formats[0]
+        try:
+            self.log_writer.flush()
+            path = os.path.join(
+                get_platform_services().export_dir(),
+                f"focus_timer_{datetime.now():%Y%m%d_%H%M%S}.{fmt}"
+            )
+        except Exception as e:
+            self.show_status_message(f"❌ Ошибка экспорта: {e}", error=True)
+            return
+        
+        def progress(done, total):
+            percent = done * 100 // total if total else 100
+            Clock.schedule_once(
+                lambda dt: setattr(self.status_label, 'text', f"📤 Экспорт {fmt.upper()}: {percent}%")
+            )
+        
+        def on_done(path, error):
+            def report(dt):
+                if error:
+                    self.show_status_message(f"❌ Ошибка экспорта: {error}", error=True)
+                    return
+                self.show_status_message(f"📤 Журнал сохранён: {os.path.basename(path)}")
+                self.export_log(instance, formats[1:])
+            Clock.schedule_once(report)
+        
+        export_journal(self.store, path, fmt, progress=progress, on_done=on_done)
+    
+    def refresh_search_index(self):
+        """Догоняет индекс поиска в фоновом потоке; второй поток не запускается"""
+        if self.search_thread is not None and self.search_thread.is_alive():
+            return
+        
+        def work():
+            try:
+                self.search_index.ensure_fresh(self.store)
+            except Exception as e:
+                print(f"Ошибка индекса поиска: {e}")
+                return
+            # Запрос, набранный пока индекс строился, выполняется заново
+            Clock.schedule_once(lambda dt: self.search_trigger() if self.log_search.text.strip() else None)
         
-        close_button.bind(on_press=popup.dismiss)
+        self.search_thread = threading.Thread(target=work, daemon=True)
+        self.search_thread.start()
+    
+    def build_search_input(self, log_view):
+        """Поле поиска по достижениям для окна журнала"""
+        search_input = TextInput(
+            multiline=False,
+            font_size='14sp',
+            size_hint_y=None,
+            height=dp(44),
+            hint_text='🔍 Поиск по достижениям...'
+        )
+        self.theme.bind(search_input, 'background_color', 'input')
         
-        def update_text_size(instance, value):
-            log_label.text_size = (value[0] - dp(40), None)
+        def run_search(dt):
+            query = search_input.text.strip()
+            if not query:
+                log_view.reload()
+                return
+            if not self.search_index.is_fresh(self.store):
+                # Индекс не перестраивается в UI-потоке: поиск повторится,
+                # когда фоновый поток его догонит
+                self.refresh_search_index()
+                return
+            ids = self.search_index.search(query)
+            log_view.show_records(self.store.read_ids(ids))
         
-        popup.bind(size=update_text_size)
-        popup.open()
+        # Поиск при наборе, но не чаще одного раза за короткую паузу
+        self.search_trigger = Clock.create_trigger(run_search, 0.15)
+        search_input.bind(text=lambda instance, value: self.search_trigger())
+        return search_input
     
     def clear_log(self, instance):
         """Современное подтверждение очистки"""
+        with self.dialog_profiler.measure('clear_log'):
+            if self.clear_popup is None:
+                self.build_clear_dialog()
+            self.clear_popup.open()
+    
+    def build_clear_dialog(self):
+        """Окно подтверждения очистки строится один раз"""
+        from kivy.uix.popup import Popup
+        
         content = BoxLayout(orientation='vertical', spacing=dp(20), padding=dp(20))
         
         message = Label(
             text='🗑️ ОЧИСТКА ЖУРНАЛА\n\nВы уверены, что хотите удалить все записи достижений?\n\n⚠️ Это действие нельзя отменить.',
             font_size='16sp',
             text_size=(None, None),
-            halign='center',
-            color=(1, 1, 1, 1) if self.is_dark_theme else (0.2, 0.2, 0.2, 1)
+            halign='center'
         )
+        self.theme.bind(message, 'color', 'text')
         content.add_widget(message)
         
         buttons = BoxLayout(orientation='horizontal', spacing=dp(12), size_hint_y=None, height=dp(50))
@@ -703,27 +1415,34 @@ class TimerApp(App):
         buttons.add_widget(no_button)
         content.add_widget(buttons)
         
-        popup = Popup(
+        self.clear_popup = Popup(
             title='',
             content=content,
             size_hint=(0.8, 0.5),
-            auto_dismiss=False,
-            background_color=(0.15, 0.15, 0.15, 0.9) if self.is_dark_theme else (0.95, 0.95, 0.95, 0.9)
+            auto_dismiss=False
         )
+        self.theme.bind(self.clear_popup, 'background_color', 'popup')
         
-        def confirm_clear(instance):
-            try:
-                with open(self.log_file, "w", encoding="utf-8") as f:
-                    f.write("🏆 ЖУРНАЛ ДОСТИЖЕНИЙ И ПРОДУКТИВНОСТИ 🏆\n\n")
-                self.show_status_message("🗑️ Журнал очищен. Готовы к новым достижениям!")
-            except Exception as e:
-                self.show_status_message(f"❌ Ошибка очистки: {e}", error=True)
-            popup.dismiss()
-        
-        yes_button.bind(on_press=confirm_clear)
-        no_button.bind(on_press=popup.dismiss)
-        
-        popup.open()
+        yes_button.bind(on_press=self.confirm_clear)
+        no_button.bind(on_press=self.clear_popup.dismiss)
+    
+    def confirm_clear(self, instance):
+        try:
+            self.log_writer.flush()
+            self.store.clear()
+            self.search_index.clear()
+            self.stats.reset()
+            self.stats.save()
+            if self.sync:
+                self.sync.reset()
+            self.update_stats_card()
+            self.heatmap.set_totals({})
+            self.recent_sessions = []
+            self.update_recent_sessions()
+            self.show_status_message("🗑️ Журнал очищен. Готовы к новым достижениям!")
+        except Exception as e:
+            self.show_status_message(f"❌ Ошибка очистки: {e}", error=True)
+        self.clear_popup.dismiss()
 
 if __name__ == '__main__':
     TimerApp().run()
@@ -0,0 +1,272 @@
+"""Замеры запуска, пробуждений, открытия окон и трасса производительности"""
+import gc
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+# Модуль импортируется первым, поэтому это почти момент старта процесса
+PROCESS_START = time.perf_counter()
+
+
+class StartupProfiler:
+    """Стоимость фаз запуска и время до первого кадра.
+
+    Включается переменной окружения ``FOCUS_TIMER_PROFILE=1``;
+    выключенный профайлер ничего не замеряет.
+    """
+    def __init__(self, enabled=None):
+        if enabled is None:
+            enabled = bool(os.environ.get('FOCUS_TIMER_PROFILE'))
+        self.enabled = enabled
+        self.phases = []
+        self.first_frame = None
+
+    @contextmanager
+    def phase(self, name):
+        """Замеряет фазу запуска"""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - started))
+
+    def mark(self, name):
+        """Отмечает фазу от старта процесса до текущего момента"""
+        if self.enabled:
+            self.phases.append((name, time.perf_counter() - PROCESS_START))
+
+    def mark_first_frame(self):
+        if self.enabled:
+            self.first_frame = time.perf_counter() - PROCESS_START
+
+    def report(self):
+        lines = ["⏱️ Профиль запуска:"]
+        for name, seconds in self.phases:
+            lines.append(f"  {name:<24} {seconds * 1000:8.1f} мс")
+        if self.first_frame is not None:
+            lines.append(f"  {'первый кадр':<24} {self.first_frame * 1000:8.1f} мс")
+        return "\n".join(lines)
+
+    def print_report(self):
+        if self.enabled:
+            print(self.report())
+
+
+class WakeupCounter:
+    """Счётчик пробуждений приложения за фокус-сессию.
+
+    Включается переменной окружения ``FOCUS_TIMER_COUNT_WAKEUPS=1`` и
+    после сессии печатает, сколько раз и по какой причине сработал Clock.
+    """
+    def __init__(self, enabled=None):
+        if enabled is None:
+            enabled = bool(os.environ.get('FOCUS_TIMER_COUNT_WAKEUPS'))
+        self.enabled = enabled
+        self.counts = {}
+        self.started = None
+
+    def start_session(self):
+        self.counts = {}
+        self.started = time.monotonic()
+
+    def count(self, reason):
+        if self.enabled:
+            self.counts[reason] = self.counts.get(reason, 0) + 1
+
+    def report(self):
+        elapsed = time.monotonic() - self.started if self.started else 0.0
+        total = sum(self.counts.values())
+        details = ", ".join(f"{reason}: {n}" for reason, n in self.counts.items())
+        return f"⏰ Пробуждений за {elapsed:.0f} с: {total} ({details})"
+
+    def end_session(self):
+        if self.enabled and self.started is not None:
+            print(self.report())
+        self.started = None
+
+
+class LayoutCounter:
+    """Число перекладок и обновлений canvas на одно действие пользователя.
+
+    Включается переменной окружения ``FOCUS_TIMER_COUNT_LAYOUT=1``.
+    Действие открывает ``begin(name)``; счёт, пришедший без него,
+    относится к безымянному действию. ``on_count`` вызывается при
+    начале действия и после каждого счёта - приложение откладывает по
+    нему печать отчёта, пока интерфейс не успокоится.
+    """
+    def __init__(self, enabled=None, on_count=None):
+        if enabled is None:
+            enabled = bool(os.environ.get('FOCUS_TIMER_COUNT_LAYOUT'))
+        self.enabled = enabled
+        self.on_count = on_count
+        self.action = None
+        self.counts = {}
+
+    def begin(self, action):
+        if self.enabled and self.action is None:
+            self.action = action
+            self.counts = {}
+            # Действие без перекладок тоже получит отчёт
+            if self.on_count:
+                self.on_count()
+
+    def count(self, kind, n=1):
+        if not self.enabled:
+            return
+        if self.action is None:
+            self.begin('действие')
+        self.counts[kind] = self.counts.get(kind, 0) + n
+        if self.on_count:
+            self.on_count()
+
+    def report(self):
+        details = ", ".join(f"{kind}: {n}" for kind, n in self.counts.items()) or "ничего"
+        return f"📐 {self.action}: {details}"
+
+    def end(self):
+        if self.enabled and self.action is not None:
+            print(self.report())
+        self.action = None
+        self.counts = {}
+
+
+def _gc_collections():
+    return sum(generation['collections'] for generation in gc.get_stats())
+
+
+class DialogProfiler:
+    """Задержка открытия окон и аллокации на каждое открытие.
+
+    Включается той же переменной ``FOCUS_TIMER_PROFILE=1``. Для каждого
+    открытия печатает время, прирост выделенных блоков памяти и число
+    сборок мусора, случившихся за это время.
+    """
+    def __init__(self, enabled=None):
+        if enabled is None:
+            enabled = bool(os.environ.get('FOCUS_TIMER_PROFILE'))
+        self.enabled = enabled
+        self.opens = []
+
+    @contextmanager
+    def measure(self, name):
+        """Замеряет одно открытие окна"""
+        if not self.enabled:
+            yield
+            return
+        collections = _gc_collections()
+        blocks = sys.getallocatedblocks()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            record = (
+                name,
+                time.perf_counter() - started,
+                sys.getallocatedblocks() - blocks,
+                _gc_collections() - collections,
+            )
+            self.opens.append(record)
+            print(self.format(record))
+
+    @staticmethod
+    def format(record):
+        name, seconds, blocks, collections = record
+        return f"🪟 {name}: {seconds * 1000:.1f} мс, блоков памяти {blocks:+d}, сборок мусора {collections}"
+
+
+class PerfTracer:
+    """Длительности кадров, колбэков Clock, ввода-вывода и построения виджетов.
+
+    Включается переменной ``FOCUS_TIMER_HUD=1`` или скрытым жестом в
+    приложении. Последние события хранятся в кольцевом буфере и
+    сохраняются в формате Chrome trace, который открывают
+    chrome://tracing и Perfetto. Фазы построения (категория ``build``)
+    пишутся всегда: их немного, и их видно, даже если трассу включили
+    уже после запуска.
+    """
+    def __init__(self, enabled=None, max_events=20000, frame_window=120):
+        if enabled is None:
+            enabled = bool(os.environ.get('FOCUS_TIMER_HUD'))
+        self.enabled = enabled
+        self.events = deque(maxlen=max_events)
+        self.frames = deque(maxlen=frame_window)
+        self.totals = {}
+        self._last_flip = None
+        self._lock = threading.Lock()
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        self._last_flip = None
+
+    @contextmanager
+    def span(self, name, category='app'):
+        """Замеряет участок кода как одно событие трассы"""
+        if not (self.enabled or category == 'build'):
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, category, started, time.perf_counter() - started)
+
+    def record(self, name, category, started, duration):
+        """Добавляет готовый замер (например, задержку между потоками)"""
+        event = {
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': (started - PROCESS_START) * 1e6,
+            'dur': duration * 1e6,
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+        }
+        with self._lock:
+            self.events.append(event)
+            count, total, peak, _ = self.totals.get(name, (0, 0.0, 0.0, 0.0))
+            self.totals[name] = (count + 1, total + duration, max(peak, duration), duration)
+
+    def flip(self):
+        """Отмечает показ кадра; вызывается из Window.on_flip"""
+        now = time.perf_counter()
+        if self._last_flip is not None:
+            duration = now - self._last_flip
+            self.frames.append(duration)
+            self.record('кадр', 'frame', self._last_flip, duration)
+        self._last_flip = now
+
+    def summary(self, names=()):
+        """Короткие строки для оверлея"""
+        lines = []
+        if self.frames:
+            average = sum(self.frames) / len(self.frames)
+            lines.append(
+                f"FPS {1 / average:4.0f}  кадр {average * 1000:5.1f} / {max(self.frames) * 1000:5.1f} мс"
+            )
+        with self._lock:
+            totals = dict(self.totals)
+        for name in names:
+            if name in totals:
+                count, total, peak, last = totals[name]
+                lines.append(
+                    f"{name}: {last * 1000:.2f} мс (ср. {total / count * 1000:.2f}, макс. {peak * 1000:.2f}, n={count})"
+                )
+        return "\n".join(lines)
+
+    def dump(self, path):
+        """Сохраняет трассу для chrome://tracing или Perfetto"""
+        with self._lock:
+            events = list(self.events)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        return path
@@ -0,0 +1,76 @@
+"""Оверлей с замерами производительности поверх окна приложения"""
+from kivy.clock import Clock
+from kivy.core.window import Window
+from kivy.graphics import Color, Rectangle
+from kivy.metrics import dp
+from kivy.uix.label import Label
+
+
+# Замеры, которые показываются в оверлее
+HUD_SPANS = (
+    'update_timer', 'on_deadline', 'write_sessions', 'save_activity', 'view_log',
+    'build_timer_card', 'build_activity_card',
+)
+
+
+class PerfHUD(Label):
+    """Полупрозрачная панель в углу окна, обновляется дважды в секунду.
+
+    Двойное касание панели сохраняет трассу через ``on_dump``.
+    """
+    def __init__(self, tracer, on_dump=None, **kwargs):
+        super().__init__(**kwargs)
+        self.tracer = tracer
+        self.on_dump = on_dump
+        self.font_size = '11sp'
+        self.color = (0.6, 1, 0.6, 1)
+        self.halign = 'left'
+        self.valign = 'top'
+        self.size_hint = (None, None)
+        self.padding = (dp(6), dp(4))
+        self.refresh_event = None
+        with self.canvas.before:
+            Color(0, 0, 0, 0.6)
+            self.background = Rectangle()
+        self.bind(texture_size=self.update_size, pos=self.update_background, size=self.update_background)
+
+    def update_size(self, instance, size):
+        self.size = size
+
+    def update_background(self, *args):
+        self.background.pos = self.pos
+        self.background.size = self.size
+
+    def show(self):
+        if self.parent is None:
+            Window.add_widget(self)
+            Window.bind(on_flip=self.on_flip, size=self.place)
+        self.place()
+        self.refresh()
+        if self.refresh_event is None:
+            self.refresh_event = Clock.schedule_interval(self.refresh, 0.5)
+
+    def hide(self):
+        if self.refresh_event is not None:
+            self.refresh_event.cancel()
+            self.refresh_event = None
+        if self.parent is not None:
+            Window.unbind(on_flip=self.on_flip, size=self.place)
+            Window.remove_widget(self)
+
+    def on_flip(self, *args):
+        self.tracer.flip()
+
+    def place(self, *args):
+        self.pos = (dp(4), Window.height - self.height - dp(4))
+
+    def refresh(self, *args):
+        self.text = self.tracer.summary(HUD_SPANS) or 'HUD: ждём первые кадры...'
+        self.place()
+
+    def on_touch_down(self, touch):
+        if not self.collide_point(*touch.pos):
+            return False
+        if touch.is_double_tap and self.on_dump:
+            self.on_dump()
+        return True
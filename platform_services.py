@@ -0,0 +1,201 @@
+"""Уведомления, звук и вибрация платформы с кэшированием мостов JNI"""
+import math
+import os
+
+from kivy.utils import platform
+
+
+CHANNEL_ID = 'focus_timer'
+URGENT_CHANNEL_ID = 'focus_timer_urgent'
+NOTIFICATION_ID = 1
+URGENT_NOTIFICATION_ID = 2
+ONGOING_NOTIFICATION_ID = 3
+
+# Класс сервиса, который buildozer создаёт из строки services в buildozer.spec
+TIMER_SERVICE_CLASS = 'org.example.focus_timer_2025.ServiceTimer'
+ALARM_ACTION = 'org.example.focus_timer_2025.TIMER_DEADLINE'
+
+
+class DesktopServices:
+    """Заглушка вне Android с тем же интерфейсом"""
+    def notify(self, title, message, urgent=False):
+        pass
+
+    def play_alert(self):
+        pass
+
+    def show_ongoing(self, title, message):
+        pass
+
+    def cancel_ongoing(self):
+        pass
+
+    def start_service(self, argument):
+        pass
+
+    def schedule_alarm(self, deadline):
+        pass
+
+    def cancel_alarm(self):
+        pass
+
+    def listen_alarm(self, callback):
+        pass
+
+    def export_dir(self):
+        return os.getcwd()
+
+    def power_save_mode(self):
+        return False
+
+
+class AndroidServices:
+    """Мосты к Android, которые разрешаются один раз.
+
+    Классы JNI, системные сервисы, каналы уведомлений и рингтон
+    создаются в конструкторе, поэтому конец сессии не платит за
+    autoclass и getSystemService.
+    """
+    def __init__(self):
+        from jnius import autoclass
+
+        self.String = autoclass('java.lang.String')
+        self.NotificationBuilder = autoclass('android.app.Notification$Builder')
+        Context = autoclass('android.content.Context')
+        NotificationManager = autoclass('android.app.NotificationManager')
+        RingtoneManager = autoclass('android.media.RingtoneManager')
+        self.sdk_int = autoclass('android.os.Build$VERSION').SDK_INT
+        self.Environment = autoclass('android.os.Environment')
+
+        # В процессе сервиса активности нет, контекстом служит сам сервис
+        self.context = (autoclass('org.kivy.android.PythonActivity').mActivity
+                        or autoclass('org.kivy.android.PythonService').mService)
+        self.service_class = autoclass(TIMER_SERVICE_CLASS)
+        self.icon = self.context.getApplicationInfo().icon
+        self.notification_manager = self.context.getSystemService(Context.NOTIFICATION_SERVICE)
+        self.vibrator = self.context.getSystemService(Context.VIBRATOR_SERVICE)
+        self.power_manager = self.context.getSystemService(Context.POWER_SERVICE)
+
+        # Будильник дедлайна: широковещательный интент, который ловит сервис
+        Intent = autoclass('android.content.Intent')
+        PendingIntent = autoclass('android.app.PendingIntent')
+        self.AlarmManager = autoclass('android.app.AlarmManager')
+        self.alarm_manager = self.context.getSystemService(Context.ALARM_SERVICE)
+        alarm_intent = Intent(ALARM_ACTION)
+        alarm_intent.setPackage(self.context.getPackageName())
+        self.alarm_intent = PendingIntent.getBroadcast(
+            self.context, 0, alarm_intent,
+            PendingIntent.FLAG_UPDATE_CURRENT | getattr(PendingIntent, 'FLAG_IMMUTABLE', 0)
+        )
+        self.alarm_receiver = None
+
+        notification_uri = RingtoneManager.getDefaultUri(RingtoneManager.TYPE_NOTIFICATION)
+        self.ringtone = RingtoneManager.getRingtone(self.context, notification_uri)
+
+        # Каналы уведомлений обязательны начиная с Android 8
+        if self.sdk_int >= 26:
+            NotificationChannel = autoclass('android.app.NotificationChannel')
+            for channel_id, name, importance in (
+                (CHANNEL_ID, 'Фокус-сессии', NotificationManager.IMPORTANCE_DEFAULT),
+                (URGENT_CHANNEL_ID, 'Завершение сессии', NotificationManager.IMPORTANCE_HIGH),
+            ):
+                self.notification_manager.createNotificationChannel(
+                    NotificationChannel(channel_id, self.String(name), importance)
+                )
+
+    def build_notification(self, title, message, channel_id=CHANNEL_ID):
+        if self.sdk_int >= 26:
+            builder = self.NotificationBuilder(self.context, channel_id)
+        else:
+            builder = self.NotificationBuilder(self.context)
+        builder.setContentTitle(self.String(title))
+        builder.setContentText(self.String(message))
+        builder.setSmallIcon(self.icon)
+        return builder
+
+    def notify(self, title, message, urgent=False):
+        builder = self.build_notification(
+            title, message, URGENT_CHANNEL_ID if urgent else CHANNEL_ID
+        )
+        builder.setAutoCancel(True)
+        self.notification_manager.notify(
+            URGENT_NOTIFICATION_ID if urgent else NOTIFICATION_ID, builder.build()
+        )
+
+    def play_alert(self):
+        if self.ringtone:
+            self.ringtone.play()
+        if self.vibrator and self.vibrator.hasVibrator():
+            self.vibrator.vibrate(1000)
+
+    def show_ongoing(self, title, message):
+        """Постоянное уведомление активной сессии без звука при обновлении"""
+        builder = self.build_notification(title, message)
+        builder.setOngoing(True)
+        builder.setOnlyAlertOnce(True)
+        self.notification_manager.notify(ONGOING_NOTIFICATION_ID, builder.build())
+
+    def cancel_ongoing(self):
+        self.notification_manager.cancel(ONGOING_NOTIFICATION_ID)
+
+    def start_service(self, argument):
+        self.service_class.start(self.context, argument)
+
+    def schedule_alarm(self, deadline):
+        """Будит устройство к дедлайну на часах CLOCK_BOOTTIME.
+
+        CLOCK_BOOTTIME совпадает с SystemClock.elapsedRealtime(), поэтому
+        дедлайн таймера передаётся в ELAPSED_REALTIME_WAKEUP без пересчёта.
+        """
+        trigger_ms = math.ceil(deadline * 1000)
+        alarm_type = self.AlarmManager.ELAPSED_REALTIME_WAKEUP
+        try:
+            if self.sdk_int >= 23:
+                self.alarm_manager.setExactAndAllowWhileIdle(alarm_type, trigger_ms, self.alarm_intent)
+            else:
+                self.alarm_manager.setExact(alarm_type, trigger_ms, self.alarm_intent)
+        except Exception as e:
+            # Без разрешения на точные будильники остаётся неточный
+            print(f"Точный будильник недоступен: {e}")
+            self.alarm_manager.set(alarm_type, trigger_ms, self.alarm_intent)
+
+    def cancel_alarm(self):
+        self.alarm_manager.cancel(self.alarm_intent)
+
+    def listen_alarm(self, callback):
+        """Вызывает callback() при срабатывании будильника дедлайна"""
+        from android.broadcast import BroadcastReceiver
+        self.alarm_receiver = BroadcastReceiver(
+            lambda context, intent: callback(), actions=[ALARM_ACTION]
+        )
+        self.alarm_receiver.start()
+
+    def export_dir(self):
+        """Общая папка «Документы», доступная пользователю"""
+        path = self.Environment.getExternalStoragePublicDirectory(
+            self.Environment.DIRECTORY_DOCUMENTS
+        ).getAbsolutePath()
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def power_save_mode(self):
+        """Включён ли системный режим энергосбережения"""
+        return bool(self.power_manager.isPowerSaveMode())
+
+
+_services = None
+
+
+def get_platform_services():
+    """Общий экземпляр сервисов, создаётся при первом обращении"""
+    global _services
+    if _services is None:
+        if platform == 'android':
+            try:
+                _services = AndroidServices()
+            except Exception as e:
+                print(f"Ошибка инициализации Android: {e}")
+                _services = DesktopServices()
+        else:
+            _services = DesktopServices()
+    return _services
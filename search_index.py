@@ -0,0 +1,159 @@
+"""Полнотекстовый поиск по достижениям журнала"""
+import bisect
+import os
+import re
+import threading
+
+from durable import drop_partial_tail
+
+
+TOKEN_RE = re.compile(r'\w+')
+
+
+def tokenize(text):
+    """Слова текста без регистра; «ё» приравнивается к «е»"""
+    return [token.casefold().replace('ё', 'е') for token in TOKEN_RE.findall(text)]
+
+
+class SearchIndex:
+    """Инвертированный индекс: слово → номера записей журнала.
+
+    На диске индекс хранится как файл только на дозапись со строками
+    ``номер<TAB>слова``, поэтому сохранение сессии дописывает одну строку,
+    а не перезаписывает весь индекс. В память он загружается при первом
+    поиске и при необходимости догоняет или перестраивается по журналу.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.postings = None
+        # Записи 0..indexed-1 проиндексированы все; pending - проиндексированные
+        # номера за первой дырой (например, новые сессии при недостроенном индексе)
+        self.indexed = 0
+        self.pending = set()
+        self._terms = None
+        self._lock = threading.Lock()
+        # Оборванная строка склеилась бы со следующей дозаписью
+        drop_partial_tail(path)
+
+    def add_records(self, first_id, records):
+        """Индексирует новые записи (вызывается после записи в журнал)"""
+        with self._lock:
+            self._index_records(first_id, records)
+
+    def _index_records(self, first_id, records):
+        lines = []
+        for record_id, record in enumerate(records, first_id):
+            if self._has(record_id):
+                continue
+            tokens = sorted(set(tokenize(record.activity)))
+            lines.append(f"{record_id}\t{' '.join(tokens)}\n")
+            if self.postings is not None:
+                self._add(record_id, tokens)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.writelines(lines)
+
+    def _has(self, record_id):
+        return record_id < self.indexed or record_id in self.pending
+
+    def _add(self, record_id, tokens):
+        if self._has(record_id):
+            return
+        for token in tokens:
+            ids = self.postings.get(token)
+            if ids is None:
+                self.postings[token] = [record_id]
+                self._terms = None
+            else:
+                ids.append(record_id)
+        # Граница сплошной части двигается только по реально добавленным номерам
+        if record_id == self.indexed:
+            self.indexed += 1
+            while self.indexed in self.pending:
+                self.pending.remove(self.indexed)
+                self.indexed += 1
+        else:
+            self.pending.add(record_id)
+
+    def _reset(self):
+        self.postings = {}
+        self.indexed = 0
+        self.pending = set()
+        self._terms = None
+
+    def _load(self):
+        self._reset()
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.endswith('\n'):
+                    break
+                record_id, _, tokens = line.rstrip('\n').partition('\t')
+                self._add(int(record_id), tokens.split())
+
+    def is_fresh(self, store):
+        """Индекс загружен и покрывает весь журнал; ничего не читает с диска"""
+        with self._lock:
+            return self.postings is not None and not self.pending and self.indexed == store.count()
+
+    def ensure_fresh(self, store, chunk_size=2000):
+        """Загружает индекс и доиндексирует недостающие записи журнала.
+
+        Работает порциями, каждая целиком под блокировкой: второй поток,
+        вызвавший ensure_fresh одновременно, продолжает с того места, где
+        остановился первый, а не индексирует те же записи заново.
+        """
+        while True:
+            with self._lock:
+                if self.postings is None:
+                    self._load()
+                count = store.count()
+                if self.indexed > count or (self.pending and max(self.pending) >= count):
+                    # Журнал очищали: индекс строится заново
+                    with open(self.path, 'w', encoding='utf-8'):
+                        pass
+                    self._reset()
+                if self.indexed >= count:
+                    return
+                start = self.indexed
+                self._index_records(start, store.read_range(start, min(count, start + chunk_size)))
+
+    def clear(self):
+        with self._lock:
+            with open(self.path, 'w', encoding='utf-8'):
+                pass
+            self.postings = None
+            self.indexed = 0
+            self.pending = set()
+            self._terms = None
+
+    def _prefix_ids(self, prefix):
+        if self._terms is None:
+            self._terms = sorted(self.postings)
+        ids = set()
+        i = bisect.bisect_left(self._terms, prefix)
+        while i < len(self._terms) and self._terms[i].startswith(prefix):
+            ids.update(self.postings[self._terms[i]])
+            i += 1
+        return ids
+
+    def search(self, query, limit=200):
+        """Номера записей от новых к старым, где есть все слова запроса.
+
+        Последнее слово ищется по префиксу, чтобы поиск работал при наборе.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        with self._lock:
+            if self.postings is None:
+                return []
+            result = None
+            for token in tokens[:-1]:
+                ids = set(self.postings.get(token, ()))
+                result = ids if result is None else result & ids
+                if not result:
+                    return []
+            ids = self._prefix_ids(tokens[-1])
+            result = ids if result is None else result & ids
+        return sorted(result, reverse=True)[:limit]
@@ -0,0 +1,23 @@
+"""Точка входа фонового сервиса таймера (python-for-android)"""
+import json
+import os
+
+from platform_services import get_platform_services
+from timer_service import TimerServiceCore, TimerServiceServer
+
+
+if __name__ == '__main__':
+    services = get_platform_services()
+    core = TimerServiceCore(services)
+    server = TimerServiceServer(core)
+    try:
+        services.listen_alarm(server.wake)
+    except Exception as e:
+        print(f"Будильник дедлайна недоступен: {e}")
+
+    # Первую команду UI передаёт аргументом запуска сервиса
+    argument = os.environ.get('PYTHON_SERVICE_ARGUMENT')
+    if argument:
+        core.handle(json.loads(argument))
+
+    server.serve_forever()
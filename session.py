@@ -0,0 +1,139 @@
+"""Фокус-сессия без виджетов: состояние, отсчёт и цвета дисплея"""
+from datetime import datetime
+
+from session_store import SessionRecord
+from timer_core import CountdownTimer, boot_id, monotonic_clock
+
+
+IDLE = 'idle'
+RUNNING = 'running'
+STOPPED = 'stopped'
+FINISHED = 'finished'
+
+COLOR_NORMAL = (0.3, 0.7, 1, 1)    # Синий
+COLOR_WARNING = (1, 0.6, 0.2, 1)   # Оранжевый
+COLOR_CRITICAL = (1, 0.3, 0.3, 1)  # Красный
+COLOR_SUCCESS = (0.2, 0.8, 0.4, 1)  # Зеленый - успех
+
+WARNING_SECONDS = 300
+CRITICAL_SECONDS = 60
+# Насколько монотонные и настенные часы могут разойтись без перезагрузки
+# (подводка времени по сети)
+REBOOT_TOLERANCE = 30.0
+
+
+def format_time(seconds):
+    return f"{seconds // 60:02d}:{seconds % 60:02d}"
+
+
+def color_for_remaining(seconds):
+    """Цвет дисплея по оставшемуся времени"""
+    if seconds <= CRITICAL_SECONDS:
+        return COLOR_CRITICAL
+    if seconds <= WARNING_SECONDS:
+        return COLOR_WARNING
+    return COLOR_NORMAL
+
+
+class FocusSession:
+    """Состояние фокус-сессии, к которому привязывается интерфейс.
+
+    Не создаёт виджетов и не трогает Clock: приложение спрашивает
+    tick() и отображает результат, поэтому сессию можно гонять в тестах
+    и бенчмарках с подставными часами.
+    """
+    def __init__(self, clock=monotonic_clock, now=datetime.now, boot=boot_id):
+        self.timer = CountdownTimer(clock)
+        self.now = now
+        self.boot = boot
+        self.state = IDLE
+        self.minutes = 0
+        self.start_time = None
+
+    @property
+    def running(self):
+        return self.state == RUNNING
+
+    @property
+    def finished(self):
+        """Дедлайн идущей сессии уже наступил"""
+        return self.running and self.timer.finished
+
+    def start(self, minutes):
+        """Начинает сессию; ValueError, если минут не больше нуля"""
+        if minutes <= 0:
+            raise ValueError(minutes)
+        self.minutes = minutes
+        self.timer.start(minutes * 60)
+        self.start_time = self.now()
+        self.state = RUNNING
+
+    def stop(self):
+        self.timer.pause()
+        self.state = STOPPED
+
+    def reset(self):
+        self.timer.reset()
+        self.state = IDLE
+
+    def finish(self):
+        self.timer.reset()
+        self.state = FINISHED
+
+    def tick(self):
+        """(текст, цвет) для дисплея или None, если видимая секунда не сменилась"""
+        time_left = self.timer.poll()
+        if time_left is None:
+            return None
+        return format_time(time_left), color_for_remaining(time_left)
+
+    def snapshot(self):
+        """Компактное состояние для восстановления после гибели процесса.
+
+        Остаток запоминается вместе с показаниями монотонных и настенных
+        часов и идентификатором загрузки ОС: монотонные часы переживают
+        смерть процесса, настенные - перезагрузку устройства.
+        """
+        return {
+            'state': self.state,
+            'minutes': self.minutes,
+            'start_time': self.start_time.isoformat() if self.start_time else None,
+            'remaining': self.timer.remaining(),
+            'clock': self.timer.clock(),
+            'wall': self.now().timestamp(),
+            'boot': self.boot(),
+        }
+
+    def restore(self, data):
+        """Восстанавливает состояние из snapshot(); идущий отсчёт продолжается"""
+        self.state = data['state']
+        self.minutes = data['minutes']
+        self.start_time = datetime.fromisoformat(data['start_time']) if data['start_time'] else None
+        if self.state != RUNNING:
+            self.timer.reset()
+            return
+
+        elapsed = self.timer.clock() - data['clock']
+        wall_elapsed = self.now().timestamp() - data['wall']
+        if self.rebooted(data.get('boot'), elapsed, wall_elapsed):
+            # Монотонные часы начались заново, и их разность ничего не значит
+            elapsed = wall_elapsed
+        self.timer.start(self.minutes * 60)
+        self.timer.set_remaining(max(0.0, data['remaining'] - max(0.0, elapsed)))
+
+    def rebooted(self, saved_boot, elapsed, wall_elapsed):
+        """Перезагружалось ли устройство с момента снимка.
+
+        Надёжнее всего сравнить идентификаторы загрузки. Без них
+        перезагрузку выдаёт расхождение часов: монотонные после неё
+        считают от нуля и отстают от настенных хотя бы на время работы
+        до снимка, а без перезагрузки обе разности совпадают.
+        """
+        current_boot = self.boot()
+        if saved_boot and current_boot:
+            return saved_boot != current_boot
+        return elapsed < 0 or wall_elapsed - elapsed > REBOOT_TOLERANCE
+
+    def make_record(self, activity):
+        """Запись журнала о завершённой сессии"""
+        return SessionRecord(self.start_time, self.now(), self.minutes, activity)
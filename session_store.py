@@ -0,0 +1,493 @@
+"""Журнал сессий: записи фиксированной схемы и индекс смещений"""
+import gzip
+import json
+import os
+import re
+import struct
+import threading
+from collections import namedtuple
+from datetime import datetime, time as dt_time
+
+from durable import atomic_write, atomic_write_json, frame, unframe, write_all
+
+
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+SEPARATOR = '=' * 50
+
+# Запись индекса: смещение строки в журнале и начало сессии (unix-время)
+INDEX_ENTRY = struct.Struct('<Qq')
+
+# Порог, после которого активный файл уходит в сжатый архив
+ACTIVE_MAX_BYTES = 256 * 1024
+
+SessionRecord = namedtuple('SessionRecord', ['start', 'end', 'duration', 'activity'])
+
+
+def encode_record(record):
+    """Строка журнала с контрольной суммой"""
+    return frame(json.dumps({
+        'start': f"{record.start:{TIME_FORMAT}}",
+        'end': f"{record.end:{TIME_FORMAT}}",
+        'duration': record.duration,
+        'activity': record.activity,
+    }, ensure_ascii=False).encode('utf-8'))
+
+
+def decode_record(line):
+    """Запись из строки журнала; ValueError, если строка повреждена"""
+    payload = unframe(line)
+    if payload is None:
+        raise ValueError(f"Повреждённая запись журнала: {line[:40]!r}")
+    data = json.loads(payload)
+    # fromisoformat в разы быстрее strptime и понимает TIME_FORMAT
+    return SessionRecord(
+        datetime.fromisoformat(data['start']),
+        datetime.fromisoformat(data['end']),
+        int(data['duration']),
+        data['activity'],
+    )
+
+
+def try_decode_record(line):
+    """Запись или None, если строка оборвана или не разбирается"""
+    try:
+        return decode_record(line)
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+class SessionStore:
+    """Журнал сессий только на дозапись с индексом смещений.
+
+    Каждая строка файла - одна запись JSON с полями start, end, duration
+    и activity. Рядом лежит файл ``.idx`` с записями фиксированной длины,
+    поэтому число сессий, последние N записей и выборка за дату не
+    требуют чтения всего журнала.
+
+    Активный файл держится маленьким: при смене месяца или превышении
+    max_active_bytes он сжимается в архивный сегмент ``.jsonl.gz`` со
+    своим индексом, а список сегментов хранится в ``.segments.json``.
+    Номера записей сквозные, чтение идёт через все сегменты прозрачно.
+
+    Журнал читают поток записи, синхронизация, поиск и UI. Ротация
+    переименовывает файлы и сдвигает счётчик архивных записей, поэтому
+    запись и чтение номеров идут под общей блокировкой: никто не увидит
+    журнал посреди ротации с «пропавшими» записями.
+    """
+    def __init__(self, path, max_active_bytes=ACTIVE_MAX_BYTES):
+        self.path = path
+        self.index_path = path + '.idx'
+        self.max_active_bytes = max_active_bytes
+        self.base = path[:-len('.jsonl')] if path.endswith('.jsonl') else path
+        self.manifest_path = self.base + '.segments.json'
+        self.rotating_path = self.base + '.rotating.jsonl'
+        # (имя файла, распакованные данные) - одним кортежем, чтобы
+        # поток не получил данные одного архива под именем другого
+        self._archive_cache = None
+        self._lock = threading.RLock()
+        self._load_manifest()
+        if os.path.exists(self.rotating_path):
+            # Прошлая ротация прервалась: доводим её до конца
+            self._finish_rotation()
+        self._sync_index()
+
+    def _entry(self, f, i):
+        f.seek(i * INDEX_ENTRY.size)
+        return INDEX_ENTRY.unpack(f.read(INDEX_ENTRY.size))
+
+    def _archive_path(self, archive):
+        return os.path.join(os.path.dirname(self.path), archive['file'])
+
+    def _load_manifest(self):
+        self.archives = []
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                self.archives = json.load(f)['archives']
+        self._archived = sum(archive['count'] for archive in self.archives)
+
+    def _save_manifest(self):
+        atomic_write_json(self.manifest_path, {'archives': self.archives})
+
+    def _sync_index(self):
+        """Восстановление при открытии: сверяет индекс с данными.
+
+        Дописывает в индекс недостающие записи и отрезает оборванный или
+        повреждённый хвост журнала, оставшийся после убитого процесса.
+        Активный файл мал благодаря ротации, поэтому проверка дешёвая.
+        """
+        if not os.path.exists(self.path):
+            open(self.path, 'wb').close()
+        data_size = os.path.getsize(self.path)
+        count = self._active_count()
+        offset = 0
+
+        with open(self.index_path, 'ab+') as index, open(self.path, 'rb+') as f:
+            # Обрезаем недописанную запись индекса
+            index.truncate(count * INDEX_ENTRY.size)
+            if count:
+                last_offset, _ = self._entry(index, count - 1)
+                f.seek(last_offset)
+                if last_offset < data_size and try_decode_record(f.readline()) is not None:
+                    offset = f.tell()
+                else:
+                    # Индекс ушёл на диск раньше данных: строим его заново
+                    index.truncate(0)
+
+            index.seek(0, os.SEEK_END)
+            f.seek(offset)
+            for line in f:
+                record = try_decode_record(line)
+                if record is None:
+                    break
+                index.write(INDEX_ENTRY.pack(offset, int(record.start.timestamp())))
+                offset += len(line)
+
+            if offset < data_size:
+                print(f"Журнал: отброшен повреждённый хвост ({data_size - offset} байт)")
+                f.truncate(offset)
+
+    def _active_count(self):
+        if not os.path.exists(self.index_path):
+            return 0
+        return os.path.getsize(self.index_path) // INDEX_ENTRY.size
+
+    def count(self):
+        """Количество записей во всех сегментах"""
+        with self._lock:
+            return self._archived + self._active_count()
+
+    def append(self, record):
+        """Дописывает запись и возвращает её номер"""
+        return self.append_many([record])
+
+    def append_many(self, records, sync=False):
+        """Дописывает несколько записей одной операцией.
+
+        Данные сбрасываются раньше индекса, поэтому читатель из другого
+        потока никогда не увидит в индексе ещё не записанную строку.
+        Если запись оборвалась ошибкой, оба файла обрезаются до прежней
+        длины: иначе следующая запись склеилась бы с оборванной строкой.
+        """
+        lines = [encode_record(record) for record in records]
+        with self._lock:
+            if records:
+                self._rotate_if_needed(records[0].start)
+
+            # Без буфера: после ошибки в нём не останется байт, которые
+            # допишутся при закрытии файла уже после отката
+            with open(self.path, 'ab', buffering=0) as f, open(self.index_path, 'ab', buffering=0) as index:
+                data_start = offset = f.tell()
+                index_start = index.tell()
+                entries = []
+                for record, line in zip(records, lines):
+                    entries.append(INDEX_ENTRY.pack(offset, int(record.start.timestamp())))
+                    offset += len(line)
+                try:
+                    write_all(f, b''.join(lines))
+                    if sync:
+                        os.fsync(f.fileno())
+                    write_all(index, b''.join(entries))
+                    if sync:
+                        os.fsync(index.fileno())
+                except BaseException:
+                    index.truncate(index_start)
+                    f.truncate(data_start)
+                    raise
+            return self.count() - 1
+
+    def _rotate_if_needed(self, start):
+        """Архивирует активный файл при смене месяца или по размеру"""
+        if not self._active_count():
+            return
+        with open(self.index_path, 'rb') as index:
+            first = datetime.fromtimestamp(self._entry(index, 0)[1])
+        same_month = (first.year, first.month) == (start.year, start.month)
+        if same_month and os.path.getsize(self.path) < self.max_active_bytes:
+            return
+        self.rotate()
+
+    def rotate(self):
+        """Сжимает активный файл в архивный сегмент"""
+        # Переименование атомарно: после него запись идёт в новый активный файл
+        with self._lock:
+            os.replace(self.path, self.rotating_path)
+            os.remove(self.index_path)
+            self._finish_rotation()
+
+    def _finish_rotation(self):
+        with open(self.rotating_path, 'rb') as f:
+            data = f.read()
+
+        entries = []
+        offset = 0
+        for line in data.splitlines(keepends=True):
+            record = try_decode_record(line)
+            if record is None:
+                break
+            entries.append((offset, int(record.start.timestamp())))
+            offset += len(line)
+        data = data[:offset]
+
+        last = self.archives[-1] if self.archives else None
+        already_archived = (
+            last is not None and entries
+            and last['first'] == entries[0][1] and last['count'] == len(entries)
+        )
+        if entries and not already_archived:
+            month = datetime.fromtimestamp(entries[0][1])
+            archive = {
+                'file': f"{os.path.basename(self.base)}-{month:%Y%m}-{len(self.archives):04d}.jsonl.gz",
+                'count': len(entries),
+                'first': entries[0][1],
+                'last': entries[-1][1],
+            }
+            archive_path = self._archive_path(archive)
+            atomic_write(archive_path, gzip.compress(data))
+            atomic_write(archive_path + '.idx', b''.join(INDEX_ENTRY.pack(*entry) for entry in entries))
+
+            self.archives.append(archive)
+            self._save_manifest()
+            self._archived += archive['count']
+
+        os.remove(self.rotating_path)
+
+    def _archive_data(self, archive):
+        """Распакованный архивный сегмент; последний держится в памяти"""
+        cache = self._archive_cache
+        if cache is None or cache[0] != archive['file']:
+            with gzip.open(self._archive_path(archive), 'rb') as f:
+                cache = self._archive_cache = (archive['file'], f.read())
+        return cache[1]
+
+    def _read_archive(self, archive, start, stop):
+        data = self._archive_data(archive)
+        with open(self._archive_path(archive) + '.idx', 'rb') as index:
+            offset, _ = self._entry(index, start)
+        records = []
+        for _ in range(stop - start):
+            end = data.index(b'\n', offset) + 1
+            records.append(decode_record(data[offset:end]))
+            offset = end
+        return records
+
+    def _read_active(self, start, stop):
+        with open(self.index_path, 'rb') as index:
+            offset, _ = self._entry(index, start)
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            return [decode_record(f.readline()) for _ in range(stop - start)]
+
+    def read_range(self, start, stop):
+        """Записи с номерами [start, stop) в порядке записи"""
+        with self._lock:
+            start = max(0, start)
+            stop = min(stop, self.count())
+            records = []
+            position = 0
+            for archive in self.archives:
+                lo = max(start, position)
+                hi = min(stop, position + archive['count'])
+                if lo < hi:
+                    records.extend(self._read_archive(archive, lo - position, hi - position))
+                position += archive['count']
+            if max(start, position) < stop:
+                records.extend(self._read_active(max(start, position) - position, stop - position))
+            return records
+
+    def read_ids(self, ids):
+        """Записи с указанными номерами в том же порядке"""
+        count = self.count()
+        records = []
+        for i in ids:
+            if 0 <= i < count:
+                records.extend(self.read_range(i, i + 1))
+        return records
+
+    def last(self, n):
+        """Последние n записей в порядке записи"""
+        with self._lock:
+            count = self.count()
+            return self.read_range(count - n, count)
+
+    def tail(self, n, block_size=4096):
+        """Последние n записей, прочитанные с конца активного файла.
+
+        Файл читается блоками от конца к началу до n целых строк, поэтому
+        стоимость зависит только от n, а не от размера журнала, и индекс
+        не нужен. Недописанная строка, которую как раз дописывает другой
+        поток, пропускается. Если в активном файле записей меньше n,
+        недостающие берутся из архивов.
+        """
+        if n <= 0:
+            return []
+        with self._lock:
+            lines = []
+            with open(self.path, 'rb') as f:
+                end = f.seek(0, os.SEEK_END)
+                rest = b''
+                tail_skipped = False
+                while end > 0 and len(lines) < n:
+                    start = max(0, end - block_size)
+                    f.seek(start)
+                    parts = (f.read(end - start) + rest).split(b'\n')
+                    end = start
+                    rest = b''
+                    if not tail_skipped:
+                        if len(parts) == 1:
+                            # Недописанная запись длиннее блока: отбрасываем и её начало
+                            continue
+                        # После последнего перевода строки - недописанная запись
+                        parts.pop()
+                        tail_skipped = True
+                    if end > 0:
+                        # Первая часть - конец строки, начало которой в следующем блоке
+                        rest = parts.pop(0)
+                    for part in reversed(parts):
+                        if part:
+                            lines.append(part + b'\n')
+
+            records = []
+            for line in lines:
+                record = try_decode_record(line)
+                if record is not None:
+                    records.append(record)
+                if len(records) == n:
+                    break
+            records.reverse()
+
+            missing = n - len(records)
+            if missing > 0 and self._archived:
+                records[:0] = self.read_range(self._archived - missing, self._archived)
+            return records
+
+    def _bisect_index(self, index_path, count, timestamp):
+        lo, hi = 0, count
+        with open(index_path, 'rb') as index:
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if self._entry(index, mid)[1] < timestamp:
+                    lo = mid + 1
+                else:
+                    hi = mid
+        return lo
+
+    def _bisect(self, timestamp):
+        """Номер первой записи, начавшейся не раньше timestamp"""
+        position = 0
+        for archive in self.archives:
+            if timestamp <= archive['last']:
+                index_path = self._archive_path(archive) + '.idx'
+                return position + self._bisect_index(index_path, archive['count'], timestamp)
+            position += archive['count']
+        active = self._active_count()
+        if not active:
+            return position
+        return position + self._bisect_index(self.index_path, active, timestamp)
+
+    def on_date(self, day):
+        """Сессии, начавшиеся в указанный день"""
+        day_start = datetime.combine(day, dt_time.min)
+        with self._lock:
+            start = self._bisect(int(day_start.timestamp()))
+            stop = self._bisect(int(day_start.timestamp()) + 24 * 60 * 60)
+            return self.read_range(start, stop)
+
+    def iter_records(self):
+        """Потоково перебирает все записи всех сегментов.
+
+        Список архивов и активный файл берутся под блокировкой одним
+        снимком, а чтение идёт без неё: открытый файл дочитывается, даже
+        если ротация его тем временем переименует.
+        """
+        with self._lock:
+            archives = list(self.archives)
+            active = open(self.path, 'rb') if os.path.exists(self.path) else None
+        try:
+            for archive in archives:
+                with gzip.open(self._archive_path(archive), 'rb') as f:
+                    for line in f:
+                        yield decode_record(line)
+            if active is None:
+                return
+            for line in active:
+                if line.endswith(b'\n'):
+                    yield decode_record(line)
+        finally:
+            if active is not None:
+                active.close()
+
+    def clear(self):
+        """Удаляет все записи, включая архивы"""
+        # Сначала атомарно забываем архивы: прерванная очистка оставит
+        # лишь ненужные файлы, но не манифест со ссылками на удалённые
+        with self._lock:
+            archives = self.archives
+            atomic_write_json(self.manifest_path, {'archives': []})
+            for archive in archives:
+                for path in (self._archive_path(archive), self._archive_path(archive) + '.idx'):
+                    if os.path.exists(path):
+                        os.remove(path)
+            self.archives = []
+            self._archived = 0
+            self._archive_cache = None
+            for path in (self.path, self.index_path):
+                with open(path, 'wb'):
+                    pass
+
+
+_DATES_RE = re.compile(r'📅 (\S+ \S+) → (\S+ \S+)')
+_DURATION_RE = re.compile(r'⏱️ Фокус-время: (\d+) минут')
+_ACTIVITY_PREFIX = '🎯 Достижение: '
+
+
+def parse_text_log(lines):
+    """Потоково разбирает блоки старого текстового журнала"""
+    start = end = duration = None
+    activity = None
+    for line in lines:
+        line = line.rstrip('\n')
+        if line == SEPARATOR:
+            if start is not None and duration is not None and activity is not None:
+                yield SessionRecord(start, end, duration, '\n'.join(activity))
+            start = end = duration = None
+            activity = None
+            continue
+
+        if activity is not None:
+            # Многострочное описание продолжается до разделителя
+            activity.append(line)
+            continue
+
+        match = _DATES_RE.match(line)
+        if match:
+            start = datetime.strptime(match.group(1), TIME_FORMAT)
+            end = datetime.strptime(match.group(2), TIME_FORMAT)
+            continue
+
+        match = _DURATION_RE.match(line)
+        if match:
+            duration = int(match.group(1))
+            continue
+
+        if line.startswith(_ACTIVITY_PREFIX):
+            activity = [line[len(_ACTIVITY_PREFIX):]]
+
+
+def import_text_log(text_path, store):
+    """Однократно переносит старый activity_log.txt в журнал сессий"""
+    with open(text_path, 'r', encoding='utf-8') as f:
+        batch = []
+        imported = 0
+        for record in parse_text_log(f):
+            batch.append(record)
+            if len(batch) >= 1000:
+                store.append_many(batch)
+                imported += len(batch)
+                batch = []
+        if batch:
+            store.append_many(batch)
+            imported += len(batch)
+
+    # Старый файл больше не читается, но сохраняется как резервная копия
+    os.replace(text_path, text_path + '.bak')
+    return imported
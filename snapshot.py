@@ -0,0 +1,34 @@
+"""Снимок незавершённой сессии для восстановления после гибели процесса"""
+import json
+import os
+
+from durable import atomic_write_json
+
+
+class SessionSnapshot:
+    """Небольшой JSON-файл с состоянием сессии и введённым текстом.
+
+    Пишется при уходе приложения в фон и с задержкой во время набора
+    текста, читается в build(). Запись атомарна, но без fsync: снимок
+    должен пережить убийство процесса системой, а не отключение питания,
+    и не должен ждать диска.
+    """
+    def __init__(self, path):
+        self.path = path
+
+    def save(self, session, **fields):
+        """Сохраняет session.snapshot() и дополнительные поля интерфейса"""
+        data = session.snapshot()
+        data.update(fields)
+        atomic_write_json(self.path, data, sync=False)
+
+    def load(self):
+        """Сохранённый снимок или None"""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ошибка чтения снимка сессии: {e}")
+            return None
@@ -0,0 +1,124 @@
+"""Инкрементальная статистика фокус-сессий"""
+import json
+import os
+from datetime import date, timedelta
+
+from durable import atomic_write_json
+
+
+def week_key(day):
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+class SessionStats:
+    """Сводка по сессиям, обновляемая при каждом сохранении.
+
+    Хранит минуты по дням и неделям, серии дней подряд и число сессий
+    в небольшом JSON-файле, поэтому карточка статистики строится без
+    чтения журнала.
+    """
+    def __init__(self, path=None):
+        self.path = path
+        self.reset()
+        if path:
+            self.load()
+
+    def reset(self):
+        self.daily = {}
+        self.weekly = {}
+        self.session_count = 0
+        self.total_minutes = 0
+        self.current_streak = 0
+        self.longest_streak = 0
+        self.last_day = None
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.daily = data['daily']
+            self.weekly = data['weekly']
+            self.session_count = data['session_count']
+            self.total_minutes = data['total_minutes']
+            self.current_streak = data['current_streak']
+            self.longest_streak = data['longest_streak']
+            self.last_day = date.fromisoformat(data['last_day']) if data['last_day'] else None
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Ошибка чтения статистики: {e}")
+            self.reset()
+
+    def to_dict(self):
+        return {
+            'daily': self.daily,
+            'weekly': self.weekly,
+            'session_count': self.session_count,
+            'total_minutes': self.total_minutes,
+            'current_streak': self.current_streak,
+            'longest_streak': self.longest_streak,
+            'last_day': self.last_day.isoformat() if self.last_day else None,
+        }
+
+    def save(self):
+        atomic_write_json(self.path, self.to_dict())
+
+    def add(self, record):
+        """Учитывает одну сохранённую сессию"""
+        day = record.start.date()
+        day_key = day.isoformat()
+        is_new_day = day_key not in self.daily
+
+        self.daily[day_key] = self.daily.get(day_key, 0) + record.duration
+        week = week_key(day)
+        self.weekly[week] = self.weekly.get(week, 0) + record.duration
+        self.session_count += 1
+        self.total_minutes += record.duration
+
+        if not is_new_day:
+            return
+        if self.last_day is None or day == self.last_day + timedelta(days=1):
+            self.current_streak += 1
+            self.last_day = day
+        elif day > self.last_day:
+            self.current_streak = 1
+            self.last_day = day
+        else:
+            # Сессия задним числом: серии пересчитываются по дням
+            self.recompute_streaks()
+        self.longest_streak = max(self.longest_streak, self.current_streak)
+
+    def recompute_streaks(self):
+        """Пересчитывает серии по списку дней, без чтения журнала"""
+        self.current_streak = 0
+        self.longest_streak = 0
+        self.last_day = None
+        for day in sorted(date.fromisoformat(key) for key in self.daily):
+            if self.last_day is not None and day == self.last_day + timedelta(days=1):
+                self.current_streak += 1
+            else:
+                self.current_streak = 1
+            self.last_day = day
+            self.longest_streak = max(self.longest_streak, self.current_streak)
+
+    def summary(self, today=None):
+        """Данные для карточки статистики"""
+        today = today or date.today()
+        streak = self.current_streak
+        if self.last_day is None or self.last_day < today - timedelta(days=1):
+            streak = 0
+        return {
+            'today': self.daily.get(today.isoformat(), 0),
+            'week': self.weekly.get(week_key(today), 0),
+            'streak': streak,
+            'longest_streak': self.longest_streak,
+            'session_count': self.session_count,
+            'total_minutes': self.total_minutes,
+        }
+
+    def rebuild(self, records):
+        """Полностью пересчитывает сводку по записям журнала"""
+        self.reset()
+        for record in records:
+            self.add(record)
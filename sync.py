@@ -0,0 +1,172 @@
+"""Фоновая дозагрузка журнала на сервер: отправляются только новые записи"""
+import gzip
+import json
+import os
+import random
+import threading
+
+from durable import atomic_write_json
+from session_store import TIME_FORMAT
+
+
+BATCH_SIZE = 500
+REQUEST_TIMEOUT = 15.0
+BACKOFF_BASE = 2.0
+BACKOFF_MAX = 300.0
+
+
+def encode_batch(records):
+    """Пакет записей в JSON Lines, сжатый gzip"""
+    lines = [
+        json.dumps({
+            'start': f"{record.start:{TIME_FORMAT}}",
+            'end': f"{record.end:{TIME_FORMAT}}",
+            'duration': record.duration,
+            'activity': record.activity,
+        }, ensure_ascii=False) + '\n'
+        for record in records
+    ]
+    return gzip.compress(''.join(lines).encode('utf-8'))
+
+
+def new_epoch():
+    """Случайный идентификатор журнала, меняется при каждой очистке"""
+    return os.urandom(16).hex()
+
+
+def post_batch(url, epoch, first_id, body, timeout=REQUEST_TIMEOUT):
+    """Отправляет пакет; исключение при сетевой ошибке или ответе не 2xx.
+
+    Эпоха журнала и номер первой записи идут в заголовках, поэтому
+    повтор пакета после потерянного ответа сервер может распознать и не
+    задвоить, а записи после очистки журнала (новая эпоха, номера снова
+    с нуля) не примет за уже полученные.
+    """
+    # Сеть нужна только при включённой синхронизации и не замедляет запуск
+    import urllib.request
+    request = urllib.request.Request(url, data=body, method='POST', headers={
+        'Content-Type': 'application/x-ndjson',
+        'Content-Encoding': 'gzip',
+        'X-Journal-Epoch': epoch,
+        'X-Journal-First': str(first_id),
+    })
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        response.read()
+
+
+class JournalSync:
+    """Поток синхронизации журнала с отметкой уже отправленного.
+
+    Отметка - число записей, которые сервер подтвердил; она хранится в
+    ``state_path`` вместе с эпохой журнала и адресом сервера и переживает
+    перезапуск; для другого адреса отсчёт начинается с нуля.
+    Эпоха меняется при очистке журнала, так что пара (эпоха, номер)
+    однозначно называет запись для сервера. ``notify()`` только будит
+    поток, а он за один проход отправляет всё, что лежит выше отметки,
+    пакетами по batch_size. Поэтому сессии, сохранённые без сети,
+    уходят одним запросом, когда сеть появится. Ошибки повторяются с
+    экспоненциальной задержкой и случайным разбросом.
+    """
+    def __init__(self, store, url, state_path, batch_size=BATCH_SIZE,
+                 backoff_base=BACKOFF_BASE, backoff_max=BACKOFF_MAX, send=post_batch):
+        self.store = store
+        self.url = url
+        self.state_path = state_path
+        self.batch_size = batch_size
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.send = send
+        self.epoch, self.synced = self._load_mark()
+        self._lock = threading.Lock()
+        self.failures = 0
+        self.records_sent = 0
+        self.bytes_sent = 0
+        self.requests_sent = 0
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='journal-sync', daemon=True)
+        self._thread.start()
+        self._wake.set()
+
+    def _load_mark(self):
+        if not os.path.exists(self.state_path):
+            return new_epoch(), 0
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            epoch, synced, url = state['epoch'], int(state['synced']), state['url']
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Синхронизация: не удалось прочитать отметку: {e}")
+            return new_epoch(), 0
+        if url != self.url:
+            # Новый сервер ещё ничего не получил: отправляем журнал целиком
+            return epoch, 0
+        return epoch, synced
+
+    def _save_mark(self):
+        atomic_write_json(self.state_path, {
+            'epoch': self.epoch,
+            'synced': self.synced,
+            'url': self.url,
+        }, sync=False)
+
+    def notify(self):
+        """В журнале появились записи; вызывать можно из любого потока"""
+        self._wake.set()
+
+    def reset(self):
+        """Журнал очищен: новая эпоха, отсчёт отправленного заново"""
+        with self._lock:
+            self.epoch = new_epoch()
+            self.synced = 0
+            self._save_mark()
+
+    def pending(self):
+        return max(0, self.store.count() - self.synced)
+
+    def close(self, timeout=2.0):
+        self._stopped.set()
+        self._wake.set()
+        self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wake.wait()
+            self._wake.clear()
+            while not self._stopped.is_set() and not self._sync_once():
+                self.failures += 1
+                delay = min(self.backoff_max, self.backoff_base * 2 ** (self.failures - 1))
+                # Разброс, чтобы клиенты не стучались в сервер одновременно
+                self._stopped.wait(delay * random.uniform(0.5, 1.0))
+            self.failures = 0
+
+    def _sync_once(self):
+        """Отправляет всё выше отметки; False, если нужно повторить позже"""
+        try:
+            count = self.store.count()
+            if count < self.synced:
+                # Журнал очистили в обход reset()
+                self.reset()
+            while not self._stopped.is_set():
+                with self._lock:
+                    epoch, first = self.epoch, self.synced
+                if first >= count:
+                    break
+                stop = min(count, first + self.batch_size)
+                body = encode_batch(self.store.read_range(first, stop))
+                self.send(self.url, epoch, first, body)
+                self.requests_sent += 1
+                self.bytes_sent += len(body)
+                self.records_sent += stop - first
+                with self._lock:
+                    if self.epoch != epoch:
+                        # Журнал очистили, пока пакет был в пути: новый проход
+                        self._wake.set()
+                        return True
+                    self.synced = stop
+                    self._save_mark()
+            return True
+        except Exception as e:
+            if not self.failures:
+                print(f"Синхронизация отложена: {e}")
+            return False
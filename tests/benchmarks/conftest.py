@@ -0,0 +1,31 @@
+import os
+import shutil
+
+import pytest
+
+from helpers import fill_store
+from session_store import SessionStore
+
+
+@pytest.fixture(scope='module')
+def filled_stores(tmp_path_factory):
+    """Журналы нужного размера строятся один раз на модуль"""
+    stores = {}
+
+    def get(n):
+        if n not in stores:
+            path = tmp_path_factory.mktemp(f'journal{n}') / 'sessions.jsonl'
+            stores[n] = fill_store(SessionStore(str(path)), n)
+        return stores[n]
+    return get
+
+
+@pytest.fixture
+def store_copy(filled_stores, tmp_path):
+    """Копия готового журнала для бенчмарков, которые его дописывают"""
+    def copy(n):
+        source = filled_stores(n)
+        directory = tmp_path / f'journal{n}'
+        shutil.copytree(os.path.dirname(source.path), directory)
+        return SessionStore(str(directory / os.path.basename(source.path)))
+    return copy
@@ -0,0 +1,38 @@
+"""Бенчмарки дисплея таймера: стоимость тика для глифов и для Label"""
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+pytest.importorskip('kivy')
+
+from kivy.core.window import Window  # noqa: F401  окно нужно для текстур
+from kivy.uix.label import Label
+
+import digit_display
+from digit_display import DigitDisplay
+from session import COLOR_NORMAL
+
+FONT_SIZE = 64
+# Минута обратного отсчёта - то, что дисплей показывает за 60 тиков
+TEXTS = [f"24:{second:02d}" for second in range(59, -1, -1)]
+
+
+def run_ticks(widget, render):
+    for text in TEXTS:
+        widget.text = text
+        render(widget)
+
+
+def test_digit_display_tick(benchmark):
+    """Смена текста переставляет готовые текстуры глифов"""
+    display = DigitDisplay(font_size=FONT_SIZE, bold=True, color=COLOR_NORMAL, size=(400, 100))
+    run_ticks(display, lambda widget: None)
+    glyphs = len(digit_display._glyphs)
+    benchmark(run_ticks, display, lambda widget: None)
+    # После первой минуты новых текстур не появляется
+    assert len(digit_display._glyphs) == glyphs
+
+
+def test_label_tick(benchmark):
+    """Для сравнения: Label растеризует строку в новую текстуру на каждый тик"""
+    label = Label(font_size=FONT_SIZE, bold=True, color=COLOR_NORMAL, size=(400, 100))
+    benchmark(run_ticks, label, Label.texture_update)
@@ -0,0 +1,38 @@
+"""Бенчмарки сессии: обработка тиков без виджетов и Clock"""
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from helpers import FakeClock
+from session import FocusSession
+
+TICKS = 1000
+
+
+def run_ticks(session, clock, ticks):
+    for _ in range(ticks):
+        clock.advance(1.0)
+        session.tick()
+
+
+def test_tick(benchmark):
+    """1000 секундных тиков 90-минутной сессии"""
+    clock = FakeClock()
+    session = FocusSession(clock=clock)
+    session.start(90)
+    benchmark(run_ticks, session, clock, TICKS)
+
+
+def test_tick_between_seconds(benchmark):
+    """Лишние пробуждения внутри секунды не перерисовывают дисплей"""
+    clock = FakeClock()
+    session = FocusSession(clock=clock)
+    session.start(90)
+    session.tick()
+
+    def idle_ticks():
+        for _ in range(TICKS):
+            clock.advance(0.0001)
+            session.tick()
+
+    benchmark(idle_ticks)
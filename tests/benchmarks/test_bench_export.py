@@ -0,0 +1,44 @@
+"""Бенчмарки экспорта: время и пиковая память на журналах разного размера"""
+import tracemalloc
+
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from exporter import FORMAT_CSV, FORMAT_JSONL, export_records
+
+SIZES = [1000, 100_000, pytest.param(1_000_000, marks=pytest.mark.slow)]
+FORMATS = [FORMAT_CSV, FORMAT_JSONL]
+
+
+def export(store, path, fmt):
+    with open(path, 'w', encoding='utf-8', newline='') as out:
+        return export_records(store.iter_records(), out, fmt, store.count())
+
+
+def peak_memory(store, path, fmt):
+    """Пик памяти Python-аллокаций за один экспорт, байт"""
+    tracemalloc.start()
+    try:
+        export(store, path, fmt)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.parametrize('fmt', FORMATS)
+@pytest.mark.parametrize('n', SIZES)
+def test_export(benchmark, filled_stores, tmp_path, n, fmt):
+    store = filled_stores(n)
+    done = benchmark.pedantic(export, (store, tmp_path / f'export.{fmt}', fmt), rounds=1 if n > 1000 else 5)
+    assert done == n
+
+
+@pytest.mark.parametrize('fmt', FORMATS)
+def test_export_memory_is_flat(filled_stores, tmp_path, fmt):
+    """Журнал в 10 раз больше (уже с архивами) не поднимает пик памяти"""
+    small = peak_memory(filled_stores(2000), tmp_path / 'small', fmt)
+    large = peak_memory(filled_stores(20_000), tmp_path / 'large', fmt)
+    assert large < small * 1.5, (
+        f"пик памяти экспорта {fmt}: 2k {small / 1024:.0f} КБ, 20k {large / 1024:.0f} КБ"
+    )
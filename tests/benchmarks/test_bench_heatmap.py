@@ -0,0 +1,61 @@
+"""Бенчмарки тепловой карты: построение, перерисовка и обновление дня за 1-10 лет"""
+import random
+from datetime import date, timedelta
+
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+pytest.importorskip('kivy')
+
+from kivy.core.window import Window  # noqa: F401  окно нужно для мешей
+
+from heatmap import FocusHeatmap
+
+YEARS = [1, 5, 10]
+END = date(2026, 6, 30)
+
+
+def daily_totals(years, seed=0):
+    """Минуты за каждый день последних лет, с выходными без фокуса"""
+    rng = random.Random(seed)
+    return {
+        (END - timedelta(days=i)).isoformat(): rng.choice((0, 0, 15, 45, 90, 180))
+        for i in range(365 * years)
+    }
+
+
+def make_heatmap(years, daily=None):
+    """Карта на все годы данных: по 53 недели на год"""
+    return FocusHeatmap(daily=daily or daily_totals(years), end=END, weeks=53 * years, size=(53 * 12 * years, 84))
+
+
+@pytest.mark.parametrize('years', YEARS)
+def test_build(benchmark, years):
+    daily = daily_totals(years)
+    heatmap = benchmark(make_heatmap, years, daily)
+    assert len(heatmap.levels) > 364 * years
+    # Пять мешей при любом числе дней
+    assert len(heatmap.meshes) == 5
+
+
+@pytest.mark.parametrize('years', YEARS)
+def test_redraw(benchmark, years):
+    """Полный пересчёт вершин, как при смене размера виджета"""
+    heatmap = make_heatmap(years)
+    benchmark(heatmap.redraw)
+
+
+@pytest.mark.parametrize('years', YEARS)
+def test_set_totals_year_window(benchmark, years):
+    """Обычная годовая карта: стоимость не зависит от лет статистики"""
+    daily = daily_totals(years)
+    heatmap = FocusHeatmap(end=END, size=(640, 84))
+    benchmark(heatmap.set_totals, daily, END)
+
+
+@pytest.mark.parametrize('years', YEARS)
+def test_set_day(benchmark, years):
+    """Сохранение сессии меняет уровень одной клетки"""
+    heatmap = make_heatmap(years)
+    minutes = iter([0, 200] * 1_000_000)
+    benchmark(lambda: heatmap.set_day(END, next(minutes)))
@@ -0,0 +1,58 @@
+"""Бенчмарки журнала: дозапись и разбор на 1k, 100k и 1M записей"""
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from helpers import make_records
+from session_store import SEPARATOR, parse_text_log, decode_record, encode_record
+
+SIZES = [1000, 100_000, pytest.param(1_000_000, marks=pytest.mark.slow)]
+
+
+def text_log_lines(n):
+    lines = []
+    for record in make_records(n):
+        lines += [
+            f"📅 {record.start:%Y-%m-%d %H:%M:%S} → {record.end:%Y-%m-%d %H:%M:%S}\n",
+            f"⏱️ Фокус-время: {record.duration} минут\n",
+            f"🎯 Достижение: {record.activity}\n",
+            f"{SEPARATOR}\n",
+            "\n",
+        ]
+    return lines
+
+
+@pytest.mark.parametrize('n', SIZES)
+def test_append_one(benchmark, store_copy, n):
+    """Сохранение одной сессии не дорожает с ростом журнала"""
+    store = store_copy(n)
+    record = make_records(1, first=n)[0]
+    benchmark(store.append, record)
+
+
+def test_append_batch(benchmark, store):
+    """Пакет из 100 записей, как его сбрасывает поток записи"""
+    records = make_records(100)
+    benchmark(store.append_many, records)
+
+
+@pytest.mark.parametrize('n', SIZES)
+def test_parse_journal(benchmark, filled_stores, n):
+    """Полный потоковый разбор всех сегментов"""
+    store = filled_stores(n)
+    count = benchmark.pedantic(lambda: sum(1 for _ in store.iter_records()), rounds=1 if n > 1000 else 5)
+    assert count == n
+
+
+@pytest.mark.parametrize('n', SIZES)
+def test_parse_text_log(benchmark, n):
+    """Разбор старого текстового журнала при переносе"""
+    lines = text_log_lines(n)
+    count = benchmark.pedantic(lambda: sum(1 for _ in parse_text_log(lines)), rounds=1 if n > 1000 else 5)
+    assert count == n
+
+
+def test_record_codec(benchmark):
+    """Кодирование и разбор одной строки с контрольной суммой"""
+    record = make_records(1)[0]
+    benchmark(lambda: decode_record(encode_record(record)))
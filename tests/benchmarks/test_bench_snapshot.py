@@ -0,0 +1,47 @@
+"""Бенчмарки снимка сессии: запись при уходе в фон и восстановление при запуске"""
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from helpers import FakeClock
+from session import FocusSession
+from snapshot import SessionSnapshot
+
+# Снимок пишется в on_pause, на которую система даёт доли секунды
+LATENCY_LIMIT = 0.005
+ACTIVITY = "Разбор главы о конкурентности и заметки к ней. " * 20
+
+
+@pytest.fixture
+def running_session():
+    session = FocusSession(clock=FakeClock())
+    session.start(50)
+    return session
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    return SessionSnapshot(str(tmp_path / 'session.json'))
+
+
+def save(snapshot, session):
+    snapshot.save(session, time_input='50', display='49:59', activity=ACTIVITY)
+
+
+def restore(snapshot):
+    session = FocusSession(clock=FakeClock())
+    session.restore(snapshot.load())
+    return session
+
+
+def test_snapshot_save(benchmark, snapshot, running_session):
+    benchmark(save, snapshot, running_session)
+    assert benchmark.stats['median'] < LATENCY_LIMIT
+
+
+def test_snapshot_restore(benchmark, snapshot, running_session):
+    save(snapshot, running_session)
+    session = benchmark(restore, snapshot)
+    assert session.running
+    assert benchmark.stats['median'] < LATENCY_LIMIT
+
@@ -0,0 +1,75 @@
+"""Бенчмарки синхронизации: скорость догона и байты на запись в сети"""
+import time
+
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from helpers import make_records
+from session_store import encode_record
+from sync import JournalSync
+
+CATCH_UP_RECORDS = 10_000
+
+
+def wait_synced(sync, timeout=60.0):
+    deadline = time.monotonic() + timeout
+    while sync.pending():
+        assert time.monotonic() < deadline, "синхронизация не завершилась"
+        time.sleep(0.0005)
+
+
+def report(benchmark, records, sent_bytes, requests, seconds):
+    """Записи в секунду и сжатые байты на запись - в отчёт бенчмарка"""
+    benchmark.extra_info['records_per_s'] = round(records / seconds)
+    benchmark.extra_info['bytes_per_record'] = round(sent_bytes / records, 1)
+    benchmark.extra_info['requests'] = requests
+    return sent_bytes / records
+
+
+def test_catch_up(benchmark, filled_stores, server, tmp_path):
+    """Первая синхронизация всего журнала пакетами по умолчанию"""
+    store = filled_stores(CATCH_UP_RECORDS)
+    syncs = []
+
+    def catch_up(round_id):
+        sync = JournalSync(store, server.url, str(tmp_path / f'sync{round_id}.json'))
+        syncs.append(sync)
+        wait_synced(sync)
+
+    rounds = iter(range(1_000_000))
+    benchmark.pedantic(lambda: catch_up(next(rounds)), rounds=3)
+    for sync in syncs:
+        sync.close()
+    sync = syncs[-1]
+    assert sync.records_sent == CATCH_UP_RECORDS
+    per_record = report(benchmark, sync.records_sent, sync.bytes_sent, sync.requests_sent,
+                        benchmark.stats['median'])
+    # Пакет сжимается: на запись уходит заметно меньше, чем её строка в журнале
+    line_size = len(encode_record(make_records(1)[0]))
+    assert per_record < line_size / 2, f"{per_record:.1f} байт на запись при строке в {line_size}"
+
+
+def test_one_record_delta(benchmark, store, server, tmp_path):
+    """Сохранение одной сессии при уже синхронизированном журнале"""
+    store.append_many(make_records(100))
+    sync = JournalSync(store, server.url, str(tmp_path / 'sync.json'))
+    wait_synced(sync)
+    before = (sync.records_sent, sync.bytes_sent, sync.requests_sent)
+    next_id = iter(range(100, 1_000_000))
+
+    def save_one():
+        store.append_many(make_records(1, first=next(next_id)))
+        sync.notify()
+        wait_synced(sync)
+
+    try:
+        benchmark.pedantic(save_one, rounds=200)
+    finally:
+        sync.close()
+    records, sent_bytes, requests = (
+        now - then for now, then in zip((sync.records_sent, sync.bytes_sent, sync.requests_sent), before)
+    )
+    # Дельта - один запрос на сохранение, без повторной отправки старого
+    assert records == requests == 200
+    report(benchmark, records, sent_bytes, requests, benchmark.stats['total'])
@@ -0,0 +1,62 @@
+"""Бенчмарки смены темы на глубоком дереве виджетов"""
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+pytest.importorskip('kivy')
+
+from kivy.core.window import Window  # noqa: F401  окно нужно для текстур Label
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
+from kivy.uix.textinput import TextInput
+
+from theme import DARK, LIGHT, PALETTES, ThemeRegistry
+
+# Вложенность и ширина как у самых тяжёлых окон приложения, с запасом
+DEPTH = 12
+LABELS_PER_LEVEL = 20
+
+
+def build_tree(theme, depth=DEPTH):
+    """Вложенные колонки карточек с подписями и полями ввода на каждом уровне"""
+    root = parent = BoxLayout(orientation='vertical')
+    for _ in range(depth):
+        for i in range(LABELS_PER_LEVEL):
+            parent.add_widget(theme.bind(Label(text=f"Строка {i}"), 'color', 'text'))
+        parent.add_widget(theme.bind(TextInput(), 'background_color', 'input'))
+        child = BoxLayout(orientation='vertical')
+        parent.add_widget(child)
+        parent = child
+    return root
+
+
+def walk_and_paint(root, name):
+    """Прежний способ: обойти дерево и перекрасить виджеты по типу"""
+    palette = PALETTES[name]
+    for widget in root.walk():
+        if isinstance(widget, TextInput):
+            widget.background_color = palette['input']
+        elif isinstance(widget, Label):
+            widget.color = palette['text']
+
+
+@pytest.fixture(scope='module')
+def tree():
+    theme = ThemeRegistry()
+    return theme, build_tree(theme)
+
+
+def test_registry_switch(benchmark, tree):
+    """Один проход по привязкам, без обхода дерева"""
+    theme, root = tree
+    benchmark(theme.toggle)
+    theme.apply(LIGHT)
+    labels = [w for w in root.walk() if isinstance(w, Label)]
+    assert len(labels) == DEPTH * LABELS_PER_LEVEL
+    assert all(tuple(label.color) == PALETTES[LIGHT]['text'] for label in labels)
+
+
+def test_tree_walk_switch(benchmark, tree):
+    """Для сравнения: ручной обход того же дерева"""
+    theme, root = tree
+    names = iter([DARK, LIGHT] * 1_000_000)
+    benchmark(lambda: walk_and_paint(root, next(names)))
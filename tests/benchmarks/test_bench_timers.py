@@ -0,0 +1,81 @@
+"""Бенчмарки кучи таймеров: операции на сотнях и сотнях тысяч таймеров"""
+import random
+import time
+
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from helpers import FakeClock
+from timer_core import TimerManager
+
+SIZES = [100, 1000, 10_000, 100_000]
+DAY = 24 * 3600
+
+
+def noop(timer_id, label):
+    pass
+
+
+def make_manager(n, seed=0):
+    """Менеджер с n таймерами от минуты до суток и счётчиком перевзводов"""
+    rng = random.Random(seed)
+    arms = []
+    manager = TimerManager(FakeClock(), arm=arms.append)
+    ids = [manager.add(rng.uniform(60, DAY), noop) for _ in range(n)]
+    return manager, ids, arms, rng
+
+
+@pytest.mark.parametrize('n', SIZES)
+def test_add_cancel(benchmark, n):
+    manager, _, _, rng = make_manager(n)
+    benchmark(lambda: manager.cancel(manager.add(rng.uniform(60, DAY), noop)))
+    assert len(manager.timers) == n
+
+
+@pytest.mark.parametrize('n', SIZES)
+def test_pause_resume(benchmark, n):
+    manager, ids, _, rng = make_manager(n)
+
+    def pause_resume():
+        timer_id = rng.choice(ids)
+        manager.pause(timer_id)
+        manager.resume(timer_id)
+
+    benchmark(pause_resume)
+    # Устаревшие записи не копятся: куча пересобирается
+    assert len(manager._heap) <= 2 * n + 64
+
+
+@pytest.mark.parametrize('n', SIZES)
+def test_idle_wakeup(benchmark, n):
+    """Пробуждение без наступивших дедлайнов не трогает остальные таймеры"""
+    manager, _, arms, _ = make_manager(n)
+    wakeups = []
+
+    def wakeup():
+        wakeups.append(1)
+        return manager.fire_due()
+
+    arms.clear()
+    assert benchmark(wakeup) == 0
+    # Одно событие Clock на все таймеры: по перевзводу на пробуждение
+    assert len(arms) == len(wakeups)
+
+
+def per_op_time(n, ops=2000):
+    manager, ids, _, rng = make_manager(n)
+    started = time.perf_counter()
+    for _ in range(ops):
+        timer_id = rng.choice(ids)
+        manager.pause(timer_id)
+        manager.resume(timer_id)
+        manager.cancel(manager.add(rng.uniform(60, DAY), noop))
+    return (time.perf_counter() - started) / ops
+
+
+def test_ops_scale_logarithmically():
+    """В тысячу раз больше таймеров - операции дорожают в разы, а не в тысячу раз"""
+    small = min(per_op_time(100) for _ in range(3))
+    large = min(per_op_time(100_000) for _ in range(3))
+    assert large < small * 10
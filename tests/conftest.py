@@ -0,0 +1,28 @@
+import os
+
+import pytest
+
+# Kivy не должен разбирать аргументы pytest и засорять вывод
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+
+from helpers import FakeClock, FakeServer
+from session_store import SessionStore
+
+
+@pytest.fixture
+def fake_clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SessionStore(str(tmp_path / 'sessions.jsonl'))
+
+
+@pytest.fixture
+def server():
+    """Подставной сервер резервных копий на свободном порту"""
+    server = FakeServer()
+    yield server
+    server.close()
@@ -0,0 +1,108 @@
+"""Помощники тестов: подставные часы, службы платформы, генератор записей журнала и сервер синхронизации"""
+import gzip
+import json
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from session_store import SessionRecord
+
+
+class FakeClock:
+    """Монотонные часы, которые двигает только тест"""
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class FakeServices:
+    """Службы платформы, которые только запоминают вызовы"""
+    def __init__(self):
+        self.notifications = []
+        self.alerts = 0
+        self.ongoing = None
+        self.alarm = None
+
+    def notify(self, title, message, urgent=False):
+        self.notifications.append(message)
+
+    def play_alert(self):
+        self.alerts += 1
+
+    def show_ongoing(self, title, message):
+        self.ongoing = message
+
+    def cancel_ongoing(self):
+        self.ongoing = None
+
+    def schedule_alarm(self, deadline):
+        self.alarm = deadline
+
+    def cancel_alarm(self):
+        self.alarm = None
+
+
+def make_records(n, first=0, start=datetime(2024, 1, 1, 9, 0)):
+    """Сессии по 25 минут каждые полчаса с кириллицей в описании"""
+    return [
+        SessionRecord(
+            start + timedelta(minutes=30 * i),
+            start + timedelta(minutes=30 * i + 25),
+            25,
+            f"Задача {i}: чтение статьи и заметки",
+        )
+        for i in range(first, first + n)
+    ]
+
+
+def fill_store(store, n, batch=10000):
+    """Наполняет журнал n записями пакетами, как это делает импорт"""
+    for first in range(0, n, batch):
+        store.append_many(make_records(min(batch, n - first), first))
+    return store
+
+
+class FakeServer:
+    """Сервер резервных копий: хранит записи по (эпоха, номер)"""
+    def __init__(self):
+        self.records = {}
+        self.requests = []
+        self.online = True
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = gzip.decompress(self.rfile.read(int(self.headers['Content-Length'])))
+                if not server.online:
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+                epoch = self.headers['X-Journal-Epoch']
+                first = int(self.headers['X-Journal-First'])
+                lines = [json.loads(line) for line in body.decode('utf-8').splitlines()]
+                server.requests.append((epoch, first, len(lines)))
+                for i, line in enumerate(lines, first):
+                    # Повтор пакета не задваивает записи
+                    server.records.setdefault((epoch, i), line['activity'])
+                self.send_response(200)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/journal"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def activities(self):
+        return sorted(self.records.values())
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
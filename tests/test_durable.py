@@ -0,0 +1,199 @@
+"""Восстановление после сбоев: обрезанные файлы, оборванные записи, прерванная ротация"""
+import os
+import random
+import shutil
+
+import pytest
+
+from durable import atomic_write, drop_partial_tail, frame, unframe
+from helpers import fill_store, make_records
+import session_store
+from session_store import SessionStore
+
+RECORDS = 40
+CUTS = 200
+
+
+@pytest.fixture(scope='module')
+def template(tmp_path_factory):
+    """Журнал-образец и смещения концов его строк"""
+    directory = tmp_path_factory.mktemp('template')
+    store = fill_store(SessionStore(str(directory / 's.jsonl')), RECORDS, batch=7)
+    with open(store.path, 'rb') as f:
+        line_ends = []
+        for line in f:
+            line_ends.append((line_ends[-1] if line_ends else 0) + len(line))
+    return store, line_ends
+
+
+def copy_store(template_store, directory):
+    for name in ('s.jsonl', 's.jsonl.idx'):
+        shutil.copy(os.path.join(os.path.dirname(template_store.path), name), directory / name)
+    return str(directory / 's.jsonl')
+
+
+def truncate(path, size):
+    with open(path, 'rb+') as f:
+        f.truncate(size)
+
+
+def complete_lines(line_ends, size):
+    return sum(1 for end in line_ends if end <= size)
+
+
+def assert_recovered(path, expected):
+    """Журнал открывается, читается и принимает новые записи"""
+    store = SessionStore(path)
+    assert store.count() == expected
+    assert store.read_range(0, expected) == make_records(expected)
+    assert store.append(make_records(1, first=expected)[0]) == expected
+    reopened = SessionStore(path)
+    assert reopened.read_range(0, expected + 1) == make_records(expected + 1)
+
+
+@pytest.mark.parametrize('seed', range(CUTS))
+def test_truncated_data_file(template, tmp_path, seed):
+    template_store, line_ends = template
+    rng = random.Random(seed)
+    path = copy_store(template_store, tmp_path)
+    size = rng.randrange(line_ends[-1] + 1)
+    truncate(path, size)
+    assert_recovered(path, complete_lines(line_ends, size))
+
+
+@pytest.mark.parametrize('seed', range(CUTS // 2))
+def test_truncated_index_file(template, tmp_path, seed):
+    template_store, _ = template
+    rng = random.Random(seed)
+    path = copy_store(template_store, tmp_path)
+    truncate(path + '.idx', rng.randrange(os.path.getsize(path + '.idx') + 1))
+    assert_recovered(path, RECORDS)
+
+
+@pytest.mark.parametrize('seed', range(CUTS // 2))
+def test_truncated_data_and_index(template, tmp_path, seed):
+    template_store, line_ends = template
+    rng = random.Random(seed)
+    path = copy_store(template_store, tmp_path)
+    size = rng.randrange(line_ends[-1] + 1)
+    truncate(path, size)
+    truncate(path + '.idx', rng.randrange(os.path.getsize(path + '.idx') + 1))
+    assert_recovered(path, complete_lines(line_ends, size))
+
+
+@pytest.mark.parametrize('garbage', [
+    b'0000',
+    b'deadbeef {"start": "2024-01-01 09:00:00"',
+    # Строка дописана целиком, но байты внутри неё не дошли до диска
+    b'deadbeef {"start": "2024-01-01 09:00:00"}\n',
+    b'\x00' * 64,
+    # Строка без контрольной суммы и строка с верной суммой, но битым JSON
+    b'{"start": "2024-01\n',
+    frame(b'{"start": "2024-01'),
+])
+def test_torn_append(template, tmp_path, garbage):
+    template_store, _ = template
+    path = copy_store(template_store, tmp_path)
+    with open(path, 'ab') as f:
+        f.write(garbage)
+    assert_recovered(path, RECORDS)
+
+
+@pytest.mark.parametrize('failing_write', [0, 1])
+def test_failed_append_is_rolled_back(tmp_path, monkeypatch, failing_write):
+    """Ошибка посреди записи данных или индекса не оставляет оборванной строки"""
+    path = str(tmp_path / 's.jsonl')
+    store = fill_store(SessionStore(path), 3)
+    writes = []
+    write_all = session_store.write_all
+
+    def torn_write(f, data):
+        writes.append(data)
+        if len(writes) - 1 == failing_write:
+            f.write(data[:30])
+            raise OSError("На устройстве не осталось места")
+        write_all(f, data)
+
+    monkeypatch.setattr(session_store, 'write_all', torn_write)
+    with pytest.raises(OSError):
+        store.append_many(make_records(2, first=3))
+    monkeypatch.setattr(session_store, 'write_all', write_all)
+
+    assert store.append_many(make_records(1, first=3)) == 3
+    assert store.read_range(0, 4) == make_records(4)
+    assert store.last(2) == make_records(2, first=2)
+    assert list(store.iter_records()) == make_records(4)
+    assert_recovered(path, 4)
+
+
+def test_index_ahead_of_data(template, tmp_path):
+    """Индекс ушёл на диск, а строки данных - нет"""
+    template_store, line_ends = template
+    path = copy_store(template_store, tmp_path)
+    truncate(path, line_ends[RECORDS - 6])
+    assert_recovered(path, RECORDS - 5)
+
+
+def test_bit_flips_never_return_damaged_data():
+    rng = random.Random(0)
+    payload = '{"activity": "чтение"}'.encode('utf-8')
+    line = frame(payload)
+    assert unframe(line) == payload
+    for _ in range(200):
+        damaged = bytearray(line)
+        i = rng.randrange(len(damaged) - 1)
+        damaged[i] ^= 1 << rng.randrange(8)
+        # Смена регистра цифры контрольной суммы данных не портит
+        assert unframe(bytes(damaged)) in (None, payload)
+        if i >= len(line) - len(payload) - 1:
+            assert unframe(bytes(damaged)) is None
+
+
+def test_rotation_interrupted_after_rename(tmp_path):
+    store = fill_store(SessionStore(str(tmp_path / 's.jsonl')), 30)
+    os.replace(store.path, store.rotating_path)
+    assert_recovered(store.path, 30)
+    assert len(SessionStore(store.path).archives) == 1
+
+
+def test_rotation_interrupted_with_torn_tail(tmp_path):
+    store = fill_store(SessionStore(str(tmp_path / 's.jsonl')), 30)
+    with open(store.path, 'ab') as f:
+        f.write(frame(b'{"start": "2024-01'))
+    os.replace(store.path, store.rotating_path)
+    assert_recovered(store.path, 30)
+
+
+def test_rotation_interrupted_before_cleanup(tmp_path):
+    store = fill_store(SessionStore(str(tmp_path / 's.jsonl')), 30)
+    shutil.copy(store.path, tmp_path / 'active.copy')
+    store.rotate()
+    # Архив и манифест записаны, а файл ротации ещё не удалён
+    shutil.copy(tmp_path / 'active.copy', store.rotating_path)
+    assert_recovered(store.path, 30)
+    assert len(SessionStore(store.path).archives) == 1
+
+
+def test_atomic_write_keeps_old_file_on_crash(tmp_path):
+    path = str(tmp_path / 'stats.json')
+    atomic_write(path, b'{"old": 1}')
+    # Процесс погиб посреди записи временного файла
+    with open(path + '.tmp', 'wb') as f:
+        f.write(b'{"new": ')
+    with open(path, 'rb') as f:
+        assert f.read() == b'{"old": 1}'
+    atomic_write(path, b'{"new": 2}')
+    with open(path, 'rb') as f:
+        assert f.read() == b'{"new": 2}'
+
+
+@pytest.mark.parametrize('chunk_size', [4096, 5])
+def test_drop_partial_tail(tmp_path, chunk_size):
+    path = str(tmp_path / 'index.search')
+    complete = '0\tчтение\n1\tзаметки\n'.encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(complete + '2\tобр'.encode('utf-8'))
+    assert drop_partial_tail(path, chunk_size) == len('2\tобр'.encode('utf-8'))
+    with open(path, 'rb') as f:
+        assert f.read() == complete
+    assert drop_partial_tail(path, chunk_size) == 0
@@ -0,0 +1,138 @@
+"""Фоновая запись журнала: очередь, пакеты, fsync и ошибки"""
+import threading
+import time
+
+import pytest
+
+from log_writer import FSYNC_BATCH, FSYNC_INTERVAL, FSYNC_NEVER, AsyncLogWriter
+
+
+class FakeWrites:
+    """write_batch, который запоминает пакеты и может задержать запись"""
+    def __init__(self, error=None, delay=0.0):
+        self.batches = []
+        self.error = error
+        self.delay = delay
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, items, sync):
+        self.started.set()
+        self.release.wait()
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        self.batches.append((items, sync))
+
+    @property
+    def items(self):
+        return [item for items, _ in self.batches for item in items]
+
+
+@pytest.fixture
+def writers():
+    made = []
+
+    def make(writes, **kwargs):
+        writer = AsyncLogWriter(writes, **kwargs)
+        made.append((writer, writes))
+        return writer
+
+    yield make
+    for writer, writes in made:
+        writes.release.set()
+        writer.close()
+
+
+def test_queue_is_bounded(writers):
+    writes = FakeWrites()
+    writes.release.clear()
+    writer = writers(writes, max_queue=2, coalesce_delay=0)
+    writer.submit('a')
+    # Поток взял первую запись и завис на диске
+    assert writes.started.wait(2.0)
+    writer.submit('b')
+    writer.submit('c')
+    blocked = threading.Thread(target=writer.submit, args=('d',))
+    blocked.start()
+    blocked.join(0.2)
+    assert blocked.is_alive()
+    writes.release.set()
+    blocked.join(2.0)
+    assert not blocked.is_alive()
+    assert writer.flush()
+    assert writes.items == ['a', 'b', 'c', 'd']
+
+
+def test_close_together_writes_are_coalesced(writers):
+    writes = FakeWrites()
+    writer = writers(writes, coalesce_delay=0.5, fsync=FSYNC_NEVER)
+    for item in 'abc':
+        writer.submit(item)
+    time.sleep(1.0)
+    assert writes.batches == [(['a', 'b', 'c'], False)]
+
+
+def test_fsync_interval(writers):
+    writes = FakeWrites()
+    writer = writers(writes, coalesce_delay=0, fsync=FSYNC_INTERVAL, fsync_interval=0.3)
+
+    def write(item):
+        done = threading.Event()
+        writer.submit(item, lambda error: done.set())
+        assert done.wait(2.0)
+
+    write('a')
+    write('b')
+    time.sleep(0.4)
+    write('c')
+    write('d')
+    assert writes.batches == [(['a'], True), (['b'], False), (['c'], True), (['d'], False)]
+
+
+@pytest.mark.parametrize('fsync', [FSYNC_NEVER, FSYNC_INTERVAL])
+def test_flush_forces_sync_after_earlier_items(writers, fsync):
+    writes = FakeWrites(delay=0.1)
+    writer = writers(writes, coalesce_delay=0.01, fsync=fsync, fsync_interval=60.0)
+    writer.submit('a')
+    time.sleep(0.05)
+    writer.submit('b')
+    assert writer.flush()
+    # flush() вернулся, когда обе записи уже на диске, последняя - с fsync
+    assert writes.items == ['a', 'b']
+    assert writes.batches[-1] == (['b'], True)
+
+
+def test_error_reaches_every_callback_in_batch(writers):
+    error = OSError("На устройстве не осталось места")
+    writer = writers(FakeWrites(error=error), coalesce_delay=0.5)
+    results = []
+    for item in 'abc':
+        writer.submit(item, results.append)
+    assert writer.flush()
+    assert results == [error, error, error]
+
+
+def test_close_drains_queue(writers):
+    writes = FakeWrites(delay=0.05)
+    writer = writers(writes, coalesce_delay=0)
+    results = []
+    for i in range(10):
+        writer.submit(i, results.append)
+    assert writer.close()
+    assert writes.items == list(range(10))
+    assert results == [None] * 10
+    assert writes.batches[-1][1]
+    # Повторное закрытие остановленного писателя ничего не ждёт
+    assert writer.close()
+
+
+def test_batch_mode_syncs_every_batch(writers):
+    writes = FakeWrites()
+    writer = writers(writes, coalesce_delay=0, fsync=FSYNC_BATCH)
+    for item in 'ab':
+        done = threading.Event()
+        writer.submit(item, lambda error: done.set())
+        assert done.wait(2.0)
+    assert writes.batches == [(['a'], True), (['b'], True)]
@@ -0,0 +1,69 @@
+"""Индекс поиска: догон по журналу и одновременная перестройка"""
+import threading
+
+import pytest
+
+from helpers import fill_store, make_records
+from search_index import SearchIndex
+
+
+@pytest.fixture
+def index(tmp_path):
+    return SearchIndex(str(tmp_path / 's.search'))
+
+
+def index_lines(index):
+    with open(index.path, encoding='utf-8') as f:
+        return f.readlines()
+
+
+def test_old_records_are_backfilled_after_new_save(store, index):
+    # Записи перенесены из старого журнала или файл индекса потерян
+    fill_store(store, 100)
+    new = make_records(1, first=100)
+    store.append_many(new)
+    index.add_records(100, new)
+    assert not index.is_fresh(store)
+    index.ensure_fresh(store)
+    assert index.is_fresh(store)
+    assert len(index.search('чтение')) == 101
+    assert index.search('7 задача') == [7]
+
+
+def test_index_reloaded_with_gap_is_backfilled(store, tmp_path, index):
+    fill_store(store, 50)
+    new = make_records(1, first=50)
+    store.append_many(new)
+    index.add_records(50, new)
+    reopened = SearchIndex(index.path)
+    reopened.ensure_fresh(store)
+    assert len(reopened.search('чтение')) == 51
+    assert len(index_lines(reopened)) == 51
+
+
+def test_concurrent_rebuilds_do_not_duplicate(store, index):
+    fill_store(store, 3000)
+    threads = [
+        threading.Thread(target=index.ensure_fresh, args=(store,), kwargs={'chunk_size': 100})
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(index_lines(index)) == 3000
+    assert len(index.search('чтение', limit=10_000)) == 3000
+
+
+def test_rebuild_after_clear(store, index):
+    fill_store(store, 20)
+    index.ensure_fresh(store)
+    store.clear()
+    store.append_many(make_records(3))
+    index.ensure_fresh(store)
+    assert index.search('чтение') == [2, 1, 0]
+    assert len(index_lines(index)) == 3
+
+
+def test_search_before_load_finds_nothing(index):
+    assert index.search('чтение') == []
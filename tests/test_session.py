@@ -0,0 +1,105 @@
+"""Снимок и восстановление фокус-сессии после гибели процесса и перезагрузки"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from helpers import FakeClock
+from session import FocusSession
+
+START = datetime(2024, 3, 1, 9, 0)
+
+
+class Device:
+    """Монотонные часы, настенное время и загрузка ОС одного устройства"""
+    def __init__(self, uptime=60.0, boot='boot-1'):
+        self.clock = FakeClock(uptime)
+        self.wall = START
+        self.boot_id = boot
+
+    def session(self, with_boot_id=True):
+        return FocusSession(
+            clock=self.clock,
+            now=lambda: self.wall,
+            boot=(lambda: self.boot_id) if with_boot_id else (lambda: None),
+        )
+
+    def sleep(self, seconds):
+        self.clock.advance(seconds)
+        self.wall += timedelta(seconds=seconds)
+
+    def reboot(self, downtime, uptime):
+        """Выключение на downtime секунд и запуск, после которого прошло uptime"""
+        self.wall += timedelta(seconds=downtime + uptime)
+        self.clock = FakeClock(uptime)
+        self.boot_id += '+'
+
+
+def snapshot_after(device, minutes, seconds, with_boot_id=True):
+    session = device.session(with_boot_id)
+    session.start(minutes)
+    device.sleep(seconds)
+    return session.snapshot()
+
+
+@pytest.mark.parametrize('with_boot_id', [True, False])
+def test_process_death_keeps_counting(with_boot_id):
+    device = Device()
+    data = snapshot_after(device, 25, 60, with_boot_id)
+    device.sleep(300)
+    restored = device.session(with_boot_id)
+    restored.restore(data)
+    assert restored.running
+    assert restored.timer.remaining() == pytest.approx(25 * 60 - 360)
+
+
+@pytest.mark.parametrize('with_boot_id', [True, False])
+def test_reboot_with_uptime_past_saved_clock(with_boot_id):
+    """Снимок на 60 с работы, перезагрузка, восстановление через час на 120 с работы"""
+    device = Device(uptime=0.0)
+    data = snapshot_after(device, 25, 60, with_boot_id)
+    device.reboot(downtime=3600 - 120, uptime=120)
+    restored = device.session(with_boot_id)
+    restored.restore(data)
+    assert restored.finished
+    assert restored.timer.remaining() == 0.0
+
+
+@pytest.mark.parametrize('with_boot_id', [True, False])
+def test_short_reboot_counts_wall_time(with_boot_id):
+    device = Device(uptime=500.0)
+    data = snapshot_after(device, 50, 60, with_boot_id)
+    device.reboot(downtime=200, uptime=100)
+    restored = device.session(with_boot_id)
+    restored.restore(data)
+    assert restored.timer.remaining() == pytest.approx(50 * 60 - 60 - 300)
+
+
+def test_reboot_with_smaller_uptime():
+    device = Device(uptime=5000.0)
+    data = snapshot_after(device, 50, 60, with_boot_id=False)
+    device.reboot(downtime=600, uptime=40)
+    restored = device.session(with_boot_id=False)
+    restored.restore(data)
+    assert restored.timer.remaining() == pytest.approx(50 * 60 - 60 - 640)
+
+
+def test_wall_clock_change_without_reboot_is_ignored():
+    """Пользователь перевёл часы, но загрузка та же: верим монотонным часам"""
+    device = Device()
+    data = snapshot_after(device, 25, 60)
+    device.sleep(120)
+    device.wall += timedelta(hours=3)
+    restored = device.session()
+    restored.restore(data)
+    assert restored.timer.remaining() == pytest.approx(25 * 60 - 180)
+
+
+def test_stopped_session_restores_without_countdown():
+    device = Device()
+    session = device.session()
+    session.start(25)
+    session.stop()
+    restored = device.session()
+    restored.restore(session.snapshot())
+    assert restored.state == 'stopped'
+    assert not restored.timer.running
@@ -0,0 +1,90 @@
+"""Журнал сессий: чтение хвоста, ротация и согласованность счётчика"""
+import random
+import threading
+
+import pytest
+
+from helpers import fill_store, make_records
+from session_store import SessionStore
+
+
+@pytest.mark.parametrize('block_size', [4096, 64, 7])
+@pytest.mark.parametrize('n', [1, 5, 17])
+def test_tail_matches_last(tmp_path, block_size, n):
+    store = fill_store(SessionStore(str(tmp_path / 's.jsonl'), max_active_bytes=2000), 60)
+    assert store.tail(n, block_size) == store.last(n)
+
+
+@pytest.mark.parametrize('block_size', [4096, 64, 7])
+def test_tail_skips_unterminated_line_longer_than_block(store, block_size):
+    store.append_many(make_records(3))
+    with open(store.path, 'ab') as f:
+        f.write(b'0000 {"activity": "' + b'x' * 5000)
+    assert store.tail(5, block_size) == make_records(3)
+
+
+@pytest.mark.parametrize('block_size', [64, 7])
+def test_tail_reads_lines_longer_than_block(store, block_size):
+    record = make_records(1)[0]._replace(activity='длинное описание ' * 50)
+    store.append_many([record] + make_records(2, first=1))
+    assert store.tail(3, block_size)[0] == record
+
+
+def test_tail_of_empty_journal(store):
+    assert store.tail(5) == []
+    with open(store.path, 'ab') as f:
+        f.write(b'0000 {"partial')
+    assert store.tail(5) == []
+
+
+def test_count_never_drops_during_rotation(tmp_path):
+    """Читатели из других потоков не видят журнал посреди ротации"""
+    store = SessionStore(str(tmp_path / 's.jsonl'), max_active_bytes=1500)
+    stop = threading.Event()
+    seen = []
+    errors = []
+
+    def reader():
+        last = 0
+        while not stop.is_set():
+            try:
+                count = store.count()
+                seen.append(count >= last)
+                last = count
+                if count:
+                    store.read_range(count - 1, count)
+            except Exception as e:
+                errors.append(e)
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    try:
+        for i in range(600):
+            store.append_many(make_records(1, first=i))
+    finally:
+        stop.set()
+        thread.join()
+    assert len(store.archives) > 10
+    assert not errors
+    assert all(seen)
+    assert store.count() == 600
+
+
+def test_archive_reads_from_several_threads(tmp_path):
+    store = fill_store(SessionStore(str(tmp_path / 's.jsonl'), max_active_bytes=1500), 300, batch=10)
+    expected = make_records(300)
+    errors = []
+
+    def reader(seed):
+        rng = random.Random(seed)
+        for _ in range(300):
+            i = rng.randrange(300)
+            if store.read_range(i, i + 1) != expected[i:i + 1]:
+                errors.append(i)
+
+    threads = [threading.Thread(target=reader, args=(seed,)) for seed in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
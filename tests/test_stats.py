@@ -0,0 +1,107 @@
+"""Сводка статистики: добавление по одной сессии против полного пересчёта"""
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from session_store import SessionRecord
+from stats import SessionStats, week_key
+
+FIRST_DAY = date(2024, 1, 1)
+
+
+def record(day, duration=25, hour=9):
+    start = datetime.combine(day, datetime.min.time()) + timedelta(hours=hour)
+    return SessionRecord(start, start + timedelta(minutes=duration), duration, "чтение")
+
+
+def added(records):
+    stats = SessionStats()
+    for item in records:
+        stats.add(item)
+    return stats
+
+
+def rebuilt(records):
+    stats = SessionStats()
+    stats.rebuild(sorted(records))
+    return stats
+
+
+def reference(records):
+    """Серии, посчитанные напрямую по множеству дней"""
+    days = {item.start.date() for item in records}
+    longest = current = 0
+    for day in sorted(days):
+        current = current + 1 if day - timedelta(days=1) in days else 1
+        longest = max(longest, current)
+    return current, longest
+
+
+def random_records(rng, n, span):
+    return [
+        record(FIRST_DAY + timedelta(days=rng.randrange(span)),
+               duration=rng.randint(1, 90), hour=rng.randint(0, 22))
+        for _ in range(n)
+    ]
+
+
+@pytest.mark.parametrize('seed', range(50))
+def test_out_of_order_adds_match_rebuild(seed):
+    rng = random.Random(seed)
+    records = random_records(rng, rng.randint(1, 200), span=rng.choice([7, 30, 400]))
+    rng.shuffle(records)
+    stats = added(records)
+    assert stats.to_dict() == rebuilt(records).to_dict()
+    assert (stats.current_streak, stats.longest_streak) == reference(records)
+    assert stats.session_count == len(records)
+    assert stats.total_minutes == sum(item.duration for item in records)
+    assert sum(stats.weekly.values()) == stats.total_minutes
+
+
+@pytest.mark.parametrize('offsets, current, longest', [
+    ([0, 1, 2], 3, 3),
+    ([0, 1, 2, 5, 6], 2, 3),
+    ([0, 0, 1, 1], 2, 2),
+    ([0, 2, 4], 1, 1),
+    # Задним числом: день 1 соединяет две серии
+    ([0, 2, 3, 1], 4, 4),
+    ([5, 6, 0, 1, 2], 2, 3),
+    ([10, 3], 1, 1),
+])
+def test_streaks(offsets, current, longest):
+    stats = added([record(FIRST_DAY + timedelta(days=i)) for i in offsets])
+    assert (stats.current_streak, stats.longest_streak) == (current, longest)
+    assert stats.last_day == FIRST_DAY + timedelta(days=max(offsets))
+
+
+def test_back_dated_session_keeps_totals():
+    stats = added([record(FIRST_DAY + timedelta(days=7), 30)])
+    stats.add(record(FIRST_DAY, 20))
+    assert stats.daily == {'2024-01-01': 20, '2024-01-08': 30}
+    assert stats.weekly == {week_key(FIRST_DAY): 20, week_key(FIRST_DAY + timedelta(days=7)): 30}
+    assert stats.summary(today=FIRST_DAY + timedelta(days=7))['today'] == 30
+
+
+def test_summary_streak_expires_after_missed_day():
+    stats = added([record(FIRST_DAY + timedelta(days=i)) for i in range(3)])
+    last = FIRST_DAY + timedelta(days=2)
+    assert stats.summary(today=last)['streak'] == 3
+    assert stats.summary(today=last + timedelta(days=1))['streak'] == 3
+    assert stats.summary(today=last + timedelta(days=2))['streak'] == 0
+    assert stats.summary(today=last + timedelta(days=2))['longest_streak'] == 3
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / 'stats.json')
+    stats = SessionStats(path)
+    for item in random_records(random.Random(1), 50, span=30):
+        stats.add(item)
+    stats.save()
+    assert SessionStats(path).to_dict() == stats.to_dict()
+
+
+def test_damaged_file_starts_empty(tmp_path):
+    path = tmp_path / 'stats.json'
+    path.write_text('{"daily": ', encoding='utf-8')
+    assert SessionStats(str(path)).to_dict() == SessionStats().to_dict()
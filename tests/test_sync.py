@@ -0,0 +1,107 @@
+"""Синхронизация журнала с подставным HTTP-сервером"""
+import time
+
+import pytest
+
+from helpers import FakeServer, make_records
+from sync import JournalSync
+
+
+@pytest.fixture
+def make_sync(store, server, tmp_path):
+    syncs = []
+
+    def make():
+        sync = JournalSync(store, server.url, str(tmp_path / 'sync.json'), batch_size=4,
+                           backoff_base=0.01, backoff_max=0.05)
+        syncs.append(sync)
+        return sync
+
+    yield make
+    for sync in syncs:
+        sync.close()
+
+
+def wait_synced(sync, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while sync.pending() or sync.failures:
+        assert time.monotonic() < deadline, "синхронизация не завершилась"
+        time.sleep(0.01)
+    # Отметка сохраняется после ответа сервера
+    time.sleep(0.05)
+
+
+def activities(records):
+    return sorted(record.activity for record in records)
+
+
+def test_uploads_only_new_records(store, server, make_sync):
+    store.append_many(make_records(6))
+    sync = make_sync()
+    wait_synced(sync)
+    store.append_many(make_records(3, first=6))
+    sync.notify()
+    wait_synced(sync)
+    assert server.activities() == activities(make_records(9))
+    assert [(first, n) for _, first, n in server.requests] == [(0, 4), (4, 2), (6, 3)]
+
+
+def test_mark_survives_restart(store, server, make_sync):
+    store.append_many(make_records(5))
+    sync = make_sync()
+    wait_synced(sync)
+    sync.close()
+    store.append_many(make_records(2, first=5))
+    restarted = make_sync()
+    wait_synced(restarted)
+    assert restarted.epoch == sync.epoch
+    assert [first for _, first, _ in server.requests] == [0, 4, 5]
+    assert len(server.records) == 7
+
+
+def test_new_server_gets_the_whole_journal(store, server, make_sync, tmp_path):
+    store.append_many(make_records(5))
+    sync = make_sync()
+    wait_synced(sync)
+    sync.close()
+    other = FakeServer()
+    try:
+        moved = JournalSync(store, other.url, str(tmp_path / 'sync.json'))
+        try:
+            wait_synced(moved)
+        finally:
+            moved.close()
+        assert other.activities() == activities(make_records(5))
+        assert moved.epoch == sync.epoch
+    finally:
+        other.close()
+
+
+def test_records_after_clear_are_not_taken_for_duplicates(store, server, make_sync):
+    store.append_many(make_records(3))
+    sync = make_sync()
+    wait_synced(sync)
+    old_epoch = sync.epoch
+    store.clear()
+    sync.reset()
+    fresh = make_records(2, first=100)
+    store.append_many(fresh)
+    sync.notify()
+    wait_synced(sync)
+    # Номера после очистки снова с нуля, но в новой эпохе
+    assert sync.epoch != old_epoch
+    assert server.activities() == activities(make_records(3) + fresh)
+
+
+def test_offline_saves_go_in_one_request(store, server, make_sync):
+    server.online = False
+    sync = make_sync()
+    for i in range(3):
+        store.append_many(make_records(1, first=i))
+        sync.notify()
+    time.sleep(0.2)
+    assert sync.failures
+    assert not server.requests
+    server.online = True
+    wait_synced(sync)
+    assert server.requests == [(sync.epoch, 0, 3)]
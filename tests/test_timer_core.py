@@ -0,0 +1,100 @@
+"""Ядро отсчёта на подставных часах: тысячи сессий без Kivy"""
+import random
+
+import pytest
+
+from helpers import FakeClock
+from timer_core import CountdownTimer, TimerManager
+
+SESSIONS = 10_000
+STEPS = (0.2, 1.0, 3.7, 45.0, 120.0)
+# Погрешность накопления шагов с плавающей точкой
+EPS = 1e-6
+
+
+def simulate(timer, clock, rng):
+    """Одна сессия со случайными подвисаниями и паузами.
+
+    Возвращает (сколько прошло по часам без учёта пауз, показанные секунды).
+    """
+    duration = rng.randint(1, 90) * 60
+    timer.start(duration)
+    running_time = 0.0
+    shown = []
+    while not timer.finished:
+        # Обычный тик, подвисание кадра или долгий сон приложения
+        step = rng.choice(STEPS)
+        clock.advance(step)
+        running_time += step
+        if rng.random() < 0.01:
+            timer.pause()
+            clock.advance(rng.uniform(1, 600))
+            timer.resume()
+        value = timer.poll()
+        if value is not None:
+            shown.append(value)
+    return duration, running_time, shown
+
+
+def test_ten_thousand_sessions_end_on_deadline():
+    clock = FakeClock()
+    timer = CountdownTimer(clock)
+    rng = random.Random(1)
+    for _ in range(SESSIONS):
+        duration, running_time, shown = simulate(timer, clock, rng)
+        # Сессия заканчивается не раньше дедлайна и не позже одного шага после него
+        assert duration - EPS <= running_time < duration + max(STEPS) + EPS
+        assert timer.remaining() == 0.0
+        # Видимые секунды не растут (после resume секунда рисуется заново)
+        assert all(a >= b for a, b in zip(shown, shown[1:]))
+        assert shown[-1] == 0
+        timer.reset()
+
+
+def test_redraws_only_when_visible_second_changes(fake_clock):
+    timer = CountdownTimer(fake_clock)
+    timer.start(60)
+    redraws = 0
+    for _ in range(60 * 50):
+        fake_clock.advance(0.02)
+        if timer.poll() is not None:
+            redraws += 1
+    assert redraws == 60
+
+
+def test_pause_keeps_remaining_time(fake_clock):
+    timer = CountdownTimer(fake_clock)
+    timer.start(300)
+    fake_clock.advance(100.4)
+    timer.pause()
+    fake_clock.advance(10_000)
+    assert timer.remaining() == pytest.approx(199.6)
+    timer.resume()
+    fake_clock.advance(199.5)
+    assert not timer.finished
+    fake_clock.advance(0.1)
+    assert timer.finished
+
+
+def test_next_tick_lands_on_second_boundary(fake_clock):
+    timer = CountdownTimer(fake_clock)
+    timer.start(10)
+    fake_clock.advance(0.25)
+    assert abs(timer.next_tick_delay() - 0.75) < 1e-9
+    fake_clock.advance(timer.next_tick_delay())
+    assert timer.seconds_left() == 9
+
+
+def test_pause_resume_without_time_passing_fires_once(fake_clock):
+    """Возобновление с тем же дедлайном не оживляет старую запись кучи"""
+    fired = []
+    manager = TimerManager(fake_clock)
+    timer_id = manager.add(10, lambda timer_id, label: fired.append(timer_id))
+    for _ in range(100):
+        manager.pause(timer_id)
+        manager.resume(timer_id)
+    assert len(manager._heap) <= 2 * len(manager.timers) + 64
+    fake_clock.advance(10)
+    assert manager.fire_due() == 1
+    assert fired == [timer_id]
+    assert manager.next_deadline() is None
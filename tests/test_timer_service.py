@@ -0,0 +1,181 @@
+"""Сервис таймера: отсчёт и напоминания, пока интерфейс в фоне, и протокол UDP"""
+import socket
+import threading
+
+import pytest
+
+from helpers import FakeServices
+from timer_service import TimerServiceClient, TimerServiceCore, TimerServiceServer
+
+
+@pytest.fixture
+def services():
+    return FakeServices()
+
+
+@pytest.fixture
+def core(fake_clock, services):
+    return TimerServiceCore(services, clock=fake_clock)
+
+
+@pytest.fixture
+def service(core):
+    """Сервер на свободном порту в отдельном потоке и настоящий клиент"""
+    server = TimerServiceServer(core, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    client = TimerServiceClient(port=server.sock.getsockname()[1], timeout=2.0)
+    yield server, client, thread
+    if thread.is_alive():
+        client.shutdown()
+        thread.join(timeout=2.0)
+
+
+def hand(core, *reminders):
+    return core.handle({
+        'command': 'reminders',
+        'reminders': [
+            {'id': reminder_id, 'label': label, 'seconds': seconds}
+            for reminder_id, label, seconds in reminders
+        ],
+    })
+
+
+def run_until(core, clock, seconds):
+    """Цикл сервиса: спит до next_wakeup() и просыпается"""
+    end = clock() + seconds
+    while not core.stopped:
+        wakeup = core.next_wakeup()
+        if wakeup is None or clock() + wakeup > end:
+            break
+        clock.advance(wakeup)
+        core.on_wakeup()
+    clock.now = max(clock.now, end)
+
+
+def test_reminders_fire_in_background(core, fake_clock, services):
+    hand(core, (1, 'вода', 600), (2, 'звонок', 120))
+    assert not core.stopped
+    assert services.alarm == fake_clock() + 120
+    run_until(core, fake_clock, 300)
+    assert services.notifications == ['звонок']
+    assert services.alarm == fake_clock() - 300 + 600
+    reply = hand(core)
+    assert reply['fired'] == [2]
+    # Оставшееся напоминание интерфейс забрал обратно
+    assert core.stopped
+    assert services.alarm is None
+    run_until(core, fake_clock, 600)
+    assert services.notifications == ['звонок']
+
+
+def test_fired_reminders_are_reported_once(core, fake_clock):
+    hand(core, (1, 'вода', 60))
+    run_until(core, fake_clock, 60)
+    assert hand(core)['fired'] == [1]
+    assert hand(core)['fired'] == []
+
+
+def test_service_stops_after_fired_reminders_are_taken(core, fake_clock, services):
+    hand(core, (1, 'вода', 60))
+    run_until(core, fake_clock, 120)
+    assert services.alerts == 1
+    # Иначе интерфейс не узнает о срабатывании и напомнит второй раз
+    assert not core.stopped
+    assert core.next_wakeup() is None
+    assert hand(core)['fired'] == [1]
+    assert core.stopped
+
+
+def test_reminders_keep_service_after_session(core, fake_clock, services):
+    core.handle({'command': 'start', 'seconds': 300})
+    hand(core, (1, 'вода', 900))
+    assert services.alarm == fake_clock() + 300
+    run_until(core, fake_clock, 300)
+    assert core.status()['finished']
+    # Интерфейс прочитал окончание и погасил отсчёт, напоминание ещё ждёт
+    core.handle({'command': 'shutdown'})
+    assert not core.stopped
+    assert services.alarm == fake_clock() - 300 + 900
+    run_until(core, fake_clock, 600)
+    assert services.notifications[-1] == 'вода'
+    assert hand(core)['fired'] == [1]
+    assert core.stopped
+
+
+def test_next_wakeup_picks_reminder_before_minute_tick(core):
+    core.handle({'command': 'start', 'seconds': 25 * 60})
+    hand(core, (1, 'вода', 15))
+    assert core.next_wakeup() == 15
+
+
+def test_start_status_shutdown(service, fake_clock, services):
+    server, client, thread = service
+    client.start(25 * 60)
+    # Ответ на статус приходит после выполнения всех прежних команд
+    assert client.status()['running']
+    fake_clock.advance(90)
+    status = client.status()
+    assert status == {'running': True, 'remaining': 25 * 60 - 90, 'finished': False}
+    assert services.alarm == fake_clock() - 90 + 25 * 60
+    assert services.ongoing.endswith("Осталось: 25 мин")
+    client.shutdown()
+    thread.join(timeout=2.0)
+    assert not thread.is_alive()
+    assert services.ongoing is None
+    assert services.alarm is None
+
+
+def test_finished_after_deadline(service, fake_clock, services):
+    server, client, thread = service
+    client.start(300)
+    assert client.status()['running']
+    fake_clock.advance(300)
+    # Будильник ОС будит цикл, который спал бы до следующей минуты
+    server.wake()
+    status = client.status()
+    assert status['finished']
+    assert not status['running']
+    assert services.notifications == ["Отличная работа! Вернитесь, чтобы записать достижение."]
+    assert services.alerts == 1
+    # Сервис ждёт, пока интерфейс прочитает окончание
+    assert thread.is_alive()
+
+
+def test_notification_updates_every_minute(core, fake_clock, services):
+    core.handle({'command': 'start', 'seconds': 150})
+    shown = []
+    while core.next_wakeup() is not None:
+        wakeup = core.next_wakeup()
+        fake_clock.advance(wakeup)
+        core.on_wakeup()
+        shown.append((wakeup, services.ongoing))
+    assert shown == [
+        (30, "Продолжаем концентрацию! Осталось: 2 мин"),
+        (60, "Продолжаем концентрацию! Осталось: 1 мин"),
+        (60, None),
+    ]
+    assert core.status()['finished']
+
+
+def test_status_is_none_when_nothing_listens():
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    client = TimerServiceClient(port=port)
+    assert client.status() is None
+    assert client.take_reminders() is None
+    # Команды без ответа не падают
+    client.shutdown()
+
+
+def test_reminders_over_udp(service, fake_clock, services):
+    server, client, thread = service
+    client.hand_reminders([{'id': 7, 'label': 'вода', 'seconds': 60}])
+    client.status()
+    fake_clock.advance(60)
+    server.wake()
+    assert client.take_reminders() == [7]
+    assert services.notifications == ['вода']
+    thread.join(timeout=2.0)
+    assert not thread.is_alive()
@@ -0,0 +1,78 @@
+"""Реестр тем: готовые палитры и привязка виджетов к ролям цветов"""
+import time
+import weakref
+
+
+DARK = 'dark'
+LIGHT = 'light'
+
+# Палитры собраны заранее: смена темы только раздаёт готовые кортежи
+PALETTES = {
+    DARK: {
+        'window': (0.1, 0.1, 0.1, 1),
+        'card': (0.15, 0.15, 0.15, 1),
+        'text': (1, 1, 1, 1),
+        'input': (0.2, 0.2, 0.2, 1),
+        'popup': (0.15, 0.15, 0.15, 0.9),
+    },
+    LIGHT: {
+        'window': (0.95, 0.95, 0.95, 1),
+        'card': (0.98, 0.98, 0.98, 1),
+        'text': (0.2, 0.2, 0.2, 1),
+        'input': (0.95, 0.95, 0.95, 1),
+        'popup': (0.95, 0.95, 0.95, 0.9),
+    },
+}
+
+
+class ThemeRegistry:
+    """Текущая тема и список свойств, привязанных к ролям палитры.
+
+    Виджет при создании регистрирует своё свойство (``color``,
+    ``background_color``, ``rgba`` инструкции Color) под ролью, и при
+    смене темы реестр одним проходом присваивает новые значения - без
+    обхода дерева и пересоздания виджетов. Ссылки слабые, поэтому
+    закрытые окна выпадают из списка сами.
+    """
+    def __init__(self, palettes=PALETTES, name=DARK):
+        self.palettes = palettes
+        self.name = name
+        self.bindings = {}
+        self.last_switch = 0.0
+
+    @property
+    def is_dark(self):
+        return self.name == DARK
+
+    def color(self, role):
+        """Цвет роли в текущей теме"""
+        return self.palettes[self.name][role]
+
+    def bind(self, target, prop, role):
+        """Привязывает свойство объекта к роли и сразу красит его"""
+        self.bindings.setdefault(role, []).append((weakref.ref(target), prop))
+        setattr(target, prop, self.color(role))
+        return target
+
+    def count(self):
+        return sum(len(targets) for targets in self.bindings.values())
+
+    def apply(self, name):
+        """Переключает тему одним проходом по привязкам; возвращает время в секундах"""
+        started = time.perf_counter()
+        self.name = name
+        palette = self.palettes[name]
+        for role, targets in self.bindings.items():
+            value = palette[role]
+            alive = []
+            for ref, prop in targets:
+                target = ref()
+                if target is not None:
+                    setattr(target, prop, value)
+                    alive.append((ref, prop))
+            targets[:] = alive
+        self.last_switch = time.perf_counter() - started
+        return self.last_switch
+
+    def toggle(self):
+        return self.apply(LIGHT if self.is_dark else DARK)
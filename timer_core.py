@@ -0,0 +1,220 @@
+"""Ядро обратного отсчёта на монотонных часах"""
+import heapq
+import math
+import time
+
+
+if hasattr(time, 'CLOCK_BOOTTIME'):
+    def monotonic_clock():
+        """Монотонные часы, которые идут и во время сна устройства"""
+        return time.clock_gettime(time.CLOCK_BOOTTIME)
+else:
+    monotonic_clock = time.monotonic
+
+BOOT_ID_PATH = '/proc/sys/kernel/random/boot_id'
+
+
+def boot_id():
+    """Идентификатор текущей загрузки ОС или None, если система его не даёт"""
+    try:
+        with open(BOOT_ID_PATH, 'r', encoding='ascii') as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+class CountdownTimer:
+    """Таймер, вычисляющий остаток от дедлайна, а не уменьшающий счётчик.
+
+    Пропущенные тики, подвисания кадров и пауза приложения не сдвигают
+    окончание сессии: остаток всегда равен ``deadline - clock()``.
+    Часы передаются параметром, чтобы таймер можно было гонять без Kivy.
+    """
+    def __init__(self, clock=monotonic_clock):
+        self.clock = clock
+        self.duration = 0
+        self.deadline = None
+        self.paused_remaining = None
+        self._last_shown = None
+
+    @property
+    def running(self):
+        return self.deadline is not None
+
+    @property
+    def paused(self):
+        return self.paused_remaining is not None
+
+    @property
+    def finished(self):
+        return self.deadline is not None and self.clock() >= self.deadline
+
+    def start(self, seconds):
+        """Запускает отсчёт на заданное число секунд"""
+        self.duration = seconds
+        self.paused_remaining = None
+        self.deadline = self.clock() + seconds
+        self._last_shown = None
+
+    def pause(self):
+        """Замораживает остаток до вызова resume()"""
+        if self.deadline is None:
+            return
+        self.paused_remaining = self.remaining()
+        self.deadline = None
+
+    def resume(self):
+        """Продолжает отсчёт с замороженного остатка"""
+        if self.paused_remaining is None:
+            return
+        self.deadline = self.clock() + self.paused_remaining
+        self.paused_remaining = None
+        self._last_shown = None
+
+    def set_remaining(self, seconds):
+        """Переносит дедлайн по остатку, полученному извне (например, от сервиса)"""
+        if self.deadline is not None:
+            self.deadline = self.clock() + seconds
+            self._last_shown = None
+
+    def reset(self):
+        """Сбрасывает таймер в исходное состояние"""
+        self.duration = 0
+        self.deadline = None
+        self.paused_remaining = None
+        self._last_shown = None
+
+    def remaining(self):
+        """Точный остаток в секундах"""
+        if self.deadline is not None:
+            return max(0.0, self.deadline - self.clock())
+        if self.paused_remaining is not None:
+            return self.paused_remaining
+        return 0.0
+
+    def seconds_left(self):
+        """Остаток в целых секундах так, как его видит пользователь"""
+        return int(math.ceil(self.remaining()))
+
+    def poll(self):
+        """Возвращает секунды для перерисовки или None, если видимая секунда не сменилась"""
+        shown = self.seconds_left()
+        if shown == self._last_shown:
+            return None
+        self._last_shown = shown
+        return shown
+
+    def next_tick_delay(self):
+        """Задержка до следующей смены видимой секунды"""
+        remaining = self.remaining()
+        fraction = remaining - math.floor(remaining)
+        return fraction if fraction > 0 else 1.0
+
+
+class TimerManager:
+    """Много таймеров на одной куче дедлайнов.
+
+    Ближайший дедлайн всегда на вершине кучи, поэтому хватает одного
+    события планировщика: после каждого изменения вызывается
+    ``arm(delay)`` с задержкой до ближайшего срабатывания (или None,
+    если таймеров нет), и приложение переставляет своё единственное
+    событие Clock. Добавление и возобновление - O(log n); отмена и
+    пауза помечают запись устаревшей, и она выбрасывается, когда
+    всплывёт на вершину. Запись кучи хранит поколение таймера: после
+    паузы и возобновления с тем же дедлайном старая запись не оживает.
+    Между срабатываниями таймеры ничего не стоят.
+    """
+    def __init__(self, clock=monotonic_clock, arm=None):
+        self.clock = clock
+        self.arm = arm
+        self.timers = {}
+        self._heap = []
+        self._next_id = 0
+        self._armed = None
+
+    def add(self, seconds, callback, label=''):
+        """Запускает таймер и возвращает его номер"""
+        timer_id = self._next_id
+        self._next_id += 1
+        deadline = self.clock() + seconds
+        self.timers[timer_id] = {
+            'label': label,
+            'callback': callback,
+            'deadline': deadline,
+            'paused_remaining': None,
+            'generation': 0,
+        }
+        heapq.heappush(self._heap, (deadline, timer_id, 0))
+        self._rearm()
+        return timer_id
+
+    def cancel(self, timer_id):
+        if self.timers.pop(timer_id, None) is not None:
+            self._rearm()
+
+    def pause(self, timer_id):
+        timer = self.timers.get(timer_id)
+        if timer is None or timer['deadline'] is None:
+            return
+        timer['paused_remaining'] = max(0.0, timer['deadline'] - self.clock())
+        timer['deadline'] = None
+        timer['generation'] += 1
+        self._rearm()
+
+    def resume(self, timer_id):
+        timer = self.timers.get(timer_id)
+        if timer is None or timer['paused_remaining'] is None:
+            return
+        timer['deadline'] = self.clock() + timer['paused_remaining']
+        timer['paused_remaining'] = None
+        heapq.heappush(self._heap, (timer['deadline'], timer_id, timer['generation']))
+        self._rearm()
+
+    def remaining(self, timer_id):
+        """Остаток таймера в секундах или None, если таймера нет"""
+        timer = self.timers.get(timer_id)
+        if timer is None:
+            return None
+        if timer['deadline'] is None:
+            return timer['paused_remaining']
+        return max(0.0, timer['deadline'] - self.clock())
+
+    def _is_live(self, entry):
+        deadline, timer_id, generation = entry
+        timer = self.timers.get(timer_id)
+        return timer is not None and timer['generation'] == generation and timer['deadline'] is not None
+
+    def next_deadline(self):
+        """Ближайший дедлайн; устаревшие записи снимаются с вершины"""
+        heap = self._heap
+        while heap and not self._is_live(heap[0]):
+            heapq.heappop(heap)
+        # Если устаревших записей стало много, пересобираем кучу
+        if len(heap) > 2 * len(self.timers) + 64:
+            self._heap = heap = [entry for entry in heap if self._is_live(entry)]
+            heapq.heapify(heap)
+        return heap[0][0] if heap else None
+
+    def fire_due(self):
+        """Вызывает колбэки наступивших таймеров; возвращает их число"""
+        fired = 0
+        now = self.clock()
+        while True:
+            deadline = self.next_deadline()
+            if deadline is None or deadline > now:
+                break
+            _, timer_id, _ = heapq.heappop(self._heap)
+            timer = self.timers.pop(timer_id)
+            timer['callback'](timer_id, timer['label'])
+            fired += 1
+        # Событие могло прийти чуть раньше дедлайна: взводим его заново в любом случае
+        self._rearm(force=True)
+        return fired
+
+    def _rearm(self, force=False):
+        deadline = self.next_deadline()
+        if deadline == self._armed and not force:
+            return
+        self._armed = deadline
+        if self.arm is not None:
+            self.arm(None if deadline is None else max(0.0, deadline - self.clock()))
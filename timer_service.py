@@ -0,0 +1,255 @@
+"""Таймер в фоновом сервисе и протокол связи с ним"""
+import json
+import math
+import select
+import socket
+
+from timer_core import CountdownTimer, monotonic_clock
+
+
+SERVICE_HOST = '127.0.0.1'
+SERVICE_PORT = 17395
+# Постоянное уведомление обновляется раз в минуту, а не каждую секунду
+NOTIFY_INTERVAL = 60
+# Предельный размер датаграммы: в ней может ехать список напоминаний
+MAX_MESSAGE = 65507
+
+
+class TimerServiceCore:
+    """Машина состояний таймера, которой владеет сервис.
+
+    Ядро не знает о сокетах: команды приходят словарями в handle(),
+    а серверный цикл спит до next_wakeup() и вызывает on_wakeup().
+    Окончание дополнительно ставится будильником ОС: сон select() не
+    идёт, пока устройство спит, а будильник будит его точно к дедлайну.
+
+    Пока интерфейс в фоне, сервис держит и его напоминания: команда
+    ``reminders`` заменяет их список и возвращает номера сработавших
+    с прошлой передачи. Сервис работает, пока идёт отсчёт, ждут
+    напоминания или интерфейс ещё не узнал о сработавших.
+    """
+    def __init__(self, services=None, clock=monotonic_clock):
+        self.clock = clock
+        self.timer = CountdownTimer(clock)
+        self.services = services
+        self.finished = False
+        self.stopped = False
+        self.reminders = {}
+        self.fired = []
+
+    def handle(self, message):
+        """Выполняет команду и возвращает состояние таймера"""
+        command = message.get('command')
+        if command == 'start':
+            self.timer.start(message['seconds'])
+            self.finished = False
+            self.stopped = False
+            self.update_notification()
+            self.schedule_alarm()
+        elif command == 'wakeup':
+            self.on_wakeup()
+        elif command == 'shutdown':
+            self.timer.reset()
+            self.finished = False
+            self.stopped = self.idle()
+            if self.services:
+                self.services.cancel_ongoing()
+            self.schedule_alarm()
+        elif command == 'reminders':
+            fired = self.set_reminders(message['reminders'])
+            return dict(self.status(), fired=fired)
+        return self.status()
+
+    def set_reminders(self, reminders):
+        """Заменяет напоминания; возвращает номера сработавших до этого"""
+        fired, self.fired = self.fired, []
+        now = self.clock()
+        self.reminders = {
+            reminder['id']: (now + reminder['seconds'], reminder['label'])
+            for reminder in reminders
+        }
+        self.stopped = self.idle()
+        self.schedule_alarm()
+        return fired
+
+    def idle(self):
+        """Нет ни отсчёта, ни напоминаний, ни непрочитанных срабатываний"""
+        return not (self.reminders or self.fired or self.timer.running or self.finished)
+
+    def next_deadline(self):
+        """Ближайший дедлайн отсчёта или напоминания"""
+        deadlines = [deadline for deadline, _ in self.reminders.values()]
+        if self.timer.running:
+            deadlines.append(self.timer.deadline)
+        return min(deadlines, default=None)
+
+    def schedule_alarm(self):
+        if not self.services:
+            return
+        deadline = self.next_deadline()
+        if deadline is None:
+            self.services.cancel_alarm()
+        else:
+            self.services.schedule_alarm(deadline)
+
+    def status(self):
+        return {
+            'running': self.timer.running,
+            'remaining': self.timer.remaining(),
+            'finished': self.finished,
+        }
+
+    def next_wakeup(self):
+        """Секунды до следующего обновления уведомления, окончания или напоминания"""
+        wakeups = [
+            max(0.0, deadline - self.clock()) for deadline, _ in self.reminders.values()
+        ]
+        if self.timer.running:
+            remaining = self.timer.remaining()
+            to_next_minute = remaining % NOTIFY_INTERVAL or NOTIFY_INTERVAL
+            wakeups.append(min(to_next_minute, remaining))
+        return min(wakeups, default=None)
+
+    def on_wakeup(self):
+        self.fire_reminders()
+        if not self.timer.running:
+            return
+        if not self.timer.finished:
+            self.update_notification()
+            return
+
+        self.timer.reset()
+        self.finished = True
+        if self.services:
+            self.services.cancel_ongoing()
+            self.services.notify(
+                "✅ Фокус-сессия завершена!",
+                "Отличная работа! Вернитесь, чтобы записать достижение.",
+                urgent=True
+            )
+            self.services.play_alert()
+        self.schedule_alarm()
+
+    def fire_reminders(self):
+        now = self.clock()
+        due = [
+            (deadline, reminder_id, label)
+            for reminder_id, (deadline, label) in self.reminders.items()
+            if deadline <= now
+        ]
+        for _, reminder_id, label in sorted(due):
+            del self.reminders[reminder_id]
+            self.fired.append(reminder_id)
+            if self.services:
+                self.services.notify("⏰ Напоминание", label, urgent=True)
+                self.services.play_alert()
+        if due:
+            self.stopped = self.idle()
+            self.schedule_alarm()
+
+    def update_notification(self):
+        if self.services:
+            minutes = math.ceil(self.timer.remaining() / 60)
+            self.services.show_ongoing(
+                "🔥 Фокус-сессия активна",
+                f"Продолжаем концентрацию! Осталось: {minutes} мин"
+            )
+
+
+class TimerServiceServer:
+    """Цикл сервиса: ждёт команду или ближайший дедлайн"""
+    def __init__(self, core, host=SERVICE_HOST, port=SERVICE_PORT):
+        self.core = core
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, port))
+
+    def wake(self):
+        """Прерывает ожидание цикла из другого потока"""
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.sendto(b'{"command": "wakeup"}', self.sock.getsockname())
+
+    def serve_forever(self):
+        try:
+            while not self.core.stopped:
+                ready, _, _ = select.select([self.sock], [], [], self.core.next_wakeup())
+                if not ready:
+                    self.core.on_wakeup()
+                    continue
+                data, address = self.sock.recvfrom(MAX_MESSAGE)
+                try:
+                    reply = self.core.handle(json.loads(data))
+                except (ValueError, KeyError) as e:
+                    reply = {'error': str(e)}
+                self.sock.sendto(json.dumps(reply).encode('utf-8'), address)
+        finally:
+            self.sock.close()
+
+
+class TimerServiceClient:
+    """Клиент UI к сервису таймера по локальному UDP.
+
+    ``launcher`` возвращает объект с start_service(), который поднимает
+    процесс сервиса; начальная команда передаётся ему аргументом, чтобы
+    не ждать, пока сервис откроет сокет.
+    """
+    def __init__(self, launcher=None, host=SERVICE_HOST, port=SERVICE_PORT, timeout=0.1):
+        self.launcher = launcher
+        self.address = (host, port)
+        self.timeout = timeout
+
+    def start(self, seconds):
+        message = {'command': 'start', 'seconds': seconds}
+        if self.launcher:
+            self.launcher().start_service(json.dumps(message))
+        # Если сервис уже запущен, аргумент запуска он не увидит
+        self._send(message)
+
+    def status(self):
+        """Состояние таймера в сервисе или None, если сервис недоступен"""
+        return self._send({'command': 'status'}, wait_reply=True)
+
+    def shutdown(self):
+        self._send({'command': 'shutdown'})
+
+    def hand_reminders(self, reminders):
+        """Передаёт сервису напоминания [{'id', 'label', 'seconds'}] на время фона"""
+        message = {'command': 'reminders', 'reminders': reminders}
+        if reminders and self.launcher:
+            self.launcher().start_service(json.dumps(message))
+        self._send(message)
+
+    def take_reminders(self):
+        """Забирает напоминания у сервиса; номера сработавших или None"""
+        reply = self._send({'command': 'reminders', 'reminders': []}, wait_reply=True)
+        return reply and reply.get('fired')
+
+    def _send(self, message, wait_reply=False):
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.settimeout(self.timeout)
+            try:
+                sock.sendto(json.dumps(message).encode('utf-8'), self.address)
+                if wait_reply:
+                    return json.loads(sock.recv(MAX_MESSAGE))
+            except (OSError, ValueError):
+                return None
+
+
+class LoopbackClient:
+    """Замена сервиса в том же процессе с тем же интерфейсом клиента"""
+    def __init__(self, core=None):
+        self.core = core or TimerServiceCore()
+
+    def start(self, seconds):
+        self.core.handle({'command': 'start', 'seconds': seconds})
+
+    def status(self):
+        return self.core.handle({'command': 'status'})
+
+    def shutdown(self):
+        self.core.handle({'command': 'shutdown'})
+
+    def hand_reminders(self, reminders):
+        self.core.handle({'command': 'reminders', 'reminders': reminders})
+
+    def take_reminders(self):
+        return self.core.handle({'command': 'reminders', 'reminders': []})['fired']